@@ -1,5 +1,6 @@
 #!python
 
+import collections
 import sys
 import time
 
@@ -21,25 +22,171 @@ def generate_prefixes(vocabulary):
 
 def autocomplete_setup(vocabulary, algorithm='linear_search'):
     """Return the main data structure needed to set up autocomplete using the
-    given vocabulary and algorithm, specified as linear_search, trie, etc."""
+    given vocabulary and algorithm, specified as linear_search, trie, or
+    suffix_array."""
     if algorithm == 'linear_search':
         # Use the given vocabulary list
         return vocabulary
     elif algorithm == 'trie':
-        from trie import Trie
-        # Create a trie structure with the vocabulary
-        return Trie(vocabulary)
+        from prefixtree import PrefixTree
+        # Create a prefix tree (trie) structure with the vocabulary
+        return PrefixTree(vocabulary)
+    elif algorithm == 'suffix_array':
+        from suffixarray import SuffixArray
+        # Create a suffix array of the vocabulary for infix matches
+        return SuffixArray(vocabulary)
+    raise ValueError('Unknown autocomplete algorithm: {!r}'.format(algorithm))
 
 
 def autocomplete(prefix, structure, algorithm='linear_search'):
     """Return all vocabulary entries that start with the given prefix using the
-    given structure and algorithm, specified as linear_search, trie, etc."""
+    given structure and algorithm, specified as linear_search or trie, or all
+    entries that contain it anywhere (in vocabulary order) with suffix_array."""
     if algorithm == 'linear_search':
         # Search the list using linear search
         return [word for word in structure if word.startswith(prefix)]
     elif algorithm == 'trie':
-        # Search the trie structure for the prefix
+        # Search the prefix tree structure for the prefix
+        return structure.complete(prefix)
+    elif algorithm == 'suffix_array':
+        # Search the suffix array for the prefix anywhere in each entry
         return structure.search(prefix)
+    raise ValueError('Unknown autocomplete algorithm: {!r}'.format(algorithm))
+
+
+class AutocompleteCache(object):
+    """AutocompleteCache: a cache in front of autocomplete for one structure
+    and algorithm that keeps the completions of up to maxsize recent prefixes,
+    evicting the least recently used. Typed prefixes grow one character at a
+    time, so on a miss the completions of the longest cached shorter prefix
+    are filtered instead of searching again, if there are at most
+    inherit_max of them (the prefix's completions are among them, since every
+    string starting with the prefix starts with the shorter one too).
+    Cached completions are cleared when the structure's version changes (as
+    PrefixTree's does on every insert or delete); structures without a
+    version, like a vocabulary list, must be cleared with cache_clear after
+    they change. Completions are returned from the cache, not copied, so
+    callers must not modify them."""
+
+    def __init__(self, structure, algorithm='linear_search', maxsize=1024,
+                 inherit_max=1000):
+        """Initialize this cache for the given structure and algorithm (see
+        autocomplete_setup)."""
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1, not {!r}'.format(maxsize))
+        self.structure = structure
+        self.algorithm = algorithm
+        self.maxsize = maxsize
+        self.inherit_max = inherit_max
+        # Map prefixes to their completions, in order of use
+        self.cache = collections.OrderedDict()
+        self.version = getattr(structure, 'version', None)
+        self.hits = 0
+        self.inherited = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __repr__(self):
+        """Return a string representation of this cache."""
+        return 'AutocompleteCache({!r}, maxsize={})'.format(self.algorithm,
+                                                            self.maxsize)
+
+    def complete(self, prefix):
+        """Return the completions of the given prefix, as autocomplete would.
+        Running time: O(1) on a hit, O(m + c) to filter c cached completions
+        of a shorter prefix on an inherited hit for a prefix of length m, or
+        autocomplete's running time on a miss"""
+        version = getattr(self.structure, 'version', None)
+        if version != self.version:
+            self.cache.clear()
+            self.version = version
+            self.invalidations += 1
+        completions = self.cache.get(prefix)
+        if completions is not None:
+            self.hits += 1
+            self.cache.move_to_end(prefix)
+            return completions
+        completions = self._inherit(prefix)
+        if completions is not None:
+            self.inherited += 1
+        else:
+            self.misses += 1
+            completions = autocomplete(prefix, self.structure, self.algorithm)
+        if len(self.cache) >= self.maxsize:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        self.cache[prefix] = completions
+        return completions
+
+    def _inherit(self, prefix):
+        """Return the completions of the given prefix filtered from those of
+        the longest cached shorter prefix, or None if there are none or more
+        than inherit_max of them."""
+        for length in range(len(prefix) - 1, -1, -1):
+            shorter = self.cache.get(prefix[:length])
+            if shorter is None:
+                continue
+            if len(shorter) > self.inherit_max:
+                return None  # Searching again is cheaper than filtering
+            self.cache.move_to_end(prefix[:length])
+            if self.algorithm == 'suffix_array':
+                # Completions contain the prefix anywhere
+                return [word for word in shorter if prefix in word]
+            return [word for word in shorter if word.startswith(prefix)]
+        return None
+
+    def cache_info(self):
+        """Return a dictionary of hit, inherited hit, miss, eviction, and
+        invalidation statistics."""
+        calls = self.hits + self.inherited + self.misses
+        return {
+            'hits': self.hits,
+            'inherited': self.inherited,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / calls if calls else 0.0,
+            'inherited_rate': self.inherited / calls if calls else 0.0,
+            'size': len(self.cache),
+            'maxsize': self.maxsize,
+        }
+
+    def cache_clear(self):
+        """Remove all cached completions and reset statistics."""
+        self.cache.clear()
+        self.version = getattr(self.structure, 'version', None)
+        self.hits = self.inherited = self.misses = 0
+        self.evictions = self.invalidations = 0
+
+
+def benchmark_cache(vocabulary, algorithm='trie', num_words=500,
+                    maxsize=1024):
+    """Compare the time to complete every prefix typed one character at a
+    time for random words of the given vocabulary, with and without an
+    AutocompleteCache, and print the cache's statistics."""
+    import random
+    structure = autocomplete_setup(vocabulary, algorithm)
+    prefixes = [word[:length] for word in random.sample(
+                    vocabulary, min(num_words, len(vocabulary)))
+                for length in range(1, len(word) + 1)]
+    cache = AutocompleteCache(structure, algorithm, maxsize)
+    start_time = time.time()
+    uncached = [autocomplete(prefix, structure, algorithm)
+                for prefix in prefixes]
+    uncached_time = time.time() - start_time
+    start_time = time.time()
+    cached = [cache.complete(prefix) for prefix in prefixes]
+    cached_time = time.time() - start_time
+    assert cached == uncached
+    print('Vocabulary size: {}, {} typed prefixes'.format(len(vocabulary),
+                                                           len(prefixes)))
+    print('Uncached time: {:.6f} sec'.format(uncached_time))
+    print('Cached time:   {:.6f} sec'.format(cached_time))
+    for name, value in cache.cache_info().items():
+        if isinstance(value, float):
+            value = '{:.3f}'.format(value)
+        print('{:16}{}'.format(name + ':', value))
 
 
 def main():
@@ -54,8 +201,17 @@ def main():
         print('Usage: {} prefixes-file vocabulary-file'.format(script))
         print('Test autocomplete with the given prefixes and vocabulary files')
         print('Example: {} prefixes.txt /usr/share/dict/words'.format(script))
+        print()
+        print('Usage: {} --cache [vocabulary-file]'.format(script))
+        print('Compare autocomplete of prefixes typed one character at a time')
+        print('    with and without a cache, using dictionary words by default')
         return
 
+    elif sys.argv[1] == '--cache':
+        # Benchmark cached autocomplete with the given or dictionary words
+        filename = sys.argv[2] if len(sys.argv) > 2 else '/usr/share/dict/words'
+        benchmark_cache([line for line in get_lines(filename) if line])
+
     elif len(sys.argv) == 2:
         # Test autocomplete with dictionary words and the given prefix
         prefix = sys.argv[1]
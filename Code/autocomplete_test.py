@@ -0,0 +1,111 @@
+#!python3
+
+from autocomplete import autocomplete_setup, autocomplete, AutocompleteCache
+from persistentprefixtree import PersistentPrefixTree
+from radixtree import generate_words
+import unittest
+
+
+class AutocompleteTest(unittest.TestCase):
+
+    def test_algorithms(self):
+        vocabulary = ['axle', 'axled', 'maxlen', 'taxless', 'axis']
+        for algorithm in ['linear_search', 'trie']:
+            structure = autocomplete_setup(vocabulary, algorithm)
+            assert autocomplete('axl', structure, algorithm) == ['axle',
+                                                                 'axled']
+        structure = autocomplete_setup(vocabulary, 'suffix_array')
+        assert autocomplete('axl', structure, 'suffix_array') == \
+            ['axle', 'axled', 'maxlen', 'taxless']
+        with self.assertRaises(ValueError):
+            autocomplete_setup(vocabulary, 'hash_table')
+
+
+
+class AutocompleteCacheTest(unittest.TestCase):
+
+    def test_hits_inherited_and_misses(self):
+        vocabulary = ['cab', 'car', 'cart', 'cat', 'dog']
+        structure = autocomplete_setup(vocabulary, 'trie')
+        cache = AutocompleteCache(structure, 'trie')
+        assert cache.complete('ca') == ['cab', 'car', 'cart', 'cat']
+        # Filtered from the completions of 'ca'
+        assert cache.complete('car') == ['car', 'cart']
+        assert cache.complete('cat') == ['cat']
+        assert cache.complete('car') == ['car', 'cart']
+        assert cache.complete('d') == ['dog']
+        info = cache.cache_info()
+        assert info['hits'] == 1
+        assert info['inherited'] == 2
+        assert info['misses'] == 2
+        assert info['hit_rate'] == 0.2
+        assert info['size'] == 4
+
+    def test_inherit_max(self):
+        vocabulary = ['cab', 'car', 'cart', 'cat']
+        structure = autocomplete_setup(vocabulary, 'linear_search')
+        cache = AutocompleteCache(structure, inherit_max=3)
+        cache.complete('c')
+        # Too many completions of 'c' to filter, so search again
+        assert cache.complete('ca') == vocabulary
+        assert cache.cache_info()['misses'] == 2
+        # Few enough completions of 'ca' (the longest cached prefix) to filter
+        assert cache.complete('cart') == ['cart']
+        assert cache.cache_info()['inherited'] == 0
+        cache = AutocompleteCache(structure, inherit_max=4)
+        cache.complete('c')
+        assert cache.complete('cart') == ['cart']
+        assert cache.cache_info()['inherited'] == 1
+
+    def test_lru_eviction(self):
+        structure = autocomplete_setup(['ab', 'bc', 'cd'], 'trie')
+        cache = AutocompleteCache(structure, 'trie', maxsize=2)
+        cache.complete('a')
+        cache.complete('b')
+        cache.complete('a')  # Makes 'b' least recently used
+        cache.complete('c')
+        assert list(cache.cache) == ['a', 'c']
+        assert cache.cache_info()['evictions'] == 1
+        with self.assertRaises(ValueError):
+            AutocompleteCache(structure, maxsize=0)
+
+    def test_invalidated_on_insert_and_delete(self):
+        for structure in [autocomplete_setup(['cat', 'cow'], 'trie'),
+                          PersistentPrefixTree(['cat', 'cow'])]:
+            cache = AutocompleteCache(structure, 'trie')
+            assert cache.complete('c') == ['cat', 'cow']
+            structure.insert('cab')
+            assert cache.complete('c') == ['cab', 'cat', 'cow']
+            assert cache.complete('ca') == ['cab', 'cat']
+            structure.delete('cat')
+            assert cache.complete('ca') == ['cab']
+            # Inserting a string already stored changes nothing
+            structure.insert('cab')
+            assert cache.complete('ca') == ['cab']
+            info = cache.cache_info()
+            assert info['invalidations'] == 2
+            assert info['hits'] == 1
+
+    def test_suffix_array_inherits_infix_matches(self):
+        vocabulary = ['phone', 'smartphone', 'photo', 'iphones']
+        structure = autocomplete_setup(vocabulary, 'suffix_array')
+        cache = AutocompleteCache(structure, 'suffix_array')
+        assert cache.complete('ph') == vocabulary
+        assert cache.complete('phone') == ['phone', 'smartphone', 'iphones']
+        assert cache.cache_info()['inherited'] == 1
+
+    def test_matches_uncached(self):
+        vocabulary = generate_words(500)
+        for algorithm in ['linear_search', 'trie', 'suffix_array']:
+            structure = autocomplete_setup(vocabulary, algorithm)
+            cache = AutocompleteCache(structure, algorithm, maxsize=50,
+                                      inherit_max=100)
+            for word in vocabulary[::25]:
+                for length in range(len(word) + 1):
+                    prefix = word[:length]
+                    assert cache.complete(prefix) == \
+                        autocomplete(prefix, structure, algorithm)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -86,21 +86,24 @@ class BinaryMinHeap(object):
         Best case running time: O(1) if parent item is smaller than this item.
         Worst case running time: O(log n) if items on path up to root node are
         out of order. Maximum path length in complete binary tree is log n."""
-        if index == 0:
-            return  # This index is the root node (does not have a parent)
         if not (0 <= index <= self._last_index()):
             raise IndexError('Invalid index: {}'.format(index))
+        items = self.items
         # Get the item's value
-        item = self.items[index]
-        # Get the parent's index and value
-        parent_index = self._parent_index(index)
-        parent_item = self.items[parent_index]
-        #  Swap this item with parent item if values are out of order
-        if parent_item > item:
-            self.items[index], self.items[parent_index] = self.items[parent_index], self.items[index]
-        #  Recursively bubble up again if necessary
-            self._bubble_up(parent_index)
-        
+        item = items[index]
+        #  Move parent items down while they are greater than this item,
+        #  iteratively instead of recursively to avoid a call per level
+        while index > 0:
+            # Get the parent's index and value
+            parent_index = (index - 1) >> 1
+            parent_item = items[parent_index]
+            if not parent_item > item:
+                break
+            items[index] = parent_item
+            index = parent_index
+        #  Place this item in the last vacated position
+        items[index] = item
+
     def _bubble_down(self, index):
         """Ensure the heap ordering property is true below the given index,
         swapping out of order items, or until a leaf node is reached.
@@ -109,28 +112,27 @@ class BinaryMinHeap(object):
         out of order. Maximum path length in complete binary tree is log n."""
         if not (0 <= index <= self._last_index()):
             raise IndexError('Invalid index: {}'.format(index))
-        # Get the index of the item's left and right children
-        left_index = self._left_child_index(index)
-        right_index = self._right_child_index(index)
-        if left_index > self._last_index() or right_index > self._last_index():
-            return  # This index is a leaf node (does not have any children)
+        items = self.items
+        last_index = len(items) - 1
         # Get the item's value
-        item = self.items[index]
-
-        #  Determine which child item to compare this node's item to
-        child_index = 0
-        left_child = self.items[left_index]
-        right_child = self.items[right_index]
-        
-        # Compare children, and set child_index to that of min child
-        child_index = left_index if left_child < right_child else right_index
-        child_item = self.items[child_index]
-
-        #  Swap this item with a child item if values are out of order
-        if child_item < item:
-            self.items[index], self.items[child_index] = self.items[child_index], self.items[index]
-            #  Recursively bubble down again if necessary
-            self._bubble_down(child_index)
+        item = items[index]
+        #  Move smaller child items up, iteratively instead of recursively
+        while True:
+            # Get the index of the item's left and right children
+            child_index = (index << 1) + 1
+            if child_index > last_index:
+                break  # This index is a leaf node (does not have any children)
+            #  Compare children, and set child_index to that of min child
+            right_index = child_index + 1
+            if right_index <= last_index and items[right_index] < items[child_index]:
+                child_index = right_index
+            child_item = items[child_index]
+            if not child_item < item:
+                break
+            items[index] = child_item
+            index = child_index
+        #  Place this item in the last vacated position
+        items[index] = item
 
     def _last_index(self):
         """Return the last valid index in the underlying array of items."""
@@ -0,0 +1,70 @@
+#!python
+
+from binaryheap import BinaryMinHeap
+
+
+class BoundedTopK(object):
+    """BoundedTopK: a container that keeps the k largest items offered to it
+    from a stream of any length. Items are stored in a binary min heap of at
+    most k items, so the smallest kept item is always at the root and an item
+    that cannot enter is rejected after a single comparison with it.
+    Memory usage: O(k) no matter how many items are offered."""
+
+    def __init__(self, k, items=None):
+        """Initialize this top-k tracker to keep the k largest items, and offer
+        the given items, if any."""
+        if k < 1:
+            raise ValueError('k must be at least 1, not {!r}'.format(k))
+        self.k = k
+        self.heap = BinaryMinHeap()
+        if items is not None:
+            for item in items:
+                self.offer(item)
+
+    def __repr__(self):
+        """Return a string representation of this top-k tracker."""
+        return 'BoundedTopK({}, {!r})'.format(self.k, self.items())
+
+    def size(self):
+        """Return the number of items kept in this top-k tracker."""
+        return self.heap.size()
+
+    def is_full(self):
+        """Return True if this top-k tracker is keeping k items."""
+        return self.heap.size() == self.k
+
+    def get_min(self):
+        """Return the smallest kept item, which a new item must exceed to enter
+        once this top-k tracker is full.
+        Running time: O(1) because the smallest item is the heap's root."""
+        return self.heap.get_min()
+
+    def offer(self, item):
+        """Offer the given item and return True if it was kept, or False if it
+        is not larger than the smallest of k kept items.
+        Best case running time: O(1) if the item is rejected with one comparison.
+        Worst case running time: O(log k) if the item replaces the root."""
+        if self.heap.size() < self.k:
+            self.heap.insert(item)
+            return True
+        if item <= self.heap.items[0]:
+            return False
+        self.heap.replace_min(item)
+        return True
+
+    def merge(self, other):
+        """Offer every item kept by the other top-k tracker (or the items of the
+        given iterable) to this one, so this one keeps the k largest items of
+        both, as when combining per-worker results.
+        Raise ValueError if the other tracker is this one.
+        Running time: O(m log k) for m items offered."""
+        if other is self:
+            raise ValueError('Cannot merge a top-k tracker with itself')
+        items = other.heap.items if isinstance(other, BoundedTopK) else other
+        for item in items:
+            self.offer(item)
+
+    def items(self):
+        """Return a list of the kept items in descending order.
+        Running time: O(k log k) to sort the kept items."""
+        return sorted(self.heap.items, reverse=True)
@@ -0,0 +1,52 @@
+#!python
+
+from boundedtopk import BoundedTopK
+import random
+import unittest
+
+
+class BoundedTopKTest(unittest.TestCase):
+    def test_init_with_invalid_k(self):
+        with self.assertRaises(ValueError):
+            BoundedTopK(0)
+
+    def test_offer_keeps_largest_items(self):
+        topk = BoundedTopK(3)
+        assert topk.offer(5) is True
+        assert topk.offer(1) is True
+        assert topk.is_full() is False
+        assert topk.offer(9) is True
+        assert topk.is_full() is True
+        assert topk.get_min() == 1
+        assert topk.offer(0) is False  # Smaller than every kept item
+        assert topk.offer(1) is False  # Not larger than smallest kept item
+        assert topk.offer(7) is True
+        assert topk.size() == 3
+        assert topk.items() == [9, 7, 5]
+
+    def test_offer_many_random_items(self):
+        items = [random.randint(1, 1000) for _ in range(500)]
+        topk = BoundedTopK(10, items)
+        assert topk.size() == 10
+        assert topk.items() == sorted(items, reverse=True)[:10]
+
+    def test_merge(self):
+        items1 = random.sample(range(1000), 100)
+        items2 = random.sample(range(1000), 100)
+        topk1 = BoundedTopK(5, items1)
+        topk2 = BoundedTopK(5, items2)
+        topk1.merge(topk2)
+        assert topk1.items() == sorted(items1 + items2, reverse=True)[:5]
+        topk1.merge([2000, 1500])
+        assert topk1.items()[:2] == [2000, 1500]
+        assert topk1.size() == 5
+
+    def test_merge_with_itself(self):
+        topk = BoundedTopK(3, [1, 5, 9])
+        with self.assertRaises(ValueError):
+            topk.merge(topk)
+        assert topk.items() == [9, 5, 1]
+
+
+if __name__ == '__main__':
+    unittest.main()
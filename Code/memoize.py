@@ -0,0 +1,188 @@
+#!python
+
+import atexit
+import collections
+import functools
+import os
+import pickle
+import time
+
+
+class Memoized(object):
+    """Memoized: a wrapper around a function that caches its results by
+    argument values, so repeated calls with the same arguments return the
+    cached result instead of calling the function again.
+    The cache can be bounded to maxsize results, evicting the least recently
+    used (policy 'lru') or least frequently used (policy 'lfu') result, and
+    results can expire ttl seconds after they are cached. If a filename is
+    given, the cache is loaded from that file and saved to it at exit."""
+
+    POLICIES = ('lru', 'lfu')
+
+    def __init__(self, function, maxsize=None, policy='lru', ttl=None,
+                 filename=None):
+        """Initialize this memoized wrapper around the given function."""
+        if policy not in Memoized.POLICIES:
+            raise ValueError('Unknown eviction policy: {!r}'.format(policy))
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('maxsize must be at least 1, not {!r}'.format(maxsize))
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.maxsize = maxsize
+        self.policy = policy
+        self.ttl = ttl
+        self.filename = filename
+        # Map argument keys to (result, expiration time or None) pairs, kept
+        # in order of use for the LRU policy
+        self.cache = collections.OrderedDict()
+        # Map argument keys to use counts, and use counts to the keys with that
+        # count in order of use, so the LFU policy can evict in O(1) time
+        # (the least count is None after removing the last key with it, until
+        # a result is added; see _remove)
+        self.frequencies = {}
+        self.frequency_keys = collections.defaultdict(collections.OrderedDict)
+        self.min_frequency = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if filename is not None:
+            self.load()
+            atexit.register(self.save)
+
+    def __repr__(self):
+        """Return a string representation of this memoized function."""
+        return 'Memoized({}, maxsize={}, policy={!r})'.format(
+            self.function.__name__, self.maxsize, self.policy)
+
+    def __get__(self, instance, owner):
+        """Bind this memoized function to the given instance, like a method."""
+        if instance is None:
+            return self
+        return functools.partial(self, instance)
+
+    def __call__(self, *args, **kwargs):
+        """Return the cached result for the given arguments if there is one,
+        or call the function and cache its result otherwise.
+        Running time: O(1) plus the function's running time on a miss."""
+        key = args
+        if kwargs:
+            key += (Memoized,) + tuple(sorted(kwargs.items()))
+        entry = self.cache.get(key)
+        if entry is not None:
+            result, expires = entry
+            if expires is None or expires > time.time():
+                self.hits += 1
+                self._touch(key)
+                return result
+            self._remove(key)  # Expired, so treat as a miss
+        self.misses += 1
+        result = self.function(*args, **kwargs)
+        self._add(key, result)
+        return result
+
+    def cache_info(self):
+        """Return a dictionary of hit, miss, and eviction statistics."""
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / calls if calls else 0.0,
+            'size': len(self.cache),
+            'maxsize': self.maxsize,
+            'policy': self.policy,
+        }
+
+    def cache_clear(self):
+        """Remove all cached results and reset statistics."""
+        self.cache.clear()
+        self.frequencies.clear()
+        self.frequency_keys.clear()
+        self.min_frequency = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def save(self):
+        """Save the cached results that have not expired to this memoized
+        function's file, if it has one."""
+        if self.filename is None:
+            return
+        now = time.time()
+        entries = [(key, entry) for key, entry in self.cache.items()
+                   if entry[1] is None or entry[1] > now]
+        with open(self.filename, 'wb') as file:
+            pickle.dump(entries, file)
+
+    def load(self):
+        """Load cached results from this memoized function's file, if it
+        exists, skipping results that have expired."""
+        if self.filename is None or not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'rb') as file:
+            entries = pickle.load(file)
+        now = time.time()
+        for key, (result, expires) in entries:
+            if expires is None or expires > now:
+                self._add(key, result, expires)
+
+    def _touch(self, key):
+        """Record a use of the given cached key for the eviction policy."""
+        if self.policy == 'lru':
+            self.cache.move_to_end(key)
+            return
+        frequency = self.frequencies[key]
+        del self.frequency_keys[frequency][key]
+        if not self.frequency_keys[frequency]:
+            del self.frequency_keys[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = frequency + 1
+        self.frequencies[key] = frequency + 1
+        self.frequency_keys[frequency + 1][key] = None
+
+    def _add(self, key, result, expires=None):
+        """Cache the given result for the given key, evicting another result
+        first if the cache is full."""
+        if self.maxsize is not None and len(self.cache) >= self.maxsize:
+            self._evict()
+        if expires is None and self.ttl is not None:
+            expires = time.time() + self.ttl
+        self.cache[key] = (result, expires)
+        if self.policy == 'lfu':
+            self.frequencies[key] = 1
+            self.frequency_keys[1][key] = None
+            self.min_frequency = 1
+
+    def _evict(self):
+        """Remove the cached result chosen by the eviction policy."""
+        if self.policy == 'lru':
+            key = next(iter(self.cache))
+        else:
+            if self.min_frequency is None:
+                self.min_frequency = min(self.frequency_keys)
+            key = next(iter(self.frequency_keys[self.min_frequency]))
+        self._remove(key)
+        self.evictions += 1
+
+    def _remove(self, key):
+        """Remove the given key's cached result."""
+        del self.cache[key]
+        if self.policy == 'lfu':
+            frequency = self.frequencies.pop(key)
+            del self.frequency_keys[frequency][key]
+            if not self.frequency_keys[frequency]:
+                del self.frequency_keys[frequency]
+                # Removal is always followed by adding a result, which resets
+                # the least frequency to 1, so only find it again if another
+                # result is evicted first (as by a recursive call)
+                if self.min_frequency == frequency:
+                    self.min_frequency = None
+
+
+def memoize(function=None, maxsize=None, policy='lru', ttl=None, filename=None):
+    """Decorate a function to cache its results, used either as @memoize or
+    with options as @memoize(maxsize=128, policy='lfu', ttl=60.0).
+    See Memoized for the meaning of each option."""
+    def decorate(function):
+        return Memoized(function, maxsize, policy, ttl, filename)
+    if function is not None:
+        return decorate(function)
+    return decorate
@@ -0,0 +1,100 @@
+#!python
+
+from memoize import memoize
+import os
+import tempfile
+import time
+import unittest
+
+
+class MemoizeTest(unittest.TestCase):
+    def test_hits_and_misses(self):
+        calls = []
+
+        @memoize
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        assert square(3) == 9
+        assert square(3) == 9
+        assert square(4) == 16
+        assert calls == [3, 4]
+        info = square.cache_info()
+        assert info['hits'] == 1
+        assert info['misses'] == 2
+        assert info['size'] == 2
+        assert square.__name__ == 'square'
+        square.cache_clear()
+        assert square.cache_info()['size'] == 0
+
+    def test_keyword_arguments(self):
+        @memoize
+        def power(x, exponent=2):
+            return x ** exponent
+
+        assert power(2) == 4
+        assert power(2, exponent=3) == 8
+        assert power(2, exponent=3) == 8
+        assert power.cache_info()['hits'] == 1
+
+    def test_lru_eviction(self):
+        @memoize(maxsize=2, policy='lru')
+        def identity(x):
+            return x
+
+        identity(1)
+        identity(2)
+        identity(1)  # 2 is now the least recently used
+        identity(3)  # Evicts 2
+        assert identity.cache_info()['evictions'] == 1
+        identity(1)
+        assert identity.cache_info()['hits'] == 2
+        identity(2)
+        assert identity.cache_info()['misses'] == 4
+
+    def test_lfu_eviction(self):
+        @memoize(maxsize=2, policy='lfu')
+        def identity(x):
+            return x
+
+        identity(1)
+        identity(1)
+        identity(2)  # 2 is used less often than 1
+        identity(3)  # Evicts 2
+        identity(1)
+        assert identity.cache_info()['hits'] == 2
+        identity(2)
+        assert identity.cache_info()['misses'] == 4
+        assert identity.cache_info()['evictions'] == 2
+
+    def test_ttl_expiration(self):
+        @memoize(ttl=0.05)
+        def identity(x):
+            return x
+
+        identity(1)
+        identity(1)
+        time.sleep(0.06)
+        identity(1)
+        assert identity.cache_info()['hits'] == 1
+        assert identity.cache_info()['misses'] == 2
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            memoize(policy='fifo')(abs)
+        with self.assertRaises(ValueError):
+            memoize(maxsize=0)(abs)
+
+    def test_persistence(self):
+        filename = os.path.join(tempfile.mkdtemp(), 'cache.pickle')
+        square = memoize(filename=filename)(lambda x: x * x)
+        square(5)
+        square.save()
+        restored = memoize(filename=filename)(lambda x: -1)
+        assert restored(5) == 25
+        assert restored.cache_info()['hits'] == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
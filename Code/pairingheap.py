@@ -0,0 +1,310 @@
+#!python
+
+from binaryheap import BinaryMinHeap
+
+
+class PairingHeapNode(object):
+    """PairingHeapNode: a node in a pairing heap that stores an item and links
+    to its leftmost child, its next sibling, and its previous node (the left
+    sibling, or the parent if this node is the leftmost child), and the
+    membership of the heap it is in (None once its item is deleted).
+    Nodes use __slots__ to avoid a per-node attribute dictionary."""
+
+    __slots__ = ('item', 'child', 'sibling', 'prev', 'owner')
+
+    def __init__(self, item, owner=None):
+        """Initialize this node with the given item and owner, and no links."""
+        self.item = item
+        self.child = None
+        self.sibling = None
+        self.prev = None
+        self.owner = owner
+
+    def __repr__(self):
+        """Return a string representation of this node."""
+        return 'PairingHeapNode({!r})'.format(self.item)
+
+
+class HeapMembership(object):
+    """HeapMembership: a record of which pairing heap a group of nodes belongs
+    to, shared by all nodes inserted into one heap, so melding heaps can move
+    all of one heap's nodes into another in O(1) time by forwarding its
+    membership to the other heap's membership instead of updating each node."""
+
+    __slots__ = ('heap', 'forward')
+
+    def __init__(self, heap):
+        """Initialize this membership of the given heap, not forwarded."""
+        self.heap = heap
+        self.forward = None
+
+
+class PairingHeap(object):
+    """PairingHeap: a mergeable min heap stored as a multi-way tree of nodes
+    where every node's item is no larger than the items of its children.
+    Insert and meld only link two trees together, so they take O(1) time,
+    and delete_min restructures the root's children in two pairing passes.
+    Nodes returned by insert can be passed back to decrease_key."""
+
+    def __init__(self, items=None):
+        """Initialize this heap and insert the given items, if any."""
+        self.root = None
+        self.count = 0
+        # Membership shared by the nodes inserted into this heap
+        self.membership = HeapMembership(self)
+        if items:
+            for item in items:
+                self.insert(item)
+
+    def __repr__(self):
+        """Return a string representation of this heap."""
+        if self.root is None:
+            return 'PairingHeap(0 items)'
+        return 'PairingHeap({} items, min={!r})'.format(self.count,
+                                                        self.root.item)
+
+    def is_empty(self):
+        """Return True if this heap is empty, or False otherwise."""
+        return self.root is None
+
+    def size(self):
+        """Return the number of items in this heap."""
+        return self.count
+
+    def insert(self, item):
+        """Insert the given item into this heap and return its node, which
+        can be given to decrease_key to lower the item later.
+        Running time: O(1) because the new node is linked with the root."""
+        node = PairingHeapNode(item, self.membership)
+        self.root = self._link(self.root, node)
+        self.count += 1
+        return node
+
+    def get_min(self):
+        """Return the minimum item at the root of this heap.
+        Best and worst case running time: O(1) because min item is the root."""
+        if self.root is None:
+            raise ValueError('Heap is empty and has no minimum item')
+        return self.root.item
+
+    def delete_min(self):
+        """Remove and return the minimum item at the root of this heap.
+        Amortized running time: O(log n) to pair up the root's children.
+        Worst case running time: O(n) if the root has n-1 children."""
+        if self.root is None:
+            raise ValueError('Heap is empty and has no minimum item')
+        min_node = self.root
+        self.root = self._merge_pairs(min_node.child)
+        if self.root is not None:
+            self.root.prev = None
+        self.count -= 1
+        # Detach the old root so a stale node handle cannot reach the heap
+        min_node.child = None
+        min_node.owner = None
+        return min_node.item
+
+    def replace_min(self, item):
+        """Remove and return the minimum item at the root of this heap,
+        and insert the given item into this heap.
+        Amortized running time: O(log n), the cost of delete_min."""
+        if self.root is None:
+            raise ValueError('Heap is empty and has no minimum item')
+        min_item = self.delete_min()
+        self.insert(item)
+        return min_item
+
+    def meld(self, other):
+        """Move all items from the other pairing heap into this heap, leaving
+        the other heap empty.
+        Running time: O(1) because only the two roots are linked together."""
+        if other is self:
+            raise ValueError('Cannot meld a heap with itself')
+        self.root = self._link(self.root, other.root)
+        self.count += other.count
+        other.root = None
+        other.count = 0
+        # Forward the other heap's nodes to this heap, and give the other heap
+        # a new membership for nodes inserted into it later
+        other.membership.heap = None
+        other.membership.forward = self.membership
+        other.membership = HeapMembership(other)
+
+    def decrease_key(self, node, item):
+        """Lower the item stored in the given node (returned by insert) to the
+        given item, which must not be greater than the node's current item.
+        Running time: O(1) to cut the node's subtree and link it to the root,
+        plus amortized O(log n) paid by a later delete_min.
+        Raise ValueError if the node is not in this heap, because its item was
+        deleted or it is in another heap, before changing anything."""
+        if not self.owns(node):
+            raise ValueError('Node {!r} is not in this heap'.format(node))
+        if item > node.item:
+            raise ValueError('New item {!r} is greater than current item {!r}'
+                             .format(item, node.item))
+        node.item = item
+        if node is self.root:
+            return
+        # Cut this node's subtree out of its parent's list of children
+        if node.prev.child is node:
+            node.prev.child = node.sibling  # This node is the leftmost child
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.sibling = None
+        node.prev = None
+        self.root = self._link(self.root, node)
+
+    def owns(self, node):
+        """Return True if the given node (returned by insert) is in this heap,
+        either inserted into it or moved into it by meld, and its item has not
+        been deleted.
+        Running time: O(1) amortized, since forwarded memberships are followed
+        once and then skipped (path compression)."""
+        membership = node.owner
+        if membership is None:
+            return False
+        while membership.forward is not None:
+            membership = membership.forward
+        node.owner = membership
+        return membership.heap is self
+
+    def _link(self, first, second):
+        """Link the two given trees by making the root with the larger item the
+        leftmost child of the other root, and return the resulting root.
+        Running time: O(1) because only a few links are changed."""
+        if first is None:
+            return second
+        if second is None:
+            return first
+        if second.item < first.item:
+            first, second = second, first
+        # Make second root the leftmost child of first root
+        second.prev = first
+        second.sibling = first.child
+        if first.child is not None:
+            first.child.prev = second
+        first.child = second
+        first.sibling = None
+        return first
+
+    def _merge_pairs(self, node):
+        """Combine the given list of sibling trees into one tree by linking
+        them in pairs from left to right, then linking the resulting trees
+        from right to left, and return the root of the combined tree.
+        Running time: O(k) for a list of k siblings, done iteratively."""
+        # First pass: link siblings in pairs from left to right
+        pairs = []
+        while node is not None:
+            first = node
+            second = node.sibling
+            if second is None:
+                node = None
+            else:
+                node = second.sibling
+                second.sibling = None
+                second.prev = None
+            first.sibling = None
+            first.prev = None
+            pairs.append(self._link(first, second))
+        # Second pass: link the pairs from right to left into one tree
+        root = None
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        return root
+
+
+def benchmark_heaps(num_heaps=200, heap_size=500, num_updates=50000):
+    """Compare BinaryMinHeap and PairingHeap on a meld-heavy trace, where many
+    small heaps are merged into one, and a decrease-key-heavy trace, where the
+    items already in a heap are repeatedly lowered (as in Dijkstra's algorithm).
+    BinaryMinHeap has no meld or decrease_key, so it re-inserts every item when
+    merging and inserts a new entry (skipping stale ones on delete) to lower
+    an item, which is how array heaps are used for these workloads."""
+    import random
+    import time
+
+    print('Meld-heavy trace: {} heaps of {} items'.format(num_heaps, heap_size))
+    batches = [[random.random() for _ in range(heap_size)]
+               for _ in range(num_heaps)]
+
+    binary_heaps = [BinaryMinHeap(batch) for batch in batches]
+    start_time = time.time()
+    merged = BinaryMinHeap()
+    for heap in binary_heaps:
+        for item in heap.items:
+            merged.insert(item)
+    binary_time = time.time() - start_time
+
+    pairing_heaps = [PairingHeap(batch) for batch in batches]
+    start_time = time.time()
+    melded = PairingHeap()
+    for heap in pairing_heaps:
+        melded.meld(heap)
+    pairing_time = time.time() - start_time
+
+    assert merged.get_min() == melded.get_min()
+    print('BinaryMinHeap re-insert: {:.6f} sec'.format(binary_time))
+    print('PairingHeap meld:        {:.6f} sec'.format(pairing_time))
+
+    num_items = num_heaps * heap_size
+    print('\nDecrease-key-heavy trace: {} items, {} updates'
+          .format(num_items, num_updates))
+    keys = [random.random() for _ in range(num_items)]
+    updates = [(random.randrange(num_items), random.random())
+               for _ in range(num_updates)]
+
+    start_time = time.time()
+    current = list(keys)
+    heap = BinaryMinHeap([(key, index) for index, key in enumerate(keys)])
+    for index, amount in updates:
+        current[index] -= amount
+        heap.insert((current[index], index))
+    binary_order = []
+    while not heap.is_empty():
+        key, index = heap.delete_min()
+        if key == current[index]:  # Skip stale entries for lowered items
+            binary_order.append(index)
+    binary_time = time.time() - start_time
+
+    start_time = time.time()
+    heap = PairingHeap()
+    nodes = [heap.insert((key, index)) for index, key in enumerate(keys)]
+    for index, amount in updates:
+        key, _ = nodes[index].item
+        heap.decrease_key(nodes[index], (key - amount, index))
+    pairing_order = []
+    while not heap.is_empty():
+        pairing_order.append(heap.delete_min()[1])
+    pairing_time = time.time() - start_time
+
+    assert binary_order == pairing_order
+    print('BinaryMinHeap insert + skip stale: {:.6f} sec'.format(binary_time))
+    print('PairingHeap decrease_key:          {:.6f} sec'.format(pairing_time))
+
+
+def test_pairing_heap():
+    # Create a pairing heap of 7 items
+    items = [9, 25, 86, 3, 29, 5, 55]
+    heap = PairingHeap()
+    print('heap: {}'.format(heap))
+
+    print('\nInserting items:')
+    for item in items:
+        heap.insert(item)
+        print('insert({})'.format(item))
+        print('heap: {}'.format(heap))
+
+    print('\nDeleting items:')
+    for item in sorted(items):
+        heap_min = heap.delete_min()
+        print('delete_min: {}'.format(heap_min))
+        print('heap: {}'.format(heap))
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        benchmark_heaps(*(int(arg) for arg in sys.argv[2:]))
+    else:
+        test_pairing_heap()
@@ -0,0 +1,116 @@
+#!python
+
+from pairingheap import PairingHeap
+import random
+import unittest
+
+
+class TestPairingHeap(unittest.TestCase):
+    def test_size_of_empty_heap(self):
+        heap = PairingHeap()
+        assert heap.size() == 0
+        assert heap.is_empty() is True
+
+    def test_get_min_on_empty_heap(self):
+        heap = PairingHeap()
+        with self.assertRaises(ValueError):
+            heap.get_min()
+
+    def test_delete_min_on_empty_heap(self):
+        heap = PairingHeap()
+        with self.assertRaises(ValueError):
+            heap.delete_min()
+
+    def test_insert_and_get_many_items(self):
+        heap = PairingHeap()
+        items = [9, 25, 86, 3, 29, 5, 55]
+        for index, item in enumerate(items):
+            heap.insert(item)
+            assert heap.size() == index + 1
+            assert heap.get_min() == min(items[: index + 1])
+
+    def test_insert_and_delete_many_random_items(self):
+        items = random.sample(range(1000), 50)
+        heap = PairingHeap(items)
+        assert heap.size() == len(items)
+        for item in sorted(items):
+            assert heap.delete_min() == item
+        assert heap.size() == 0
+
+    def test_replace_min(self):
+        heap = PairingHeap([5, 3, 8])
+        assert heap.replace_min(6) == 3
+        assert heap.size() == 3
+        assert [heap.delete_min() for _ in range(3)] == [5, 6, 8]
+
+    def test_meld(self):
+        items1 = random.sample(range(1000), 30)
+        items2 = random.sample(range(1000), 20)
+        heap1 = PairingHeap(items1)
+        heap2 = PairingHeap(items2)
+        heap1.meld(heap2)
+        assert heap1.size() == 50
+        assert heap2.size() == 0
+        assert heap2.is_empty() is True
+        assert [heap1.delete_min() for _ in range(50)] == sorted(items1 + items2)
+        with self.assertRaises(ValueError):
+            heap1.meld(heap1)
+
+    def test_decrease_key(self):
+        items = random.sample(range(100, 1000), 50)
+        heap = PairingHeap()
+        nodes = [heap.insert(item) for item in items]
+        # Lower every other item, including ones deep inside the heap
+        for index in range(0, 50, 2):
+            items[index] -= 100
+            heap.decrease_key(nodes[index], items[index])
+            assert heap.get_min() == min(items)
+        assert [heap.delete_min() for _ in range(50)] == sorted(items)
+
+    def test_decrease_key_with_greater_item(self):
+        heap = PairingHeap()
+        node = heap.insert(5)
+        with self.assertRaises(ValueError):
+            heap.decrease_key(node, 6)
+
+    def test_decrease_key_of_deleted_node(self):
+        heap = PairingHeap()
+        node = heap.insert(5)
+        other = heap.insert(7)
+        assert heap.delete_min() == 5
+        with self.assertRaises(ValueError):
+            heap.decrease_key(node, 1)
+        # The rejected node is unchanged and the heap still works
+        assert node.item == 5
+        assert heap.size() == 1
+        heap.decrease_key(other, 2)
+        assert heap.delete_min() == 2
+
+    def test_decrease_key_of_foreign_node(self):
+        heap1 = PairingHeap()
+        heap2 = PairingHeap()
+        heap3 = PairingHeap()
+        node1 = heap1.insert(5)
+        node2 = heap2.insert(6)
+        node3 = heap3.insert(7)
+        with self.assertRaises(ValueError):
+            heap1.decrease_key(node2, 1)
+        assert node2.item == 6
+        # Nodes move with their items when heaps are melded, even repeatedly
+        heap2.meld(heap3)
+        heap1.meld(heap2)
+        for heap in [heap2, heap3]:
+            with self.assertRaises(ValueError):
+                heap.decrease_key(node3, 1)
+        assert node3.item == 7
+        assert heap1.owns(node1) and heap1.owns(node2) and heap1.owns(node3)
+        heap1.decrease_key(node3, 1)
+        # Melded heaps can be reused with new nodes of their own
+        node4 = heap2.insert(8)
+        assert heap2.owns(node4) is True
+        assert heap1.owns(node4) is False
+        assert [heap1.delete_min() for _ in range(3)] == [1, 5, 6]
+
+
+if __name__ == '__main__':
+    unittest.main()
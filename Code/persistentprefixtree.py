@@ -0,0 +1,316 @@
+#!python3
+
+import threading
+
+from prefixtree import PrefixTree
+from prefixtreenode import PrefixTreeNode
+
+
+class PersistentPrefixTree(PrefixTree):
+    """PersistentPrefixTree: A prefix tree whose nodes are never changed once
+    they are reachable from its root, so it can be read by many threads
+    without locking while another thread updates it. Each update copies only
+    the nodes on the paths of the strings it changes (path copying), links the
+    copies to the unchanged nodes they share with the old tree, and publishes
+    the new root, size, and version number together with a single attribute
+    assignment, which is atomic. Readers that started before an update keep
+    reading the old version, which is reclaimed by reference counting as soon
+    as no reader refers to it. Updates are serialized with a lock held only by writers.
+    Each method reads the published version once, so its result is from a
+    single version; take a snapshot to read several times from one version."""
+
+    def __init__(self, strings=None):
+        """Initialize this prefix tree and insert the given strings, if any."""
+        # Serialize writers, which build each new version from the last one
+        self.lock = threading.Lock()
+        # Counts of calls and nodes visited by each operation, if enabled
+        self.visits = None
+        # Version of the strings stored when links for find_all were built,
+        # and a separate prefix tree of that version's strings holding them
+        self.links = None
+        # Build the first version in place, since no reader can see it yet
+        tree = PrefixTree(strings)
+        # Published version of this tree (its root, size, and number of
+        # updates that changed it), replaced as a whole by each update
+        self._state = (tree.root, tree.size, 0)
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'PersistentPrefixTree({self.strings()!r})'
+
+    @property
+    def root(self):
+        """Root node of the published version of this prefix tree."""
+        return self._state[0]
+
+    @property
+    def size(self):
+        """Number of strings in the published version of this prefix tree."""
+        return self._state[1]
+
+    @property
+    def version(self):
+        """Number of updates that changed the strings stored in this prefix
+        tree before its published version."""
+        return self._state[2]
+
+    def snapshot(self):
+        """Return a persistent prefix tree holding the published version of
+        this prefix tree, which later updates to this tree do not change.
+        Updates to the snapshot copy its paths too, so they do not change
+        this tree either.
+        Running time: O(1), since all nodes are shared"""
+        snapshot = PersistentPrefixTree()
+        snapshot._state = self._state
+        return snapshot
+
+    def complete(self, prefix=''):
+        """Return a list of all strings stored in this prefix tree that start
+        with the given prefix string, all from the same version."""
+        root = self.root
+        completions = []
+        node = _find_node(root, prefix)
+        if node is None or root.num_children() == 0:
+            return completions
+        visited = self._traverse(node, prefix, completions.append)
+        if self.visits is not None:
+            self._count_visits('complete', len(prefix) + visited)
+        return completions
+
+    def longest_prefix_of_many(self, texts):
+        """Return a list of the longest stored prefix of each of the given
+        texts, all from the same version (see longest_prefix_of)."""
+        root = self.root
+        longest = []
+        for text in texts:
+            length = None
+            for length in _prefix_lengths(root, text):
+                pass
+            longest.append(text[:length] if length is not None else None)
+        return longest
+
+    def prefixes_of_many(self, texts):
+        """Return a list of the lists of stored prefixes of each of the given
+        texts, all from the same version (see prefixes_of)."""
+        root = self.root
+        return [[text[:length] for length in _prefix_lengths(root, text)]
+                for text in texts]
+
+    def stats(self):
+        """Return a dictionary of statistics about the published version of
+        this prefix tree (see PrefixTree.stats)."""
+        root, size, version = self._state
+        return self._stats(root, size)
+
+    def build_links(self):
+        """Build the links used by find_all (see PrefixTree.build_links) in a
+        separate PrefixTree holding the strings of the published version,
+        since setting links on this tree's nodes would change nodes shared
+        with other versions. Later updates do not change it, and find_all
+        builds a new one once a new version has been published.
+        Running time: O(n * k) for n nodes with up to k children"""
+        self._build_links(self._state)
+
+    def _build_links(self, state):
+        """Build and return a prefix tree with links for find_all holding the
+        strings of the given published state, and keep it with its version."""
+        root, size, version = state
+        strings = []
+        self._traverse(root, '', strings.append)
+        automaton = PrefixTree(strings)
+        automaton.build_links()
+        # Replace the version and its links together, like the state
+        self.links = (version, automaton)
+        return automaton
+
+    def _automaton(self):
+        """Return the prefix tree holding the links followed by find_all for
+        the published version, building it first if it is out of date, so
+        each search reads from a single version."""
+        state = self._state
+        links = self.links
+        if links is None or links[0] != state[2]:
+            return self._build_links(state)
+        return links[1]
+
+    def insert(self, string):
+        """Insert the given string into a new version of this prefix tree and
+        publish it.
+        Running time: O(m * k) to copy the m nodes on the string's path and
+        their children structures of up to k children"""
+        self.update(inserts=[string])
+
+    def delete_many(self, strings):
+        """Delete each of the given strings that is stored in this prefix tree,
+        skipping any that are not, in one new version, and return the number
+        deleted."""
+        return self.update(deletes=strings)[1]
+
+    def _delete(self, string):
+        """Delete the given string from a new version of this prefix tree and
+        publish it, and return True, or return False if it is not stored."""
+        return self.update(deletes=[string])[1] == 1
+
+    def update(self, inserts=(), deletes=()):
+        """Delete the given strings to delete that are stored in this prefix
+        tree, then insert the given strings to insert, all in one new version
+        that is published at once, so readers see all of the changes or none
+        of them. Return a pair of the numbers of strings inserted and deleted.
+        Each node is copied at most once per update, however many of the
+        updated strings share it.
+        Running time: O(m * k) for m total characters in the given strings
+        and up to k children per node copied, independent of the number of
+        strings stored in this prefix tree"""
+        with self.lock:
+            root, size, version = self._state
+            draft = _copy_node(root)
+            # Nodes of the new version that no reader can see yet
+            fresh = {draft}
+            inserted = deleted = 0
+            for string in deletes:
+                if len(string) == 0 or _find_terminal(draft, string) is None:
+                    continue
+                path = [draft]
+                for char in string:
+                    path.append(_writable_child(path[-1], char, fresh))
+                path[-1].terminal = False
+                self._prune(path)
+                deleted += 1
+            for string in inserts:
+                # The empty string is always contained in the tree
+                if len(string) == 0 or \
+                        _find_terminal(draft, string) is not None:
+                    continue
+                node = draft
+                for char in string:
+                    node = _writable_child(node, char, fresh)
+                node.terminal = True
+                inserted += 1
+            if inserted or deleted:
+                # Publish the new version with one atomic assignment
+                self._state = (draft, size + inserted - deleted, version + 1)
+            return inserted, deleted
+
+
+def _copy_node(node):
+    """Return a new node with the same character, terminal property, and
+    children as the given node, in its own children structure."""
+    copy = PrefixTreeNode(node.character)
+    copy.children = type(node.children)(node.children.items())
+    copy.terminal = node.terminal
+    return copy
+
+
+def _writable_child(node, char, fresh):
+    """Return the child of the given fresh node for the given character,
+    first replacing it with a fresh copy if it is shared with a published
+    version, or adding a new child if it has none. Fresh nodes are in the
+    given set, to which copies and new nodes are added."""
+    if node.has_child(char):
+        child = node.get_child(char)
+        if child in fresh:
+            return child
+        child = _copy_node(child)
+    else:
+        child = PrefixTreeNode(char)
+    fresh.add(child)
+    node.children[char] = child
+    return child
+
+
+def _find_node(root, prefix):
+    """Return the node below the given root whose string is the given prefix,
+    or None if no stored string starts with it."""
+    node = root
+    for char in prefix:
+        if not node.has_child(char):
+            return None
+        node = node.get_child(char)
+    return node
+
+
+def _prefix_lengths(root, text):
+    """Yield the length of each string stored below the given root that is a
+    prefix of the given text, in increasing order (see
+    PrefixTree._prefix_lengths)."""
+    node = root
+    for depth, char in enumerate(text, 1):
+        if not node.has_child(char):
+            return
+        node = node.get_child(char)
+        if node.terminal:
+            yield depth
+
+
+def _find_terminal(root, string):
+    """Return the node below the given root that terminates the given string,
+    or None if the string is not stored below it."""
+    node = root
+    for char in string:
+        if not node.has_child(char):
+            return None
+        node = node.get_child(char)
+    return node if node.is_terminal() else None
+
+
+def benchmark_readers(vocabulary, num_readers=4, num_updates=200):
+    """Time readers completing prefixes from the given vocabulary while one
+    writer deletes and reinserts words, with readers locking a PrefixTree
+    shared with the writer, or reading a PersistentPrefixTree without
+    locking, and count reads completed during the updates."""
+    import random
+    import time
+    prefixes = [word[:2] for word in vocabulary]
+    changes = random.sample(vocabulary, min(num_updates, len(vocabulary)))
+
+    def run(tree, lock):
+        done = threading.Event()
+        reads = [0] * num_readers
+
+        def read(index):
+            while not done.is_set():
+                prefix = random.choice(prefixes)
+                if lock is None:
+                    tree.complete(prefix)
+                else:
+                    with lock:
+                        tree.complete(prefix)
+                reads[index] += 1
+
+        readers = [threading.Thread(target=read, args=(index,))
+                   for index in range(num_readers)]
+        for thread in readers:
+            thread.start()
+        start_time = time.perf_counter()
+        for word in changes:
+            if lock is None:
+                tree.delete(word)
+                tree.insert(word)
+            else:
+                with lock:
+                    tree.delete(word)
+                    tree.insert(word)
+        elapsed = time.perf_counter() - start_time
+        done.set()
+        for thread in readers:
+            thread.join()
+        return elapsed, sum(reads)
+
+    print('Vocabulary size: {}, {} readers, {} updates'.format(
+        len(vocabulary), num_readers, 2 * len(changes)))
+    print('{:28} {:>12} {:>12}'.format('Tree', 'Update sec', 'Reads'))
+    for label, tree, lock in [
+            ('PrefixTree with lock', PrefixTree(vocabulary), threading.Lock()),
+            ('PersistentPrefixTree', PersistentPrefixTree(vocabulary), None)]:
+        elapsed, reads = run(tree, lock)
+        print('{:28} {:>12.4f} {:>12}'.format(label, elapsed, reads))
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) > 1:
+        from autocomplete import get_lines
+        benchmark_readers([line for line in get_lines(sys.argv[1]) if line])
+    else:
+        from radixtree import generate_words
+        benchmark_readers(generate_words(20000))
@@ -0,0 +1,152 @@
+#!python3
+
+from persistentprefixtree import PersistentPrefixTree
+from prefixtree import PrefixTree
+import random
+import threading
+import unittest
+
+
+class PersistentPrefixTreeTest(unittest.TestCase):
+
+    def test_insert_delete_and_complete(self):
+        tree = PersistentPrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.size == 4
+        assert tree.contains('ABD') is True
+        tree.insert('XY')
+        tree.insert('XY')
+        assert tree.size == 5
+        assert tree.complete('X') == ['XY', 'XYZ']
+        tree.delete('ABC')
+        assert tree.size == 4
+        assert tree.strings() == ['A', 'ABD', 'XY', 'XYZ']
+        with self.assertRaises(ValueError):
+            tree.delete('ABC')
+        assert tree.delete_many(['A', 'ABD', 'Q']) == 2
+        assert tree.root.has_child('A') is False
+        assert tree.strings() == ['XY', 'XYZ']
+
+    def test_prefixes_of(self):
+        tree = PersistentPrefixTree(['A', 'ABC', 'XY'])
+        tree.insert('ABCDE')
+        assert tree.prefixes_of('ABCDEF') == ['A', 'ABC', 'ABCDE']
+        assert tree.longest_prefix_of_many(['ABCD', 'XYZ', 'Q']) == \
+            ['ABC', 'XY', None]
+        assert tree.prefixes_of_many(['AB']) == [['A']]
+
+    def test_find_all(self):
+        tree = PersistentPrefixTree(['he', 'she', 'his', 'hers'])
+        root = tree.root
+        assert list(tree.find_all('ushers')) == \
+            [(1, 'she'), (2, 'he'), (2, 'hers')]
+        # Links are kept off the shared nodes of published versions
+        assert root.get_child('h').fail is None
+        # A search started before an update reads from one version
+        matches = tree.find_all(['ush', 'ers'])
+        assert next(matches) == (1, 'she')
+        tree.update(inserts=['us'], deletes=['hers'])
+        assert list(matches) == [(2, 'he'), (2, 'hers')]
+        assert list(tree.find_all('ushers')) == \
+            [(0, 'us'), (1, 'she'), (2, 'he')]
+
+    def test_session(self):
+        tree = PersistentPrefixTree(['cab', 'cat'])
+        session = tree.session('ca')
+        assert session.results() == ['cab', 'cat']
+        tree.update(inserts=['car'], deletes=['cab'])
+        assert session.results() == ['car', 'cat']
+
+    def test_snapshots_are_unchanged_by_updates(self):
+        tree = PersistentPrefixTree(['ABC', 'ABD', 'XYZ'])
+        snapshot = tree.snapshot()
+        old_root = tree.root
+        node_AB = old_root.get_child('A').get_child('B')
+        tree.insert('ABE')
+        tree.delete('XYZ')
+        assert tree.strings() == ['ABC', 'ABD', 'ABE']
+        assert snapshot.strings() == ['ABC', 'ABD', 'XYZ']
+        assert snapshot.size == 3
+        # Old nodes are never changed, only copied
+        assert old_root.has_child('X') is True
+        assert node_AB.num_children() == 2
+        # Nodes off the updated paths are shared with the new version
+        assert tree.root is not old_root
+        assert tree.root.get_child('A').get_child('B').get_child('C') is \
+            node_AB.get_child('C')
+        # Updates to a snapshot do not change the tree it was taken from
+        snapshot.insert('Q')
+        assert tree.contains('Q') is False
+        assert snapshot.contains('Q') is True
+
+    def test_update_publishes_once(self):
+        tree = PersistentPrefixTree(['ABC', 'ABD'])
+        root = tree.root
+        assert tree.update(inserts=['ABE', 'ABF', 'ABC'],
+                           deletes=['ABD', 'Q']) == (2, 1)
+        assert tree.strings() == ['ABC', 'ABE', 'ABF']
+        assert tree.size == 3
+        assert tree.root is not root
+        # Updates that change nothing publish no new version
+        root = tree.root
+        assert tree.update(inserts=['ABC', ''], deletes=['ABD']) == (0, 0)
+        assert tree.root is root
+
+    def test_matches_prefix_tree(self):
+        for _ in range(50):
+            strings = [''.join(random.choice('abc') for _ in
+                               range(random.randint(1, 6)))
+                       for _ in range(random.randint(0, 30))]
+            deleted = random.sample(strings, len(strings) // 2)
+            prefix_tree = PrefixTree(strings)
+            persistent_tree = PersistentPrefixTree(strings)
+            prefix_tree.delete_many(deleted)
+            persistent_tree.delete_many(deleted)
+            assert persistent_tree.size == prefix_tree.size
+            assert persistent_tree.strings() == prefix_tree.strings()
+            assert persistent_tree.stats()['nodes'] == \
+                prefix_tree.stats()['nodes']
+
+    def test_visits_match_prefix_tree(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ']
+        trees = [PrefixTree(strings), PersistentPrefixTree(strings)]
+        for tree in trees:
+            tree.count_visits()
+            for prefix in ['', 'A', 'AB', 'XY', 'Q']:
+                tree.complete(prefix)
+            tree.contains('ABD')
+        prefix_stats, persistent_stats = [tree.stats() for tree in trees]
+        for key in ['strings', 'nodes', 'bytes', 'complete_calls',
+                    'complete_nodes_per_call', 'contains_nodes_per_call']:
+            assert persistent_stats[key] == prefix_stats[key]
+
+    def test_readers_see_consistent_versions(self):
+        # Each version stores all of the words of one group, or none of them
+        groups = [['{}{}'.format(letter, number) for number in range(20)]
+                  for letter in 'ABCDEFGH']
+        tree = PersistentPrefixTree(groups[0])
+        done = threading.Event()
+        errors = []
+
+        def read():
+            while not done.is_set():
+                snapshot = tree.snapshot()
+                strings = snapshot.strings()
+                if len(strings) != snapshot.size or len(strings) % 20 != 0:
+                    errors.append(strings)
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for thread in readers:
+            thread.start()
+        for _ in range(20):
+            for index in range(1, len(groups)):
+                tree.update(inserts=groups[index], deletes=groups[index - 1])
+            tree.update(inserts=groups[0], deletes=groups[-1])
+        done.set()
+        for thread in readers:
+            thread.join()
+        assert errors == []
+        assert tree.strings() == sorted(groups[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,9 @@
 #!python3
 
+import itertools
+import sys
+from collections import deque
+
 from prefixtreenode import PrefixTreeNode
 
 
@@ -24,6 +28,13 @@ class PrefixTree:
         self.root = PrefixTreeNode(PrefixTree.START_CHARACTER)
         # Count the number of strings inserted into the tree
         self.size = 0
+        # Counts of calls and nodes visited by each operation, if enabled
+        self.visits = None
+        # Count changes to the strings stored, so anything computed from them
+        # (like cached completions) can tell when it is out of date
+        self.version = 0
+        # Version of the strings stored when links for find_all were built
+        self.links_version = None
         # Insert each string, if any were given
         if strings is not None:
             for string in strings:
@@ -39,32 +50,83 @@ class PrefixTree:
 
     def contains(self, string):
         """Return True if this prefix tree contains the given string."""
+        if self.visits is not None:
+            self._count_visits('contains', self._path_nodes(string))
         if self._find_terminal_node(string)[0] != None:
             return True
         else: return False
 
     def insert(self, string):
         """Insert the given string into this prefix tree."""
-        if self.contains(string): return
-        # Insert string into tree
+        # The empty string is always contained in the tree (at its root)
+        if len(string) == 0: return
+        # Walk down the path of the string, adding nodes where it is missing
         curr_node = self.root
-        for indx, char in enumerate(string):
-            # if char DNE in tree, increase size
-
-            # Traverse to next child in char is alread in string
+        for char in string:
             if curr_node.has_child(char):
                 curr_node = curr_node.get_child(char)
-
-            # Otherwise, add the child
             else:
-                curr_node.add_child(char, PrefixTreeNode(char))
-                curr_node = curr_node.get_child(char)
-
-            # Change last node in str to terminal
-            if indx == len(string) - 1:
-                curr_node.terminal = True
-                self.size += 1
-
+                child_node = PrefixTreeNode(char)
+                curr_node.add_child(char, child_node)
+                curr_node = child_node
+        # Mark the last node in the string as terminal, if not already
+        if not curr_node.terminal:
+            curr_node.terminal = True
+            self.size += 1
+            self.version += 1
+
+    def delete(self, string):
+        """Delete the given string from this prefix tree, or raise ValueError
+        if it is not stored in this tree. Nodes left with no children that
+        do not terminate another string are pruned, from the bottom up.
+        Running time: O(m) for a string of length m"""
+        if not self._delete(string):
+            raise ValueError(f'String not found: {string!r}')
+
+    def delete_many(self, strings):
+        """Delete each of the given strings that is stored in this prefix tree,
+        skipping any that are not, and return the number deleted.
+        Running time: O(m) for m total characters in the given strings,
+        independent of the number of strings stored in this tree"""
+        count = 0
+        for string in strings:
+            if self._delete(string):
+                count += 1
+        return count
+
+    def _delete(self, string):
+        """Delete the given string from this prefix tree and prune its path,
+        and return True, or return False if it is not stored in this tree."""
+        path = self._find_path(string)
+        # The empty string is never stored (see insert)
+        if path is None or len(path) == 1 or not path[-1].is_terminal():
+            return False
+        path[-1].terminal = False
+        self.size -= 1
+        self.version += 1
+        self._prune(path)
+        return True
+
+    def _find_path(self, string):
+        """Return a list of the nodes on the path from the root that matches
+        the given string, starting with the root, or None if the whole string
+        is not matched."""
+        path = [self.root]
+        for char in string:
+            if not path[-1].has_child(char):
+                return None
+            path.append(path[-1].get_child(char))
+        return path
+
+    def _prune(self, path):
+        """Remove nodes from the end of the given path of nodes from the root
+        while they have no children and do not terminate a string."""
+        # The root is never removed
+        for index in range(len(path) - 1, 0, -1):
+            node = path[index]
+            if node.is_terminal() or node.num_children() > 0:
+                return
+            path[index - 1].remove_child(node.character)
 
     def _find_node(self, string):
         """Return a pair containing the deepest node in this prefix tree that
@@ -130,28 +192,445 @@ class PrefixTree:
 
         # Traverse through tree to complete prefix
         if not self.is_empty():
-            self._traverse(node, prefix, completions.append)
+            visited = self._traverse(node, prefix, completions.append)
+            if self.visits is not None:
+                self._count_visits('complete',
+                                   self._path_nodes(prefix) - 1 + visited)
 
         return completions
 
+    def longest_prefix_of(self, text):
+        """Return the longest string stored in this prefix tree that is a
+        prefix of the given text, or None if no stored string is.
+        Running time: O(m) for the first m characters of text matched, with
+        one walk down from the root and no substrings made until the end"""
+        length = None
+        for length in self._prefix_lengths(text):
+            pass
+        return text[:length] if length is not None else None
+
+    def longest_prefix_of_many(self, texts):
+        """Return a list of the longest stored prefix of each of the given
+        texts (see longest_prefix_of), with None for texts that have none."""
+        return [self.longest_prefix_of(text) for text in texts]
+
+    def prefixes_of(self, text):
+        """Return a list of all strings stored in this prefix tree that are
+        prefixes of the given text, from shortest to longest.
+        Running time: O(m) for the first m characters of text matched, plus
+        the total length of the prefixes found"""
+        return [text[:length] for length in self._prefix_lengths(text)]
+
+    def prefixes_of_many(self, texts):
+        """Return a list of the lists of stored prefixes of each of the given
+        texts (see prefixes_of)."""
+        return [self.prefixes_of(text) for text in texts]
+
+    def _prefix_lengths(self, text):
+        """Yield the length of each string stored in this prefix tree that is
+        a prefix of the given text, in increasing order, by walking down the
+        path of the text from the root until it leaves the tree."""
+        node = self.root
+        for depth, char in enumerate(text, 1):
+            if not node.has_child(char):
+                return
+            node = node.get_child(char)
+            if node.terminal:
+                yield depth
+
     def strings(self):
         """Return a list of all strings stored in this prefix tree."""
         # Create a list of all strings in prefix tree
         return self.complete()
 
     def _traverse(self, node, prefix, visit):
-        """Traverse this prefix tree with recursive depth-first traversal.
-        Start at the given node and visit each node with the given function."""
-
-        if node.is_terminal() and node is not None:
-            visit(prefix)
-        
-        for child_id in node.children:
-            child = node.get_child(child_id)
-            if child:
-                self._traverse(child, prefix + child.character, visit)
-
+        """Traverse this prefix tree with depth-first traversal, keeping the
+        nodes left to visit (with their prefixes) on an explicit stack instead
+        of recursing, so long strings cannot exceed the recursion limit.
+        Start at the given node and visit each terminal node's string with
+        the given function, in the same order as a recursive traversal.
+        Return the number of nodes traversed."""
+        count = 0
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            count += 1
+            if node.is_terminal():
+                visit(prefix)
+            # Push children in reverse so they are visited in order
+            for child in reversed(node.ordered_children()):
+                stack.append((child, prefix + child.character))
+        return count
+
+    def _iter_strings(self, node, prefix):
+        """Yield the string of each terminal node in the subtree of the given
+        node, whose string is the given prefix, in the same order as
+        _traverse, one at a time, so stopping early skips the rest.
+        Running time: O(c + j) for the first j strings yielded with c nodes
+        on their paths below the given node"""
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            if node.is_terminal():
+                yield prefix
+            for child in reversed(node.ordered_children()):
+                stack.append((child, prefix + child.character))
+
+    def session(self, prefix=''):
+        """Return a completion session for this prefix tree that starts with
+        the given prefix typed (see CompletionSession)."""
+        session = CompletionSession(self)
+        for char in prefix:
+            session.push(char)
+        return session
+
+    def build_links(self):
+        """Set the links of every node in this prefix tree used by find_all
+        (the Aho-Corasick automaton): each node's failure link to the node of
+        the longest proper suffix of its string that is also a path in the
+        tree, and output link to the nearest terminal node along failure
+        links. Nodes are visited in breadth-first order, so the failure links
+        of shorter strings are set before they are followed.
+        Running time: O(n * k) for n nodes with up to k children"""
+        root = self.root
+        root.fail = root
+        root.output = None
+        queue = deque([(root, '')])
+        while queue:
+            node, prefix = queue.popleft()
+            for child in node.children.values():
+                char = child.character
+                string = prefix + char
+                child.word = string if child.terminal else None
+                # Follow failure links until a suffix can be extended by char
+                fail = node.fail
+                while fail is not root and not fail.has_child(char):
+                    fail = fail.fail
+                if node is not root and fail.has_child(char):
+                    child.fail = fail.get_child(char)
+                else:
+                    child.fail = root
+                child.output = child.fail if child.fail.terminal \
+                    else child.fail.output
+                queue.append((child, string))
+        self.links_version = self.version
+
+    def find_all(self, text):
+        """Yield an (offset, string) pair for every occurrence of any string
+        stored in this prefix tree in the given text, which is a string or an
+        iterable of string chunks (such as the blocks of a large file) read
+        as one text, with offsets from its start. Occurrences are yielded in
+        order of their end offsets, longest first when several end together.
+        Links are built first (see build_links) if strings were inserted or
+        deleted since they were last built.
+        Running time: O(n + z) for n characters of text and z occurrences,
+        since each character moves down at most one node, and failure links
+        move up, at most once per move down
+        Memory usage: O(1) besides the chunk being read"""
+        root = self._automaton().root
+        chunks = [text] if isinstance(text, str) else text
+        node = root
+        offset = 0
+        for chunk in chunks:
+            for char in chunk:
+                offset += 1
+                while node is not root and not node.has_child(char):
+                    node = node.fail
+                if node.has_child(char):
+                    node = node.get_child(char)
+                match = node if node.terminal else node.output
+                while match is not None:
+                    yield offset - len(match.word), match.word
+                    match = match.output
+
+    def _automaton(self):
+        """Return the prefix tree whose nodes hold the links followed by
+        find_all, which is this tree, building its links first if strings
+        were inserted or deleted since they were last built."""
+        if self.links_version != self.version:
+            self.build_links()
+        return self
+
+    def count_visits(self, enabled=True):
+        """Start counting the calls to contains and complete and the nodes
+        they visit (reported by stats), resetting any counts so far, or stop
+        counting if enabled is False. Counting walks each string's path an
+        extra time, so it is off by default."""
+        self.visits = {'contains': [0, 0], 'complete': [0, 0]} if enabled \
+            else None
+
+    def _count_visits(self, operation, nodes):
+        """Count one call to the given operation that visited the given
+        number of nodes."""
+        counts = self.visits[operation]
+        counts[0] += 1
+        counts[1] += nodes
+
+    def _path_nodes(self, string):
+        """Return the number of nodes on the path from the root that matches
+        the longest prefix of the given string, including the root."""
+        return 1 + self._find_node(string)[1]
+
+    def stats(self):
+        """Return a dictionary of statistics about the structure and memory
+        usage of this prefix tree: numbers of strings, nodes, edges, and
+        terminal nodes, terminal density (fraction of nodes that terminate a
+        string), total bytes of all nodes and their children structures and
+        characters (see deep_getsizeof), histograms of the number of nodes at
+        each depth and with each number of children (as dictionaries), and if
+        counting visits (see count_visits), the calls to contains and complete
+        and the average number of nodes each visited.
+        Running time: O(n) for n nodes"""
+        return self._stats(self.root, self.size)
+
+    def _stats(self, root, size):
+        """Return a dictionary of statistics (see stats) about the tree below
+        the given root node, which stores the given number of strings."""
+        nodes = edges = terminals = total_bytes = 0
+        depths = {}
+        fan_outs = {}
+        seen = set()
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            nodes += 1
+            fan_out = node.num_children()
+            edges += fan_out
+            if node.is_terminal():
+                terminals += 1
+            depths[depth] = depths.get(depth, 0) + 1
+            fan_outs[fan_out] = fan_outs.get(fan_out, 0) + 1
+            total_bytes += deep_getsizeof(node, seen)
+            for child in node.children.values():
+                stack.append((child, depth + 1))
+        stats = {
+            'type': type(self).__name__,
+            'strings': size,
+            'nodes': nodes,
+            'edges': edges,
+            'terminals': terminals,
+            'terminal_density': terminals / nodes,
+            'bytes': total_bytes,
+            'bytes_per_string': total_bytes / size if size else 0.0,
+            'max_depth': max(depths),
+            'depth_histogram': dict(sorted(depths.items())),
+            'fan_out_histogram': dict(sorted(fan_outs.items())),
+        }
+        if self.visits is not None:
+            for operation, (calls, visited) in self.visits.items():
+                stats[operation + '_calls'] = calls
+                stats[operation + '_nodes_per_call'] = \
+                    visited / calls if calls else 0.0
+        return stats
+
+
+class CompletionSession(object):
+    """CompletionSession: the state of one user typing a prefix into a search
+    box one character at a time, with completions from a prefix tree (or
+    radix tree). A stack holds a cursor for each prefix typed so far: the
+    node the prefix ends at and how many characters of that node's label it
+    has matched (less than the whole label only partway along a radix tree's
+    edge), or None once the prefix has left the tree. Typing a character
+    moves one cursor down from the last, and backspace pops it, so neither
+    walks down from the root again. If the tree's strings change, the stack
+    is rebuilt from the root the next time it is used. Typed characters are
+    kept in a list, so the prefix string is only joined to make results.
+    Running time: O(1) per push or pop, and O(m + c + k) for the first k
+    results of a prefix of length m, with c nodes on their paths"""
+
+    def __init__(self, tree):
+        """Initialize this session for the given tree with nothing typed."""
+        self.tree = tree
+        # Characters of the prefix typed, in order
+        self.chars = []
+        self.version = tree.version
+        # Cursor of each prefix typed, starting with the empty prefix
+        root = tree.root
+        self.cursors = [(root, len(root.character))]
 
+    def __repr__(self):
+        """Return a string representation of this session."""
+        return 'CompletionSession({!r})'.format(self.prefix)
+
+    @property
+    def prefix(self):
+        """Prefix string typed so far.
+        Running time: O(m) to join its m characters"""
+        return ''.join(self.chars)
+
+    def push(self, char):
+        """Type the given character at the end of the prefix."""
+        self._refresh()
+        self.chars.append(char)
+        self.cursors.append(self._advance(self.cursors[-1], char))
+
+    def pop(self):
+        """Remove the last character of the prefix (backspace) and return it,
+        or raise ValueError if the prefix is empty."""
+        if len(self.chars) == 0:
+            raise ValueError('Prefix is empty')
+        self.cursors.pop()
+        return self.chars.pop()
+
+    def results(self, k=None):
+        """Return a list of the first k strings in the tree (all of them if
+        k is None) that start with the prefix, in sorted order."""
+        self._refresh()
+        node, offset = self.cursors[-1]
+        if node is None:
+            return []
+        # Complete the label the prefix ends partway along, if any
+        prefix = self.prefix + node.character[offset:]
+        strings = self.tree._iter_strings(node, prefix)
+        if k is None:
+            return list(strings)
+        return list(itertools.islice(strings, k))
+
+    def _advance(self, cursor, char):
+        """Return the cursor of the prefix with the given cursor followed by
+        the given character."""
+        node, offset = cursor
+        if node is None:
+            return cursor
+        if offset < len(node.character):
+            # Match the next character of this node's label
+            if node.character[offset] == char:
+                return node, offset + 1
+            return None, 0
+        if not node.has_child(char):
+            return None, 0
+        return node.get_child(char), 1
+
+    def _refresh(self):
+        """Rebuild the cursors from the tree's root if its strings changed
+        since they were made."""
+        if self.tree.version == self.version:
+            return
+        self.version = self.tree.version
+        root = self.tree.root
+        self.cursors = [(root, len(root.character))]
+        for char in self.chars:
+            self.cursors.append(self._advance(self.cursors[-1], char))
+
+
+def deep_getsizeof(node, seen=None):
+    """Return the number of bytes of memory used by the given prefix tree node
+    and all objects it refers to (its character, children structure, and
+    their contents), except other nodes, which are counted separately.
+    Objects whose ids are in the given set were already counted and are
+    skipped; ids of objects counted are added to it, so objects shared by
+    several nodes (such as single-character strings) are counted once."""
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [node]
+    while stack:
+        obj = stack.pop()
+        # Other nodes are counted when they are visited themselves
+        if id(obj) in seen or (obj is not node and
+                               isinstance(obj, PrefixTreeNode)):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (tuple, list, set, frozenset)):
+            stack.extend(obj)
+        elif not isinstance(obj, (str, bytes, int, float, type(None))):
+            # Follow attributes, whether in slots or a dictionary
+            for cls in type(obj).__mro__:
+                for name in cls.__dict__.get('__slots__', ()):
+                    if hasattr(obj, name):
+                        stack.append(getattr(obj, name))
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+    return total
+
+
+def format_stats(stats):
+    """Return a multi-line, human-readable report of the given statistics
+    from PrefixTree.stats."""
+    lines = ['{}:'.format(stats['type'])]
+    for name in ['strings', 'nodes', 'edges', 'terminals', 'bytes',
+                 'max_depth']:
+        lines.append('    {:22}{}'.format(name.replace('_', ' ').capitalize()
+                                          + ':', stats[name]))
+    lines.append('    {:22}{:.3f}'.format('Terminal density:',
+                                          stats['terminal_density']))
+    lines.append('    {:22}{:.1f}'.format('Bytes per string:',
+                                          stats['bytes_per_string']))
+    for operation in ['contains', 'complete']:
+        if operation + '_calls' in stats:
+            lines.append('    {:22}{:.1f} in {} calls'.format(
+                operation.capitalize() + ' visits:',
+                stats[operation + '_nodes_per_call'],
+                stats[operation + '_calls']))
+    for name in ['depth_histogram', 'fan_out_histogram']:
+        histogram = stats[name]
+        lines.append('    {}:'.format(name.replace('_', ' ').capitalize()))
+        largest = max(histogram.values())
+        for value, count in histogram.items():
+            bar = '#' * max(1, round(40 * count / largest))
+            lines.append('        {:>4} {:>9} {}'.format(value, count, bar))
+    return '\n'.join(lines)
+
+
+def compare_stats(vocabulary, num_queries=1000):
+    """Print statistics of each kind of prefix tree built from the given
+    vocabulary, with visits counted over the given number of random contains
+    and complete queries (using the first half of words as prefixes)."""
+    import random
+    from radixtree import RadixTree
+    queries = [random.choice(vocabulary) for _ in range(num_queries)]
+    for tree_type in [PrefixTree, RadixTree]:
+        tree = tree_type(vocabulary)
+        tree.count_visits()
+        for query in queries:
+            tree.contains(query)
+            tree.complete(query[:len(query) // 2])
+        print(format_stats(tree.stats()))
+
+
+def benchmark_scan(vocabulary, size=2 * 10 ** 6, chunk_size=64 * 1024):
+    """Compare the time to find every occurrence of the words of the given
+    vocabulary in a random text of about the given number of characters made
+    of those words, by calling find_all on the whole text, by calling it on
+    chunks of the text, and by walking the tree from every offset."""
+    import random
+    import time
+    words = []
+    length = 0
+    while length < size:
+        words.append(random.choice(vocabulary))
+        length += len(words[-1]) + 1
+    text = ' '.join(words)
+    tree = PrefixTree(vocabulary)
+    start_time = time.perf_counter()
+    tree.build_links()
+    link_time = time.perf_counter() - start_time
+    print('Vocabulary size: {}, text size: {} characters'.format(
+        len(vocabulary), len(text)))
+    print('{:26} {:.4f} sec'.format('Build links:', link_time))
+    chunks = (text[start:start + chunk_size]
+              for start in range(0, len(text), chunk_size))
+    longest = max(len(word) for word in vocabulary)
+    results = []
+    for label, scan in [
+            ('find_all on whole text', lambda: list(tree.find_all(text))),
+            ('find_all on chunks', lambda: list(tree.find_all(chunks))),
+            ('prefixes_of every offset',
+             lambda: [(offset, word) for offset in range(len(text))
+                      for word in tree.prefixes_of(
+                          text[offset:offset + longest])])]:
+        start_time = time.perf_counter()
+        matches = scan()
+        elapsed = time.perf_counter() - start_time
+        results.append(sorted(matches))
+        print('{:26} {:.4f} sec, {:.2f} MB/sec, {} matches'.format(
+            label + ':', elapsed, len(text) / elapsed / 10 ** 6,
+            len(matches)))
+    assert results[0] == results[1] == results[2]
 
 
 def create_prefix_tree(strings):
@@ -210,7 +689,35 @@ def create_prefix_tree(strings):
     print(f'matches? {matches}')
 
 
-if __name__ == '__main__':
+def main():
+    """Read command-line arguments and compare prefix tree statistics or
+    benchmark find_all, or run the tongue-twister demo if there are none."""
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) >= 1 and args[0] == 'stats':
+        if len(args) >= 2:
+            from autocomplete import get_lines
+            vocabulary = [line for line in get_lines(args[1]) if line]
+        else:
+            from radixtree import generate_words
+            vocabulary = generate_words(10000)
+        compare_stats(vocabulary)
+        return
+    if len(args) >= 1 and args[0] == 'scan':
+        if len(args) >= 2:
+            from autocomplete import get_lines
+            vocabulary = [line for line in get_lines(args[1]) if line]
+        else:
+            from radixtree import generate_words
+            vocabulary = generate_words(10000)
+        benchmark_scan(vocabulary)
+        return
+    if len(args) >= 1:
+        print('Usage: {} [stats|scan [vocabulary-file]]'.format(sys.argv[0]))
+        print('Compare statistics of prefix tree kinds built from the words in')
+        print('    the given file (or generated words), or benchmark finding')
+        print('    all of them in a text of those words, or with no arguments,')
+        print('    run a demo with tongue-twisters')
+        return
     # Create a dictionary of tongue-twisters with similar words to test with
     tongue_twisters = {
         'Seashells': 'Shelly sells seashells by the sea shore'.split(),
@@ -223,3 +730,7 @@ if __name__ == '__main__':
         print('\n' + '='*80 + '\n')
         print(f'{name} tongue-twister:')
         create_prefix_tree(strings)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 #!python3
 
-from prefixtree import PrefixTree, PrefixTreeNode
+from prefixtree import PrefixTree, PrefixTreeNode, CompletionSession
 import unittest
 
 
@@ -245,6 +245,196 @@ class PrefixTreeTest(unittest.TestCase):
             assert len(tree_strings) == len(input_strings)  # Check length only
             self.assertCountEqual(tree_strings, input_strings)  # Ignore order
 
+    def test_strings_deeper_than_recursion_limit(self):
+        import sys
+        long_string = 'A' * (sys.getrecursionlimit() * 2)
+        tree = PrefixTree([long_string, 'AB'])
+        assert tree.contains(long_string) is True
+        assert tree.complete('AA') == [long_string]
+        self.assertCountEqual(tree.strings(), [long_string, 'AB'])
+
+    def test_delete(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        # Delete a string whose last node has a sibling
+        tree.delete('ABC')
+        assert tree.size == 3
+        assert tree.contains('ABC') is False
+        node_AB = tree.root.get_child('A').get_child('B')
+        assert node_AB.has_child('C') is False
+        assert node_AB.has_child('D') is True
+        # Delete a string that prefixes another, which keeps all its nodes
+        tree.delete('A')
+        assert tree.size == 2
+        assert tree.contains('A') is False
+        assert tree.root.get_child('A').is_terminal() is False
+        assert tree.strings() == ['ABD', 'XYZ']
+        # Delete strings whose whole branches are pruned
+        tree.delete('ABD')
+        assert tree.root.has_child('A') is False
+        tree.delete('XYZ')
+        assert tree.size == 0
+        assert tree.is_empty() is True
+        assert tree.stats()['nodes'] == 1
+
+    def test_delete_missing(self):
+        tree = PrefixTree(['ABC', 'ABD'])
+        for string in ['AB', 'ABCD', 'X', '']:
+            with self.assertRaises(ValueError):
+                tree.delete(string)
+        assert tree.size == 2
+        assert tree.strings() == ['ABC', 'ABD']
+
+    def test_delete_many(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ', 'XY', 'B']
+        tree = PrefixTree(strings)
+        assert tree.delete_many(['XYZ', 'A', 'Q', 'ABD', 'A']) == 3
+        assert tree.size == 3
+        assert tree.strings() == ['ABC', 'B', 'XY']
+        assert tree.stats()['nodes'] == 7
+        assert tree.delete_many(tree.strings()) == 3
+        assert tree.is_empty() is True
+        # Deleted strings can be inserted again
+        tree.insert('XYZ')
+        assert tree.strings() == ['XYZ']
+
+    def test_longest_prefix_of(self):
+        tree = PrefixTree(['A', 'ABC', 'ABCDE', 'XY'])
+        assert tree.longest_prefix_of('ABCD') == 'ABC'
+        assert tree.longest_prefix_of('ABCDEF') == 'ABCDE'
+        assert tree.longest_prefix_of('ABCDE') == 'ABCDE'
+        assert tree.longest_prefix_of('AB') == 'A'
+        assert tree.longest_prefix_of('X') is None
+        assert tree.longest_prefix_of('Q') is None
+        assert tree.longest_prefix_of('') is None
+        assert tree.longest_prefix_of_many(['ABX', 'XYZ', 'B']) == \
+            ['A', 'XY', None]
+
+    def test_prefixes_of(self):
+        tree = PrefixTree(['A', 'ABC', 'ABCDE', 'XY'])
+        assert tree.prefixes_of('ABCDEF') == ['A', 'ABC', 'ABCDE']
+        assert tree.prefixes_of('ABD') == ['A']
+        assert tree.prefixes_of('XYZ') == ['XY']
+        assert tree.prefixes_of('B') == []
+        assert tree.prefixes_of('') == []
+        assert tree.prefixes_of_many(['ABC', 'X']) == [['A', 'ABC'], []]
+
+    def test_find_all(self):
+        tree = PrefixTree(['he', 'she', 'his', 'hers'])
+        assert list(tree.find_all('ushers')) == [(1, 'she'), (2, 'he'),
+                                                 (2, 'hers')]
+        assert list(tree.find_all('ahishers')) == [(1, 'his'), (3, 'she'),
+                                                   (4, 'he'), (4, 'hers')]
+        assert list(tree.find_all('xyz')) == []
+        assert list(tree.find_all('')) == []
+        # Chunks are read as one text, so matches can span them
+        assert list(tree.find_all(['ah', 'is', 'h', '', 'ers'])) == \
+            list(tree.find_all('ahishers'))
+
+    def test_find_all_after_updates(self):
+        tree = PrefixTree(['ab', 'b'])
+        assert list(tree.find_all('abc')) == [(0, 'ab'), (1, 'b')]
+        tree.insert('bc')
+        tree.delete('ab')
+        assert list(tree.find_all('abc')) == [(1, 'b'), (1, 'bc')]
+
+    def test_find_all_matches_every_offset(self):
+        import random
+        for _ in range(50):
+            strings = [''.join(random.choice('ab') for _ in
+                               range(random.randint(1, 5)))
+                       for _ in range(random.randint(1, 10))]
+            tree = PrefixTree(strings)
+            text = ''.join(random.choice('abc') for _ in range(100))
+            expected = sorted((offset, string) for string in set(strings)
+                              for offset in range(len(text))
+                              if text.startswith(string, offset))
+            assert sorted(tree.find_all(text)) == expected
+            chunks = [text[start:start + 7] for start in range(0, 100, 7)]
+            assert list(tree.find_all(chunks)) == list(tree.find_all(text))
+
+    def test_session(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        session = tree.session()
+        assert isinstance(session, CompletionSession)
+        assert session.results() == ['A', 'ABC', 'ABD', 'XYZ']
+        assert session.results(2) == ['A', 'ABC']
+        session.push('A')
+        session.push('B')
+        assert session.prefix == 'AB'
+        assert session.results() == ['ABC', 'ABD']
+        assert session.results(1) == ['ABC']
+        session.push('Q')
+        assert session.results() == []
+        session.push('R')
+        assert session.results() == []
+        assert session.pop() == 'R'
+        assert session.pop() == 'Q'
+        assert session.results() == ['ABC', 'ABD']
+        assert session.pop() == 'B'
+        assert session.pop() == 'A'
+        with self.assertRaises(ValueError):
+            session.pop()
+        assert tree.session('XY').results() == ['XYZ']
+        assert tree.session('XYZW').results() == []
+
+    def test_session_after_updates(self):
+        tree = PrefixTree(['ABC', 'ABD'])
+        session = tree.session('AB')
+        tree.delete('ABC')
+        tree.delete('ABD')
+        assert session.results() == []
+        tree.insert('ABE')
+        assert session.results() == ['ABE']
+        session.push('E')
+        assert session.results() == ['ABE']
+
+    def test_session_matches_complete(self):
+        import random
+        strings = [''.join(random.choice('abc') for _ in
+                           range(random.randint(1, 6))) for _ in range(50)]
+        tree = PrefixTree(strings)
+        session = tree.session()
+        for _ in range(200):
+            if session.prefix and random.random() < 0.4:
+                session.pop()
+            else:
+                session.push(random.choice('abcd'))
+            completions = tree.complete(session.prefix)
+            assert session.results() == completions
+            assert session.results(3) == completions[:3]
+
+    def test_stats(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        stats = tree.stats()
+        assert stats['strings'] == 4
+        assert stats['nodes'] == 8
+        assert stats['edges'] == 7
+        assert stats['terminals'] == 4
+        assert stats['terminal_density'] == 0.5
+        assert stats['max_depth'] == 3
+        assert stats['depth_histogram'] == {0: 1, 1: 2, 2: 2, 3: 3}
+        assert stats['fan_out_histogram'] == {0: 3, 1: 3, 2: 2}
+        assert stats['bytes'] > 0
+        assert 'contains_calls' not in stats
+        # Bytes grow with the number of nodes
+        tree.insert('XYZW')
+        assert tree.stats()['bytes'] > stats['bytes']
+
+    def test_count_visits(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        tree.count_visits()
+        assert tree.contains('ABC') is True  # Visits root, A, B, C
+        assert tree.contains('AX') is False  # Visits root, A
+        assert tree.complete('AB') == ['ABC', 'ABD']  # Root, A, B, C, D
+        stats = tree.stats()
+        assert stats['contains_calls'] == 2
+        assert stats['contains_nodes_per_call'] == 3.0
+        assert stats['complete_calls'] == 1
+        assert stats['complete_nodes_per_call'] == 5.0
+        tree.count_visits(False)
+        tree.contains('ABC')
+        assert 'contains_calls' not in tree.stats()
+
 
 if __name__ == '__main__':
     unittest.main()
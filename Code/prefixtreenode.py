@@ -1,6 +1,247 @@
 #!python3
 
 
+class AdaptiveChildren:
+    """AdaptiveChildren: A mapping from characters to children nodes for use
+    in a prefix tree node, which switches between representations as children
+    are added and removed, so the typical node with few children stays small:
+    - small: parallel tuples of up to SMALL_MAX keys (in sorted order) and
+      their nodes, searched linearly
+    - bitmap: for single ASCII character keys, an integer with one bit set for
+      each key's character code, and a list of nodes in order of character
+      code, where a key's node is at the index given by the number of bits
+      set below its bit (its popcount rank)
+    - table: for single ASCII character keys when there are more than
+      BITMAP_MAX children, a list with a slot for every ASCII character code
+    - mapping: a dictionary for other keys when there are more than
+      SMALL_MAX children, whose keys are sorted when iterated
+    Iteration is always in sorted key order, with no sorting needed except
+    in mapping mode. Set PrefixTreeNode.CHILDREN_TYPE to this class to trade
+    speed for memory, since its lookups run in Python instead of C."""
+
+    __slots__ = ('kind', 'small_keys', 'nodes', 'bitmap', 'count')
+
+    # Most children kept in small mode, and in bitmap mode before switching
+    # to table mode (switching back happens at TABLE_MIN, so nodes near the
+    # boundary do not switch back and forth)
+    SMALL_MAX = 4
+    BITMAP_MAX = 48
+    TABLE_MIN = 32
+    # Number of ASCII character codes
+    ASCII_SIZE = 128
+
+    def __init__(self, items=None):
+        """Initialize this mapping with the given (key, node) pairs, if any."""
+        self.kind = 'small'
+        self.small_keys = ()
+        self.nodes = ()
+        self.bitmap = 0
+        self.count = 0
+        if items is not None:
+            for key, node in (items.items() if hasattr(items, 'items')
+                              else items):
+                self[key] = node
+
+    def __repr__(self):
+        """Return a string representation of this mapping."""
+        return 'AdaptiveChildren({!r})'.format(dict(self.items()))
+
+    def __len__(self):
+        """Return the number of children in this mapping."""
+        return self.count
+
+    def __contains__(self, key):
+        """Return True if this mapping has a child for the given key."""
+        if self.kind == 'small':
+            return key in self.small_keys
+        if self.kind == 'mapping':
+            return key in self.nodes
+        try:
+            code = ord(key)
+        except TypeError:
+            return False  # Not a single character
+        if self.kind == 'bitmap':
+            # Bits above the ASCII codes are never set
+            return self.bitmap >> code & 1 == 1
+        return code < AdaptiveChildren.ASCII_SIZE and self.nodes[code] is not None
+
+    def __getitem__(self, key):
+        """Return the child for the given key, or raise KeyError if none."""
+        if self.kind == 'small':
+            if key in self.small_keys:
+                return self.nodes[self.small_keys.index(key)]
+        elif self.kind == 'mapping':
+            return self.nodes[key]
+        elif key in self:
+            code = ord(key)
+            if self.kind == 'bitmap':
+                return self.nodes[self._rank(code)]
+            return self.nodes[code]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        """Return the child for the given key, or default if none."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, node):
+        """Set the child for the given key to the given node, replacing any
+        child it had, and switch representations if needed."""
+        if key in self:
+            self._replace(key, node)
+            return
+        code = _ascii_code(key)
+        if self.kind == 'small':
+            if self.count < AdaptiveChildren.SMALL_MAX:
+                index = 0
+                while index < self.count and self.small_keys[index] < key:
+                    index += 1
+                self.small_keys = self.small_keys[:index] + (key,) + self.small_keys[index:]
+                self.nodes = self.nodes[:index] + (node,) + self.nodes[index:]
+                self.count += 1
+                return
+            if code is not None and all(_ascii_code(small_key) is not None
+                                        for small_key in self.small_keys):
+                self._convert('bitmap')
+            else:
+                self._convert('mapping')
+        elif code is None and self.kind != 'mapping':
+            self._convert('mapping')
+        elif self.kind == 'bitmap' and self.count >= AdaptiveChildren.BITMAP_MAX:
+            self._convert('table')
+        if self.kind == 'bitmap':
+            self.nodes.insert(self._rank(code), node)
+            self.bitmap |= 1 << code
+        elif self.kind == 'table':
+            self.nodes[code] = node
+        else:
+            self.nodes[key] = node
+        self.count += 1
+
+    def __delitem__(self, key):
+        """Remove the child for the given key, or raise KeyError if none, and
+        switch representations if needed."""
+        if key not in self:
+            raise KeyError(key)
+        if self.kind == 'small':
+            index = self.small_keys.index(key)
+            self.small_keys = self.small_keys[:index] + self.small_keys[index + 1:]
+            self.nodes = self.nodes[:index] + self.nodes[index + 1:]
+        elif self.kind == 'mapping':
+            del self.nodes[key]
+        else:
+            code = _ascii_code(key)
+            if self.kind == 'bitmap':
+                del self.nodes[self._rank(code)]
+                self.bitmap &= ~(1 << code)
+            else:
+                self.nodes[code] = None
+        self.count -= 1
+        if self.kind != 'small' and self.count <= AdaptiveChildren.SMALL_MAX:
+            self._convert('small')
+        elif self.kind == 'table' and self.count <= AdaptiveChildren.TABLE_MIN:
+            self._convert('bitmap')
+
+    def __iter__(self):
+        """Return an iterator over the keys of this mapping in sorted order."""
+        if self.kind == 'small':
+            return iter(self.small_keys)
+        return iter(self.keys())
+
+    def __reversed__(self):
+        """Return an iterator over the keys of this mapping in reverse sorted
+        order."""
+        return reversed(self.keys())
+
+    def __eq__(self, other):
+        """Return True if the given mapping has the same keys and children."""
+        if isinstance(other, AdaptiveChildren):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return dict(self.items()) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def keys(self):
+        """Return a list of the keys of this mapping in sorted order."""
+        if self.kind == 'small':
+            return list(self.small_keys)
+        if self.kind == 'mapping':
+            return sorted(self.nodes)
+        if self.kind == 'bitmap':
+            return [chr(code) for code in range(AdaptiveChildren.ASCII_SIZE)
+                    if self.bitmap >> code & 1]
+        return [chr(code) for code, node in enumerate(self.nodes)
+                if node is not None]
+
+    def values(self):
+        """Return a list of the children in this mapping in order of keys."""
+        if self.kind == 'small' or self.kind == 'bitmap':
+            return list(self.nodes)
+        if self.kind == 'mapping':
+            return [self.nodes[key] for key in sorted(self.nodes)]
+        return [node for node in self.nodes if node is not None]
+
+    def items(self):
+        """Return a list of (key, child) pairs in this mapping in order of
+        keys."""
+        return list(zip(self.keys(), self.values()))
+
+    def _rank(self, code):
+        """Return the number of keys in bitmap mode with character codes
+        below the given code, which is the index of that code's child."""
+        return (self.bitmap & ((1 << code) - 1)).bit_count()
+
+    def _replace(self, key, node):
+        """Replace the child for the given key, which must be present."""
+        if self.kind == 'small':
+            index = self.small_keys.index(key)
+            self.nodes = self.nodes[:index] + (node,) + self.nodes[index + 1:]
+        elif self.kind == 'mapping':
+            self.nodes[key] = node
+        elif self.kind == 'bitmap':
+            self.nodes[self._rank(_ascii_code(key))] = node
+        else:
+            self.nodes[_ascii_code(key)] = node
+
+    def _convert(self, kind):
+        """Switch this mapping to the given representation, keeping all of
+        its children."""
+        items = self.items()
+        self.kind = kind
+        if kind == 'small':
+            self.small_keys = tuple(key for key, _ in items)
+            self.nodes = tuple(node for _, node in items)
+            self.bitmap = 0
+            return
+        self.small_keys = ()
+        if kind == 'mapping':
+            self.nodes = dict(items)
+        elif kind == 'bitmap':
+            self.nodes = [node for _, node in items]
+            self.bitmap = 0
+            for key, _ in items:
+                self.bitmap |= 1 << ord(key)
+        else:
+            self.nodes = [None] * AdaptiveChildren.ASCII_SIZE
+            for key, node in items:
+                self.nodes[ord(key)] = node
+            self.bitmap = 0
+
+
+def _ascii_code(key):
+    """Return the character code of the given key if it is a single ASCII
+    character, or None otherwise."""
+    if isinstance(key, str) and len(key) == 1:
+        code = ord(key)
+        if code < AdaptiveChildren.ASCII_SIZE:
+            return code
+    return None
+
+
 class PrefixTreeNode:
     """PrefixTreeNode: A node for use in a prefix tree that stores a single
     character from a string and a structure of children nodes below it, which
@@ -9,8 +250,13 @@ class PrefixTreeNode:
 
     # Choose a type of data structure to store children nodes in
     # Hint: Choosing list or dict affects implementation of all child methods
+    # AdaptiveChildren takes less memory than dict, but its pure-Python
+    # lookups make building and searching prefix trees a few times slower
     CHILDREN_TYPE = dict
 
+    # Prefix trees have many nodes, so avoid a dictionary of attributes in each
+    __slots__ = ('character', 'children', 'terminal', 'fail', 'output', 'word')
+
     def __init__(self, character=None):
         """Initialize this prefix tree node with the given character value, an
         empty structure of children nodes, and a boolean terminal property."""
@@ -20,6 +266,13 @@ class PrefixTreeNode:
         self.children = PrefixTreeNode.CHILDREN_TYPE()
         # Marks if this node terminates a string in the prefix tree
         self.terminal = False
+        # Links for multi-pattern matching, set by PrefixTree.build_links:
+        # the node of the longest proper suffix of this node's string that is
+        # also in the tree, the nearest terminal node along those links, and
+        # the string this node terminates
+        self.fail = None
+        self.output = None
+        self.word = None
 
     def is_terminal(self):
         """Return True if this prefix tree node terminates a string."""
@@ -35,15 +288,14 @@ class PrefixTreeNode:
         """Return True if this prefix tree node has a child node that
         represents the given character amongst its children."""
         #  Check if given character is amongst this node's children
-        if character in self.children: return True
-        return False
+        return character in self.children
 
     def get_child(self, character):
         """Return this prefix tree node's child node that represents the given
         character if it is amongst its children, or raise ValueError if not."""
-        if self.has_child(character):
+        try:
             return self.children[character]
-        else:
+        except KeyError:
             raise ValueError(f'No child exists for character {character!r}')
 
     def add_child(self, character, child_node):
@@ -55,6 +307,24 @@ class PrefixTreeNode:
         else:
             raise ValueError(f'Child exists for character {character!r}')
 
+    def remove_child(self, character):
+        """Remove this node's child node that represents the given character
+        and return it, or raise ValueError if it is not amongst this node's
+        children."""
+        if self.has_child(character):
+            child_node = self.get_child(character)
+            del self.children[character]
+            return child_node
+        raise ValueError(f'No child exists for character {character!r}')
+
+    def ordered_children(self):
+        """Return a list of this node's children nodes in order of their
+        characters, whatever order its children structure keeps them in."""
+        children = self.children
+        if len(children) <= 1:
+            return list(children.values())
+        return [children[character] for character in sorted(children)]
+
     def __repr__(self):
         """Return a code representation of this prefix tree node."""
         return f'PrefixTreeNode({self.character!r})'
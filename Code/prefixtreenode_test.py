@@ -1,6 +1,7 @@
 #!python3
 
-from prefixtreenode import PrefixTreeNode
+from prefixtreenode import PrefixTreeNode, AdaptiveChildren
+import random
 import unittest
 
 
@@ -49,3 +50,107 @@ class PrefixTreeNodeTest(unittest.TestCase):
         # Verify adding node 'C' as child to node 'A' again raises error
         with self.assertRaises(ValueError):
             node_A.add_child('C', node_C)
+        # Remove node 'B' and verify node 'A' only has node 'C' as child
+        assert node_A.remove_child('B') is node_B
+        assert node_A.num_children() == 1
+        assert node_A.has_child('B') is False
+        assert node_A.get_child('C') is node_C
+        # Verify removing node 'B' from node 'A' again raises error
+        with self.assertRaises(ValueError):
+            node_A.remove_child('B')
+
+
+class AdaptiveChildrenTest(unittest.TestCase):
+
+    def test_grows_through_representations(self):
+        children = AdaptiveChildren()
+        assert children.kind == 'small'
+        characters = [chr(code) for code in range(32, 127)]
+        random.shuffle(characters)
+        expected = {}
+        for count, character in enumerate(characters, 1):
+            children[character] = PrefixTreeNode(character)
+            expected[character] = children[character]
+            if count <= AdaptiveChildren.SMALL_MAX:
+                assert children.kind == 'small'
+            elif count <= AdaptiveChildren.BITMAP_MAX:
+                assert children.kind == 'bitmap'
+            else:
+                assert children.kind == 'table'
+            assert len(children) == count
+            # Keys are always in sorted order
+            assert list(children) == sorted(expected)
+            assert children == expected
+        for character in characters:
+            assert character in children
+            assert children[character].character == character
+        assert 'ab' not in children
+        assert chr(200) not in children
+        assert list(reversed(children)) == sorted(expected, reverse=True)
+        assert children.values() == [expected[key] for key in sorted(expected)]
+
+    def test_shrinks_through_representations(self):
+        characters = [chr(code) for code in range(ord('A'), ord('A') + 60)]
+        children = AdaptiveChildren((character, PrefixTreeNode(character))
+                                    for character in characters)
+        assert children.kind == 'table'
+        random.shuffle(characters)
+        while characters:
+            character = characters.pop()
+            del children[character]
+            assert character not in children
+            assert list(children) == sorted(characters)
+            if len(characters) <= AdaptiveChildren.SMALL_MAX:
+                assert children.kind == 'small'
+            elif len(characters) <= AdaptiveChildren.TABLE_MIN:
+                assert children.kind == 'bitmap'
+        assert children == AdaptiveChildren()
+        with self.assertRaises(KeyError):
+            del children['A']
+
+    def test_other_keys_use_mapping(self):
+        children = AdaptiveChildren()
+        keys = ['b', 'é', 'a', 'ab', 'z', 'ü', 'c']
+        for key in keys:
+            children[key] = PrefixTreeNode(key)
+        assert children.kind == 'mapping'
+        assert list(children) == sorted(keys)
+        assert children['ab'].character == 'ab'
+        with self.assertRaises(KeyError):
+            children['x']
+        # Replacing a child keeps the number of children
+        node = PrefixTreeNode('new')
+        children['a'] = node
+        assert children['a'] is node
+        assert len(children) == len(keys)
+
+    def test_node_children_are_ordered(self):
+        for children_type in [dict, AdaptiveChildren]:
+            node = PrefixTreeNode('')
+            node.children = children_type()
+            for character in 'dbeacgf':
+                node.add_child(character, PrefixTreeNode(character))
+            assert [child.character for child in node.ordered_children()] == \
+                list('abcdefg')
+            assert node.get_child('g').character == 'g'
+            with self.assertRaises(ValueError):
+                node.get_child('h')
+
+    def test_swap_children_type(self):
+        from prefixtree import PrefixTree
+        from radixtree import RadixTree
+        strings = ['ABC', 'ABD', 'A', 'XYZ', 'XY', 'B']
+        original_type = PrefixTreeNode.CHILDREN_TYPE
+        try:
+            for children_type in [dict, AdaptiveChildren]:
+                PrefixTreeNode.CHILDREN_TYPE = children_type
+                for tree_type in [PrefixTree, RadixTree]:
+                    tree = tree_type(strings)
+                    assert isinstance(tree.root.children, children_type)
+                    assert tree.strings() == sorted(strings)
+                    assert tree.contains('XY') is True
+                    assert tree.complete('AB') == ['ABC', 'ABD']
+                    tree.delete('ABC')
+                    assert tree.complete('A') == ['A', 'ABD']
+        finally:
+            PrefixTreeNode.CHILDREN_TYPE = original_type
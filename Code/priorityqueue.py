@@ -1,17 +1,28 @@
 #!python
 
 from binaryheap import BinaryMinHeap
+from pairingheap import PairingHeap
 
 
 class PriorityQueue(object):
     """PriorityQueue: a partially ordered queue with methods to enqueue items
     in priority order and to access and dequeue its highest priority item.
-    Item pairs are stored in a binary min heap for its efficient operations."""
+    Item pairs are stored in a binary min heap for its efficient operations,
+    or in another heap engine with the same methods, such as a pairing heap."""
 
-    def __init__(self):
-        """Initialize this priority queue."""
-        # Initialize new binary min heap to store items in this priority queue
-        self.heap = BinaryMinHeap()
+    # Heap engines that can store this priority queue's item pairs
+    ENGINES = {
+        'binary': BinaryMinHeap,
+        'pairing': PairingHeap,
+    }
+
+    def __init__(self, engine='binary'):
+        """Initialize this priority queue with the given heap engine name."""
+        if engine not in PriorityQueue.ENGINES:
+            raise ValueError('Unknown priority queue engine: {!r}'.format(engine))
+        self.engine = engine
+        # Initialize new heap to store items in this priority queue
+        self.heap = PriorityQueue.ENGINES[engine]()
 
     def __repr__(self):
         """Return a string representation of this priority queue."""
@@ -27,10 +38,9 @@ class PriorityQueue(object):
 
     def enqueue(self, item, priority):
         """Insert the given item into this priority queue in order according to
-        the given priority."""
-        # TODO: Insert given item into heap in order according to given priority
-        # new_item = (priority, item)
-        self.heap.insert((priority, item))
+        the given priority. Return a handle for decrease_priority if the heap
+        engine supports it (pairing), or None otherwise (binary)."""
+        return self.heap.insert((priority, item))
 
     def front(self):
         """Return the item at the front of this priority queue without removing
@@ -57,6 +67,28 @@ class PriorityQueue(object):
         if self.length() == 0:
             raise ValueError('Priority queue is empty and has no front item')
         # Replace and return minimum item from heap
-        pop_item = self.front()
-        self.heap.items[0] = (item, priority)
-        return pop_item
+        return self.heap.replace_min((priority, item))
+
+    def decrease_priority(self, handle, priority):
+        """Lower the priority of the item with the given handle (returned by
+        enqueue) to the given priority. Only supported by the pairing engine.
+        Raise ValueError if the item was dequeued or is in another queue.
+        Running time: O(1) plus amortized O(log n) paid by a later dequeue."""
+        if not hasattr(self.heap, 'decrease_key'):
+            raise ValueError('Engine {!r} does not support decrease_priority'
+                             .format(self.engine))
+        _, item = handle.item
+        self.heap.decrease_key(handle, (priority, item))
+
+    def merge(self, other):
+        """Move all items from the other priority queue into this one, leaving
+        the other priority queue empty.
+        Running time: O(1) if both queues use the pairing engine, otherwise
+        O(m log(n + m)) to insert each of the other queue's m items."""
+        if other is self:
+            raise ValueError('Cannot merge a priority queue with itself')
+        if hasattr(self.heap, 'meld') and type(other.heap) is type(self.heap):
+            self.heap.meld(other.heap)
+            return
+        while not other.is_empty():
+            self.heap.insert(other.heap.delete_min())
@@ -0,0 +1,306 @@
+#!python
+
+import asyncio
+import collections
+import threading
+import time
+
+from priorityqueue import PriorityQueue
+
+
+class ThreadSafePriorityQueue(object):
+    """ThreadSafePriorityQueue: a priority queue that can be shared by many
+    producer and consumer threads. All operations hold one lock, and consumers
+    block on a condition variable until items arrive. Producers only notify
+    when consumers are waiting, and wake at most one consumer per new item,
+    so bursts of enqueues do not wake every consumer for every item."""
+
+    def __init__(self, engine='binary'):
+        """Initialize this priority queue with the given heap engine name."""
+        self.queue = PriorityQueue(engine)
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        # Count consumers blocked in dequeue so producers can skip notify
+        self.waiting = 0
+
+    def __repr__(self):
+        """Return a string representation of this priority queue."""
+        with self.lock:
+            return 'ThreadSafePriorityQueue({} items, front={})'.format(
+                self.queue.length(), self.queue.front())
+
+    def is_empty(self):
+        """Return True if this priority queue is empty, or False otherwise."""
+        with self.lock:
+            return self.queue.is_empty()
+
+    def length(self):
+        """Return the number of items in this priority queue."""
+        with self.lock:
+            return self.queue.length()
+
+    def front(self):
+        """Return the item at the front of this priority queue without removing
+        it, or None if this priority queue is empty."""
+        with self.lock:
+            return self.queue.front()
+
+    def enqueue(self, item, priority):
+        """Insert the given item into this priority queue in order according to
+        the given priority, and wake one waiting consumer, if any."""
+        with self.lock:
+            self.queue.enqueue(item, priority)
+            if self.waiting:
+                self.not_empty.notify()
+
+    def enqueue_many(self, pairs):
+        """Insert the given (item, priority) pairs into this priority queue
+        while holding the lock once, then wake at most one waiting consumer
+        per inserted item with a single notify call."""
+        with self.lock:
+            count = 0
+            for item, priority in pairs:
+                self.queue.enqueue(item, priority)
+                count += 1
+            if self.waiting and count:
+                self.not_empty.notify(min(count, self.waiting))
+
+    def dequeue(self, block=True, timeout=None):
+        """Remove and return the (priority, item) pair at the front of this
+        priority queue. If block is True, wait until an item is available or
+        the given timeout (in seconds) expires. Raise ValueError if this
+        priority queue is still empty."""
+        with self.lock:
+            self._wait_for_items(block, timeout)
+            return self.queue.dequeue()
+
+    def dequeue_many(self, max_items, block=True, timeout=None):
+        """Remove and return a list of up to max_items (priority, item) pairs
+        from the front of this priority queue, in priority order. If block is
+        True, wait as in dequeue until at least one item is available."""
+        with self.lock:
+            self._wait_for_items(block, timeout)
+            pairs = []
+            while len(pairs) < max_items and not self.queue.is_empty():
+                pairs.append(self.queue.dequeue())
+            return pairs
+
+    def _wait_for_items(self, block, timeout):
+        """Wait (with the lock held) until this priority queue is not empty,
+        or raise ValueError if it is still empty when not blocking or when the
+        given timeout expires."""
+        if not self.queue.is_empty():
+            return
+        if not block:
+            raise ValueError('Priority queue is empty and has no front item')
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.waiting += 1
+        try:
+            while self.queue.is_empty():
+                if deadline is None:
+                    self.not_empty.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise ValueError('Timed out waiting for an item')
+                    self.not_empty.wait(remaining)
+        finally:
+            self.waiting -= 1
+
+
+class AsyncPriorityQueue(object):
+    """AsyncPriorityQueue: a priority queue for coroutines in one asyncio event
+    loop. Consumers await get until an item arrives, and producers resolve one
+    waiting consumer's future per new item, so a burst of puts does not wake
+    every consumer. It is not thread-safe; use the event loop's thread only."""
+
+    def __init__(self, engine='binary'):
+        """Initialize this priority queue with the given heap engine name."""
+        self.queue = PriorityQueue(engine)
+        # Futures of consumers waiting for items, in arrival order
+        self.getters = collections.deque()
+
+    def __repr__(self):
+        """Return a string representation of this priority queue."""
+        return 'AsyncPriorityQueue({} items, front={})'.format(
+            self.queue.length(), self.queue.front())
+
+    def is_empty(self):
+        """Return True if this priority queue is empty, or False otherwise."""
+        return self.queue.is_empty()
+
+    def length(self):
+        """Return the number of items in this priority queue."""
+        return self.queue.length()
+
+    def put_nowait(self, item, priority):
+        """Insert the given item in order according to the given priority and
+        wake one waiting consumer, if any."""
+        self.queue.enqueue(item, priority)
+        self._wake_getters(1)
+
+    def put_many_nowait(self, pairs):
+        """Insert the given (item, priority) pairs and wake at most one waiting
+        consumer per inserted item."""
+        count = 0
+        for item, priority in pairs:
+            self.queue.enqueue(item, priority)
+            count += 1
+        self._wake_getters(count)
+
+    async def put(self, item, priority):
+        """Insert the given item in order according to the given priority.
+        This priority queue is unbounded, so put never waits."""
+        self.put_nowait(item, priority)
+
+    async def put_many(self, pairs):
+        """Insert the given (item, priority) pairs; see put_many_nowait."""
+        self.put_many_nowait(pairs)
+
+    def get_nowait(self):
+        """Remove and return the (priority, item) pair at the front of this
+        priority queue, or raise ValueError if it is empty."""
+        return self.queue.dequeue()
+
+    async def get(self):
+        """Remove and return the (priority, item) pair at the front of this
+        priority queue, waiting until an item is available."""
+        await self._wait_for_items()
+        return self.queue.dequeue()
+
+    async def get_many(self, max_items):
+        """Remove and return a list of up to max_items (priority, item) pairs
+        in priority order, waiting until at least one item is available."""
+        await self._wait_for_items()
+        pairs = []
+        while len(pairs) < max_items and not self.queue.is_empty():
+            pairs.append(self.queue.dequeue())
+        return pairs
+
+    async def _wait_for_items(self):
+        """Wait until this priority queue is not empty."""
+        while self.queue.is_empty():
+            getter = asyncio.get_running_loop().create_future()
+            self.getters.append(getter)
+            try:
+                await getter
+            except asyncio.CancelledError:
+                if getter in self.getters:
+                    self.getters.remove(getter)
+                elif not self.queue.is_empty():
+                    # This getter was woken for an item it will not take
+                    self._wake_getters(1)
+                raise
+
+    def _wake_getters(self, count):
+        """Resolve the futures of up to count waiting consumers."""
+        while count > 0 and self.getters:
+            getter = self.getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                count -= 1
+
+
+def benchmark_contention(num_producers=4, num_consumers=4, num_items=20000,
+                         batch_size=64):
+    """Measure throughput of ThreadSafePriorityQueue and AsyncPriorityQueue
+    with the given numbers of producers and consumers, where each producer
+    enqueues num_items items, either one at a time or in batches."""
+    import random
+
+    def run_threads(batched):
+        queue = ThreadSafePriorityQueue()
+
+        def produce():
+            priorities = [random.random() for _ in range(num_items)]
+            if batched:
+                for start in range(0, num_items, batch_size):
+                    queue.enqueue_many((0, priority) for priority in
+                                       priorities[start:start + batch_size])
+            else:
+                for priority in priorities:
+                    queue.enqueue(0, priority)
+
+        def consume(counts):
+            count = 0
+            while True:
+                if batched:
+                    pairs = queue.dequeue_many(batch_size)
+                else:
+                    pairs = [queue.dequeue()]
+                for index, (priority, _) in enumerate(pairs):
+                    if priority == float('inf'):
+                        # Hand back sentinels meant for other consumers
+                        queue.enqueue_many((item, priority) for priority, item
+                                           in pairs[index + 1:])
+                        counts.append(count)
+                        return
+                    count += 1
+
+        counts = []
+        producers = [threading.Thread(target=produce)
+                     for _ in range(num_producers)]
+        consumers = [threading.Thread(target=consume, args=(counts,))
+                     for _ in range(num_consumers)]
+        start_time = time.time()
+        for thread in producers + consumers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        # Stop consumers with sentinels that sort after every real item
+        for _ in consumers:
+            queue.enqueue(0, float('inf'))
+        for thread in consumers:
+            thread.join()
+        elapsed = time.time() - start_time
+        assert sum(counts) == num_producers * num_items
+        return elapsed
+
+    async def run_tasks():
+        queue = AsyncPriorityQueue()
+
+        async def produce():
+            for start in range(0, num_items, batch_size):
+                count = min(batch_size, num_items - start)
+                await queue.put_many((0, random.random())
+                                     for _ in range(count))
+                await asyncio.sleep(0)  # Let consumers run between batches
+
+        async def consume():
+            count = 0
+            while True:
+                pairs = await queue.get_many(batch_size)
+                for index, (priority, _) in enumerate(pairs):
+                    if priority == float('inf'):
+                        # Hand back sentinels meant for other consumers
+                        queue.put_many_nowait((item, priority) for priority,
+                                              item in pairs[index + 1:])
+                        return count
+                    count += 1
+
+        start_time = time.time()
+        consumers = [asyncio.ensure_future(consume())
+                     for _ in range(num_consumers)]
+        await asyncio.gather(*(produce() for _ in range(num_producers)))
+        for _ in consumers:
+            await queue.put(0, float('inf'))
+        counts = await asyncio.gather(*consumers)
+        elapsed = time.time() - start_time
+        assert sum(counts) == num_producers * num_items
+        return elapsed
+
+    total = num_producers * num_items
+    print('{} producers, {} consumers, {} items'
+          .format(num_producers, num_consumers, total))
+    for label, elapsed in [
+            ('Threads, one item at a time', run_threads(False)),
+            ('Threads, batches of {}'.format(batch_size), run_threads(True)),
+            ('Asyncio, batches of {}'.format(batch_size),
+             asyncio.run(run_tasks()))]:
+        print('{:32} {:.6f} sec, {:.0f} items/sec'
+              .format(label + ':', elapsed, total / elapsed))
+
+
+if __name__ == '__main__':
+    import sys
+    benchmark_contention(*(int(arg) for arg in sys.argv[1:]))
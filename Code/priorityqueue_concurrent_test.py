@@ -0,0 +1,83 @@
+#!python
+
+from priorityqueue_concurrent import ThreadSafePriorityQueue, AsyncPriorityQueue
+import asyncio
+import threading
+import time
+import unittest
+
+
+class ThreadSafePriorityQueueTest(unittest.TestCase):
+    def test_enqueue_and_dequeue(self):
+        queue = ThreadSafePriorityQueue()
+        queue.enqueue_many([('C', 3), ('A', 1)])
+        queue.enqueue('B', 2)
+        assert queue.length() == 3
+        assert queue.dequeue() == (1, 'A')
+        assert queue.dequeue_many(5) == [(2, 'B'), (3, 'C')]
+        assert queue.is_empty() is True
+
+    def test_dequeue_on_empty_queue(self):
+        queue = ThreadSafePriorityQueue()
+        with self.assertRaises(ValueError):
+            queue.dequeue(block=False)
+        start_time = time.monotonic()
+        with self.assertRaises(ValueError):
+            queue.dequeue(timeout=0.05)
+        assert time.monotonic() - start_time >= 0.05
+
+    def test_blocking_dequeue_wakes_on_enqueue(self):
+        queue = ThreadSafePriorityQueue()
+        results = []
+        consumers = [threading.Thread(target=lambda: results.append(
+            queue.dequeue(timeout=5))) for _ in range(3)]
+        for thread in consumers:
+            thread.start()
+        time.sleep(0.05)
+        queue.enqueue_many([('A', 1), ('B', 2), ('C', 3)])
+        for thread in consumers:
+            thread.join()
+        assert sorted(results) == [(1, 'A'), (2, 'B'), (3, 'C')]
+        assert queue.waiting == 0
+
+
+class AsyncPriorityQueueTest(unittest.TestCase):
+    def test_put_and_get(self):
+        async def run():
+            queue = AsyncPriorityQueue()
+            await queue.put('B', 2)
+            await queue.put_many([('C', 3), ('A', 1)])
+            assert queue.length() == 3
+            assert await queue.get() == (1, 'A')
+            assert await queue.get_many(5) == [(2, 'B'), (3, 'C')]
+            with self.assertRaises(ValueError):
+                queue.get_nowait()
+        asyncio.run(run())
+
+    def test_get_waits_for_put(self):
+        async def run():
+            queue = AsyncPriorityQueue()
+            getters = [asyncio.ensure_future(queue.get()) for _ in range(2)]
+            await asyncio.sleep(0)
+            assert len(queue.getters) == 2
+            queue.put_many_nowait([('A', 1), ('B', 2)])
+            results = await asyncio.gather(*getters)
+            assert sorted(results) == [(1, 'A'), (2, 'B')]
+        asyncio.run(run())
+
+    def test_cancelled_get(self):
+        async def run():
+            queue = AsyncPriorityQueue()
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.sleep(0)
+            getter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await getter
+            assert len(queue.getters) == 0
+            await queue.put('A', 1)
+            assert await queue.get() == (1, 'A')
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
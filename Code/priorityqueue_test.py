@@ -0,0 +1,83 @@
+#!python
+
+from priorityqueue import PriorityQueue
+import random
+import unittest
+
+
+class PriorityQueueTest(unittest.TestCase):
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            PriorityQueue('fibonacci')
+
+    def test_enqueue_and_dequeue(self):
+        for engine in PriorityQueue.ENGINES:
+            queue = PriorityQueue(engine)
+            assert queue.is_empty() is True
+            assert queue.front() is None
+            priorities = random.sample(range(1000), 50)
+            for priority in priorities:
+                queue.enqueue('item{}'.format(priority), priority)
+            assert queue.length() == 50
+            assert queue.front() == (min(priorities), 'item{}'.format(min(priorities)))
+            for priority in sorted(priorities):
+                assert queue.dequeue() == (priority, 'item{}'.format(priority))
+            with self.assertRaises(ValueError):
+                queue.dequeue()
+
+    def test_push_pop(self):
+        for engine in PriorityQueue.ENGINES:
+            queue = PriorityQueue(engine)
+            queue.enqueue('A', 3)
+            queue.enqueue('B', 1)
+            assert queue.push_pop('C', 2) == (1, 'B')
+            assert queue.dequeue() == (2, 'C')
+            assert queue.dequeue() == (3, 'A')
+
+    def test_decrease_priority(self):
+        queue = PriorityQueue('pairing')
+        handle = queue.enqueue('A', 5)
+        queue.enqueue('B', 3)
+        queue.decrease_priority(handle, 1)
+        assert queue.dequeue() == (1, 'A')
+        queue = PriorityQueue('binary')
+        handle = queue.enqueue('A', 5)
+        with self.assertRaises(ValueError):
+            queue.decrease_priority(handle, 1)
+
+    def test_decrease_priority_with_stale_handle(self):
+        queue = PriorityQueue('pairing')
+        handle = queue.enqueue('A', 5)
+        queue.enqueue('B', 7)
+        assert queue.dequeue() == (5, 'A')
+        with self.assertRaises(ValueError):
+            queue.decrease_priority(handle, 1)
+        assert queue.dequeue() == (7, 'B')
+        # Handles from a queue merged into another belong to that queue
+        queue = PriorityQueue('pairing')
+        other = PriorityQueue('pairing')
+        handle = other.enqueue('C', 9)
+        queue.enqueue('D', 4)
+        queue.merge(other)
+        with self.assertRaises(ValueError):
+            other.decrease_priority(handle, 1)
+        queue.decrease_priority(handle, 1)
+        assert queue.dequeue() == (1, 'C')
+
+    def test_merge(self):
+        for engine in PriorityQueue.ENGINES:
+            for other_engine in PriorityQueue.ENGINES:
+                queue = PriorityQueue(engine)
+                other = PriorityQueue(other_engine)
+                for priority in [5, 1, 9]:
+                    queue.enqueue(priority, priority)
+                for priority in [4, 8, 2]:
+                    other.enqueue(priority, priority)
+                queue.merge(other)
+                assert other.is_empty() is True
+                assert queue.length() == 6
+                assert [queue.dequeue()[0] for _ in range(6)] == [1, 2, 4, 5, 8, 9]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,283 @@
+#!python3
+
+from prefixtree import PrefixTree
+from prefixtreenode import PrefixTreeNode
+
+
+class RadixTree(PrefixTree):
+    """RadixTree: A path-compressed prefix tree (also called a Patricia tree)
+    that stores strings like PrefixTree, but each node's character property
+    holds a whole substring (its edge label) instead of a single character,
+    so chains of nodes with only one child are merged into one node.
+    Children are keyed by the first character of their labels, which are
+    distinct among siblings. Inserting a string that diverges partway along
+    an edge splits that edge's node in two.
+    This uses several times fewer nodes than a PrefixTree for typical
+    vocabularies, and matches whole labels with startswith, so searches take
+    one loop iteration per node instead of one per character."""
+
+    def insert(self, string):
+        """Insert the given string into this radix tree.
+        Running time: O(m) for a string of length m, plus O(1) to split at
+        most one edge"""
+        # The empty string is always contained in the tree (at its root)
+        if len(string) == 0: return
+        node = self.root
+        position = 0
+        while position < len(string):
+            character = string[position]
+            # Add the rest of the string as one edge if no label starts here
+            if not node.has_child(character):
+                child = PrefixTreeNode(string[position:])
+                child.terminal = True
+                node.add_child(character, child)
+                self.size += 1
+                self.version += 1
+                return
+            child = node.get_child(character)
+            label = child.character
+            if string.startswith(label, position):
+                # Whole label matches, so continue below it
+                node = child
+                position += len(label)
+                continue
+            # Find how much of the label matches, then split the label there
+            # into a new parent node with the old node as its child
+            matched = 1
+            while (position + matched < len(string) and
+                   label[matched] == string[position + matched]):
+                matched += 1
+            parent = PrefixTreeNode(label[:matched])
+            child.character = label[matched:]
+            parent.add_child(child.character[0], child)
+            node.children[character] = parent
+            node = parent
+            position += matched
+        # String ends at this node, which may have been split from an edge,
+        # so mark it terminal, if not already
+        if not node.terminal:
+            node.terminal = True
+            self.size += 1
+            self.version += 1
+
+    def _find_path(self, string):
+        """Return a list of the nodes on the path from the root whose labels
+        match the given string, starting with the root, or None if the whole
+        string is not matched along whole edge labels."""
+        path = [self.root]
+        position = 0
+        while position < len(string):
+            node = path[-1]
+            if not node.has_child(string[position]):
+                return None
+            child = node.get_child(string[position])
+            if not string.startswith(child.character, position):
+                return None
+            path.append(child)
+            position += len(child.character)
+        return path
+
+    def _prune(self, path):
+        """Remove the last node of the given path of nodes from the root if it
+        has no children, then merge the last remaining node that no longer
+        terminates a string with its only child, if it has one, so that every
+        node except the root terminates a string or has several children."""
+        node = path[-1]
+        index = len(path) - 1
+        if node.num_children() == 0:
+            path[index - 1].remove_child(node.character[0])
+            index -= 1
+            node = path[index]
+        if index == 0 or node.is_terminal() or node.num_children() != 1:
+            return
+        # Absorb the only child's label and children into this node, which
+        # keeps its place under its parent since its first character is kept
+        child = next(iter(node.children.values()))
+        node.character += child.character
+        node.children = child.children
+        node.terminal = child.terminal
+
+    def _find_node(self, string):
+        """Return a pair containing the node in this radix tree whose subtree
+        holds all strings starting with the given string, and the length of
+        that node's string, which may be longer than the given string if it
+        ends partway along the node's edge label. If no such node exists,
+        return None and the number of characters matched.
+        Search is done iteratively with a loop over nodes, not characters."""
+        node = self.root
+        position = 0
+        while position < len(string):
+            character = string[position]
+            if not node.has_child(character):
+                return None, position
+            child = node.get_child(character)
+            label = child.character
+            if string.startswith(label, position):
+                node = child
+                position += len(label)
+            elif label.startswith(string[position:]):
+                # String ends partway along this label
+                return child, position + len(label)
+            else:
+                # String diverges from this label after matching part of it
+                matched = 1
+                while label[matched] == string[position + matched]:
+                    matched += 1
+                return None, position + matched
+        return node, position
+
+    def _find_terminal_node(self, string):
+        """Return a tuple containing the node that terminates the given string
+        in this radix tree and the string's length, or if the given string is
+        not completely found, return None and the number of characters
+        matched along whole edge labels.
+        Search is done iteratively with a loop over nodes, not characters."""
+        node = self.root
+        position = 0
+        while position < len(string):
+            character = string[position]
+            if not node.has_child(character):
+                return None, position
+            node = node.get_child(character)
+            # The whole label must match, or the string is not in this tree
+            if not string.startswith(node.character, position):
+                return None, position
+            position += len(node.character)
+        if len(string) == 0 or node.is_terminal():
+            return node, position
+        return None, position
+
+    def complete(self, prefix=''):
+        """Return a list of all strings stored in this radix tree that start
+        with the given prefix string."""
+        completions = []
+        node, depth = self._find_node(prefix)
+        if node is None or self.is_empty():
+            return completions
+        # Extend the prefix with the rest of the label it ends partway along
+        overhang = depth - len(prefix)
+        if overhang:
+            prefix += node.character[-overhang:]
+        visited = self._traverse(node, prefix, completions.append)
+        if self.visits is not None:
+            self._count_visits('complete',
+                               self._path_nodes(prefix) - 1 + visited)
+        return completions
+
+    def _prefix_lengths(self, text):
+        """Yield the length of each string stored in this radix tree that is
+        a prefix of the given text, in increasing order, by matching whole
+        edge labels against the text in place with startswith."""
+        node = self.root
+        position = 0
+        while position < len(text):
+            if not node.has_child(text[position]):
+                return
+            node = node.get_child(text[position])
+            if not text.startswith(node.character, position):
+                return
+            position += len(node.character)
+            if node.terminal:
+                yield position
+
+    def build_links(self):
+        """Build the links used by find_all (see PrefixTree.build_links) in a
+        separate PrefixTree holding the strings of this radix tree, with one
+        character per node, since a failure link can end partway along an
+        edge label. It takes as much memory as a PrefixTree of the same
+        strings, and is rebuilt by find_all once this radix tree changes.
+        Running time: O(n * k) for n characters in the strings stored"""
+        self.links_tree = PrefixTree(self.strings())
+        self.links_tree.build_links()
+        self.links_version = self.version
+
+    def _automaton(self):
+        """Return the separate prefix tree holding the links followed by
+        find_all, building it first if strings were inserted or deleted
+        since it was last built."""
+        if self.links_version != self.version:
+            self.build_links()
+        return self.links_tree
+
+    def _path_nodes(self, string):
+        """Return the number of nodes on the path from the root whose labels
+        match the longest prefix of the given string, including the root and
+        a last node whose label the string ends partway along."""
+        node = self.root
+        count = 1
+        position = 0
+        while position < len(string) and node.has_child(string[position]):
+            node = node.get_child(string[position])
+            count += 1
+            if not string.startswith(node.character, position):
+                break
+            position += len(node.character)
+        return count
+
+
+def count_nodes(tree):
+    """Return the number of nodes in the given prefix tree or radix tree,
+    including its root node."""
+    count = 0
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        for character in node.children:
+            stack.append(node.get_child(character))
+    return count
+
+
+def generate_words(count, seed=0):
+    """Return a list of count distinct random words built from a small set of
+    common stems, prefixes, and suffixes, so they share prefixes like
+    dictionary words do."""
+    import random
+    generator = random.Random(seed)
+    starts = ['', 'un', 're', 'pre', 'over', 'inter', 'counter', 'de', 'dis']
+    stems = [''.join(generator.choice('abcdefghijklmnopqrstuvwxyz')
+                     for _ in range(generator.randint(3, 8)))
+             for _ in range(max(1, count // 10))]
+    ends = ['', 's', 'ed', 'ing', 'er', 'ers', 'ly', 'ness', 'able', 'ation']
+    words = set()
+    while len(words) < count:
+        words.add(generator.choice(starts) + generator.choice(stems) +
+                  generator.choice(ends))
+    return sorted(words)
+
+
+def benchmark_trees(vocabulary, num_lookups=100000):
+    """Compare PrefixTree and RadixTree built from the given vocabulary by
+    node count, build time, and time to look up words and complete
+    prefixes."""
+    import random
+    import time
+    lookups = [random.choice(vocabulary) for _ in range(num_lookups)]
+    prefixes = [word[:len(word) // 2] for word in lookups[:num_lookups // 10]]
+    print('Vocabulary size: {}'.format(len(vocabulary)))
+    print('{:12} {:>10} {:>12} {:>14} {:>14}'.format(
+        'Tree', 'Nodes', 'Build sec', 'Contains sec', 'Complete sec'))
+    for tree_type in [PrefixTree, RadixTree]:
+        start_time = time.perf_counter()
+        tree = tree_type(vocabulary)
+        build_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        for word in lookups:
+            tree.contains(word)
+        contains_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        for prefix in prefixes:
+            tree.complete(prefix)
+        complete_time = time.perf_counter() - start_time
+        print('{:12} {:>10} {:>12.4f} {:>14.4f} {:>14.4f}'.format(
+            tree_type.__name__, count_nodes(tree), build_time, contains_time,
+            complete_time))
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as file:
+            benchmark_trees([line.strip() for line in file if line.strip()])
+    else:
+        benchmark_trees(generate_words(50000))
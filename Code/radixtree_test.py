@@ -0,0 +1,213 @@
+#!python3
+
+from prefixtree import PrefixTree
+from radixtree import RadixTree, count_nodes, generate_words
+import random
+import unittest
+
+
+class RadixTreeTest(unittest.TestCase):
+
+    def test_insert_compresses_chains(self):
+        tree = RadixTree(['ABC'])
+        assert tree.size == 1
+        assert tree.root.num_children() == 1
+        node_ABC = tree.root.get_child('A')
+        assert node_ABC.character == 'ABC'
+        assert node_ABC.is_terminal() is True
+        assert node_ABC.num_children() == 0
+        assert count_nodes(tree) == 2
+
+    def test_insert_splits_edges(self):
+        tree = RadixTree(['ABC', 'ABD'])
+        node_AB = tree.root.get_child('A')
+        assert node_AB.character == 'AB'
+        assert node_AB.is_terminal() is False
+        assert node_AB.get_child('C').character == 'C'
+        assert node_AB.get_child('D').character == 'D'
+        # Inserting a prefix of a label splits it at the end of the string
+        tree.insert('A')
+        node_A = tree.root.get_child('A')
+        assert node_A.character == 'A'
+        assert node_A.is_terminal() is True
+        assert node_A.get_child('B') is node_AB
+        assert node_AB.character == 'B'
+        # Inserting a string that ends at a node only marks it terminal
+        tree.insert('AB')
+        assert node_AB.is_terminal() is True
+        assert tree.size == 4
+        assert count_nodes(tree) == 5
+
+    def test_insert_existing_string(self):
+        tree = RadixTree(['ABC', 'ABD', 'A'])
+        tree.count_visits()
+        version = tree.version
+        for string in ['ABC', 'ABD', 'A', '']:
+            tree.insert(string)
+        assert tree.size == 3
+        assert tree.version == version
+        assert count_nodes(tree) == 5
+        # Inserting walks the tree once, without counting a contains call
+        assert tree.visits['contains'] == [0, 0]
+
+    def test_contains_and_complete(self):
+        tree = RadixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        for string in ['ABC', 'ABD', 'A', 'XYZ']:
+            assert tree.contains(string) is True
+        for string in ['AB', 'X', 'XY', 'ABCD', 'B', 'AC']:
+            assert tree.contains(string) is False
+        assert tree.complete('') == ['A', 'ABC', 'ABD', 'XYZ']
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        # Prefixes ending partway along an edge label
+        assert tree.complete('X') == ['XYZ']
+        assert tree.complete('XY') == ['XYZ']
+        assert tree.complete('XA') == []
+        assert tree.complete('XYZW') == []
+
+    def test_matches_prefix_tree(self):
+        for _ in range(100):
+            strings = [''.join(random.choice('abc') for _ in
+                               range(random.randint(1, 6)))
+                       for _ in range(random.randint(0, 30))]
+            prefix_tree = PrefixTree(strings)
+            radix_tree = RadixTree(strings)
+            assert radix_tree.size == prefix_tree.size
+            assert radix_tree.strings() == prefix_tree.strings()
+            for _ in range(20):
+                query = ''.join(random.choice('abcd') for _ in
+                                range(random.randint(0, 7)))
+                assert radix_tree.contains(query) == prefix_tree.contains(query)
+                assert radix_tree.complete(query) == prefix_tree.complete(query)
+
+    def test_prefixes_of_matches_prefix_tree(self):
+        for _ in range(100):
+            strings = [''.join(random.choice('ab') for _ in
+                               range(random.randint(1, 6)))
+                       for _ in range(random.randint(0, 20))]
+            prefix_tree = PrefixTree(strings)
+            radix_tree = RadixTree(strings)
+            texts = [''.join(random.choice('abc') for _ in
+                             range(random.randint(0, 8))) for _ in range(20)]
+            assert radix_tree.prefixes_of_many(texts) == \
+                prefix_tree.prefixes_of_many(texts)
+            assert radix_tree.longest_prefix_of_many(texts) == \
+                prefix_tree.longest_prefix_of_many(texts)
+
+    def test_find_all_matches_prefix_tree(self):
+        tree = RadixTree(['he', 'she', 'his', 'hers'])
+        assert list(tree.find_all('ushers')) == \
+            [(1, 'she'), (2, 'he'), (2, 'hers')]
+        # Links are rebuilt after the strings change
+        tree.insert('us')
+        tree.delete('he')
+        assert list(tree.find_all(['us', 'hers'])) == \
+            [(0, 'us'), (1, 'she'), (2, 'hers')]
+        for _ in range(50):
+            strings = [''.join(random.choice('ab') for _ in
+                               range(random.randint(1, 5)))
+                       for _ in range(random.randint(0, 10))]
+            text = ''.join(random.choice('abc') for _ in range(30))
+            assert list(RadixTree(strings).find_all(text)) == \
+                list(PrefixTree(strings).find_all(text))
+
+    def test_session_along_edges(self):
+        tree = RadixTree(['ABC', 'ABD', 'XYZ'])
+        session = tree.session('X')
+        # Prefix ends partway along the edge labeled 'XYZ'
+        assert session.results() == ['XYZ']
+        session.push('Y')
+        assert session.results() == ['XYZ']
+        session.push('Q')
+        assert session.results() == []
+        session.pop()
+        session.push('Z')
+        assert session.results(1) == ['XYZ']
+        # Splitting the edge rebuilds the session's cursors
+        tree.insert('XYW')
+        assert session.results() == ['XYZ']
+        session.pop()
+        assert session.results() == ['XYW', 'XYZ']
+        for _ in range(100):
+            strings = [''.join(random.choice('abc') for _ in
+                               range(random.randint(1, 6)))
+                       for _ in range(random.randint(0, 30))]
+            radix_tree = RadixTree(strings)
+            session = radix_tree.session()
+            for char in ''.join(random.choice('abcd') for _ in range(7)):
+                session.push(char)
+                assert session.results() == \
+                    radix_tree.complete(session.prefix)
+
+    def test_fewer_nodes(self):
+        words = generate_words(2000)
+        prefix_tree = PrefixTree(words)
+        radix_tree = RadixTree(words)
+        assert radix_tree.strings() == prefix_tree.strings()
+        assert count_nodes(radix_tree) * 2 < count_nodes(prefix_tree)
+        # A radix tree never has more nodes than strings, plus the root and
+        # one branching node per string
+        assert count_nodes(radix_tree) <= 2 * len(words) + 1
+
+    def test_delete_merges_nodes(self):
+        tree = RadixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        # Deleting 'A' leaves its node with one child, which it absorbs
+        tree.delete('A')
+        node_AB = tree.root.get_child('A')
+        assert node_AB.character == 'AB'
+        assert node_AB.is_terminal() is False
+        # Deleting 'ABC' leaves node 'AB' with one child, which it absorbs
+        tree.delete('ABC')
+        node_ABD = tree.root.get_child('A')
+        assert node_ABD.character == 'ABD'
+        assert node_ABD.is_terminal() is True
+        assert node_ABD.num_children() == 0
+        assert count_nodes(tree) == 3
+        with self.assertRaises(ValueError):
+            tree.delete('AB')
+        assert tree.delete_many(['XYZ', 'ABD', 'XYZ']) == 2
+        assert tree.is_empty() is True
+        assert tree.size == 0
+
+    def test_delete_matches_prefix_tree(self):
+        for _ in range(100):
+            strings = [''.join(random.choice('abc') for _ in
+                               range(random.randint(1, 6)))
+                       for _ in range(random.randint(0, 30))]
+            deleted = random.sample(strings, len(strings) // 2)
+            prefix_tree = PrefixTree(strings)
+            radix_tree = RadixTree(strings)
+            assert radix_tree.delete_many(deleted) == \
+                prefix_tree.delete_many(deleted)
+            assert radix_tree.size == prefix_tree.size
+            assert radix_tree.strings() == prefix_tree.strings()
+            # The result is the same as building from the remaining strings
+            remaining = RadixTree(prefix_tree.strings())
+            assert count_nodes(radix_tree) == count_nodes(remaining)
+            for string in prefix_tree.strings():
+                assert radix_tree.contains(string) is True
+
+    def test_stats_and_visits(self):
+        words = generate_words(500)
+        prefix_tree = PrefixTree(words)
+        radix_tree = RadixTree(words)
+        prefix_stats = prefix_tree.stats()
+        radix_stats = radix_tree.stats()
+        assert radix_stats['nodes'] == count_nodes(radix_tree)
+        assert radix_stats['terminals'] == prefix_stats['terminals'] == 500
+        assert radix_stats['bytes'] < prefix_stats['bytes']
+        assert radix_stats['terminal_density'] > prefix_stats['terminal_density']
+        for tree in [prefix_tree, radix_tree]:
+            tree.count_visits()
+            for word in words:
+                assert tree.contains(word)
+        assert radix_tree.stats()['contains_nodes_per_call'] < \
+            prefix_tree.stats()['contains_nodes_per_call']
+        radix_tree = RadixTree(['ABC', 'ABD', 'XYZ'])
+        radix_tree.count_visits()
+        assert radix_tree.complete('X') == ['XYZ']  # Root, XYZ
+        assert radix_tree.complete('A') == ['ABC', 'ABD']  # Root, AB, C, D
+        assert radix_tree.stats()['complete_nodes_per_call'] == 3.0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,19 +1,22 @@
 #!python
 
-def fibonacci(n):
+from memoize import memoize
+from trampoline import trampoline
+
+
+def fibonacci(n, strategy='doubling'):
     """fibonacci(n) returns the n-th number in the Fibonacci sequence,
     which is defined with the recurrence relation:
     fibonacci(0) = 0
     fibonacci(1) = 1
-    fibonacci(n) = fibonacci(n - 1) + fibonacci(n - 2), for n > 1"""
+    fibonacci(n) = fibonacci(n - 1) + fibonacci(n - 2), for n > 1
+    The given strategy names one of the implementations in STRATEGIES."""
     # Check if n is negative or not an integer (invalid input)
-    if n < 0 or not isinstance(n, int):
+    if not isinstance(n, int) or n < 0:
         raise ValueError('fibonacci is undefined for n = {!r}'.format(n))
-    # Implement fibonacci_recursive, _memoized, and _dynamic below, then
-    # change this to call your implementation to verify it passes all tests
-    return fibonacci_recursive(n)
-    # return fibonacci_memoized(n)
-    # return fibonacci_dynamic(n)
+    if strategy not in STRATEGIES:
+        raise ValueError('Unknown fibonacci strategy: {!r}'.format(strategy))
+    return STRATEGIES[strategy](n)
 
 
 def fibonacci_recursive(n):
@@ -26,29 +29,221 @@ def fibonacci_recursive(n):
         return fibonacci_recursive(n - 1) + fibonacci_recursive(n - 2)
 
 
+@memoize(maxsize=256, policy='lru')
+def fibonacci_cached(n):
+    """Return the n-th Fibonacci number with the same recursion as
+    fibonacci_recursive, caching results so each number is computed once.
+    Only the most recent results are needed, so a small LRU cache suffices.
+    Each level of recursion takes two frames (the cache wrapper and this
+    function), so on a cold cache this raises RecursionError from about a
+    third of the recursion limit (see fibonacci_memoized).
+    Running time: O(n) on the first call, since every smaller number is
+    computed once and the second recursive call is always a cache hit.
+    Memory usage: O(n) for the recursion stack, with at most 256 cached results"""
+    # Check if n is one of the base cases
+    if n == 0 or n == 1:
+        return n
+    # Call function recursively (through the cache) and add the results
+    return fibonacci_cached(n - 1) + fibonacci_cached(n - 2)
+
+
 def fibonacci_memoized(n):
-    # TODO: Memoize the fibonacci function's recursive implementation here
-    pass
-    # Once implemented, change fibonacci (above) to call fibonacci_memoized
-    # to verify that your memoized implementation passes all test cases
+    """Return the n-th Fibonacci number with fibonacci_cached, after warming
+    its cache from the bottom up, so each call finds both smaller numbers
+    cached and the recursion is never more than one level deep.
+    Running time: O(n) cache lookups, plus one addition per number not
+    already cached
+    Memory usage: O(1) stack frames, with at most 256 cached results"""
+    for smaller in range(n):
+        fibonacci_cached(smaller)
+    return fibonacci_cached(n)
 
 
 def fibonacci_dynamic(n):
-    # TODO: Implement the fibonacci function with dynamic programming here
-    pass
-    # Once implemented, change fibonacci (above) to call fibonacci_dynamic
-    # to verify that your dynamic implementation passes all test cases
+    """Return the n-th Fibonacci number by building up from the base cases,
+    keeping only the last two numbers of the sequence.
+    Running time: O(n) additions in one loop
+    Memory usage: O(1) - only two numbers are stored at a time"""
+    previous, current = 0, 1
+    for _ in range(n):
+        previous, current = current, previous + current
+    return previous
+
+
+def fibonacci_trampolined(n):
+    """Return the n-th Fibonacci number with a recursion on n - 1 that returns
+    the pair (fibonacci(n), fibonacci(n + 1)), run by a trampoline so its
+    depth is not limited by Python's recursion limit.
+    Running time: O(n) additions, one per level of recursion
+    Memory usage: O(n) suspended generators on the trampoline's stack"""
+    return trampoline(_fibonacci_pair(n))[0]
+
+
+def _fibonacci_pair(n):
+    """Generator for trampoline that returns the pair of Fibonacci numbers
+    (fibonacci(n), fibonacci(n + 1))."""
+    # Check if n is the base case
+    if n == 0:
+        return (0, 1)
+    # Yield recursive call to the trampoline and build on its result
+    current, following = yield _fibonacci_pair(n - 1)
+    return (following, current + following)
+
+
+def fibonacci_matrix(n):
+    """Return the n-th Fibonacci number by raising the matrix [[1, 1], [1, 0]]
+    to the n-th power with repeated squaring, since that power is the matrix
+    [[fibonacci(n + 1), fibonacci(n)], [fibonacci(n), fibonacci(n - 1)]].
+    Matrices are symmetric, so each is stored as a tuple (a, b, c) standing
+    for [[a, b], [b, c]].
+    Running time: O(log n) big-integer multiplications, one squaring (and at
+    most one multiplication) per bit of n
+    Memory usage: O(1) numbers, each with O(n) bits"""
+    # Accumulate the result in the identity matrix
+    result = (1, 0, 1)
+    power = (1, 1, 0)
+    while n > 0:
+        if n & 1:
+            result = _multiply_symmetric(result, power)
+        power = _multiply_symmetric(power, power)
+        n >>= 1
+    return result[1]
+
+
+def _multiply_symmetric(first, second):
+    """Return the product of two commuting symmetric 2x2 matrices, each given
+    as a tuple (a, b, c) standing for [[a, b], [b, c]]. Powers of the same
+    matrix commute, so their product is symmetric too."""
+    a1, b1, c1 = first
+    a2, b2, c2 = second
+    return (a1 * a2 + b1 * b2, a1 * b2 + b1 * c2, b1 * b2 + c1 * c2)
+
+
+def fibonacci_doubling(n):
+    """Return the n-th Fibonacci number with the fast doubling identities
+    fibonacci(2k) = fibonacci(k) * (2 * fibonacci(k + 1) - fibonacci(k))
+    fibonacci(2k + 1) = fibonacci(k) ** 2 + fibonacci(k + 1) ** 2
+    applied once per bit of n, from the most significant bit down.
+    Running time: O(log n) big-integer multiplications, about half as many
+    as fibonacci_matrix
+    Memory usage: O(1) numbers, each with O(n) bits"""
+    return _fibonacci_doubling(n)
+
+
+def _fibonacci_doubling(n, modulus=None):
+    """Return the n-th Fibonacci number with fast doubling, reduced by the
+    given modulus after each step if one is given."""
+    # Invariant: current = fibonacci(k) and following = fibonacci(k + 1)
+    current, following = 0, 1
+    for bit in bin(n)[2:]:
+        double = current * (2 * following - current)  # fibonacci(2k)
+        double_next = current * current + following * following  # (2k + 1)
+        if bit == '1':
+            current, following = double_next, double + double_next
+        else:
+            current, following = double, double_next
+        if modulus is not None:
+            current %= modulus
+            following %= modulus
+    return current
+
+
+# Largest modulus whose Pisano period fibonacci_mod looks up, since finding
+# the period takes O(modulus) time while fast doubling takes O(log n)
+PISANO_LIMIT = 10000
+
+
+@memoize(maxsize=128, policy='lfu')
+def pisano_period(modulus):
+    """Return the Pisano period of the given modulus, the length of the cycle
+    that Fibonacci numbers repeat modulo that modulus. It is at most 6 times
+    the modulus, so it is found by generating numbers until 0, 1 reappears.
+    Running time: O(modulus) on the first call for a modulus, then O(1)"""
+    if not isinstance(modulus, int) or modulus < 1:
+        raise ValueError('Pisano period is undefined for modulus = {!r}'
+                         .format(modulus))
+    if modulus == 1:
+        return 1
+    previous, current = 0, 1
+    for period in range(1, 6 * modulus + 1):
+        previous, current = current, (previous + current) % modulus
+        if previous == 0 and current == 1:
+            return period
+
+
+def fibonacci_mod(n, modulus):
+    """Return the n-th Fibonacci number modulo the given modulus without
+    computing the full number. For moduli up to PISANO_LIMIT, n is first
+    reduced modulo the (cached) Pisano period of the modulus.
+    Running time: O(log n) multiplications of numbers less than modulus**2,
+    or O(log modulus) once the Pisano period of the modulus is cached"""
+    if not isinstance(n, int) or n < 0:
+        raise ValueError('fibonacci is undefined for n = {!r}'.format(n))
+    if not isinstance(modulus, int) or modulus < 1:
+        raise ValueError('modulus must be a positive integer, not {!r}'
+                         .format(modulus))
+    if modulus <= PISANO_LIMIT:
+        n %= pisano_period(modulus)
+    return _fibonacci_doubling(n, modulus)
+
+
+# Implementations of fibonacci that can be selected by strategy name
+STRATEGIES = {
+    'recursive': fibonacci_recursive,
+    'memoized': fibonacci_memoized,
+    'dynamic': fibonacci_dynamic,
+    'trampolined': fibonacci_trampolined,
+    'matrix': fibonacci_matrix,
+    'doubling': fibonacci_doubling,
+}
+
+# Largest n each strategy can reach in reasonable time when benchmarking
+BENCHMARK_LIMITS = {
+    'recursive': 25,
+    'memoized': 100000,
+    'dynamic': 100000,
+    'trampolined': 100000,
+    'matrix': 10000000,
+    'doubling': 10000000,
+}
+
+
+def benchmark_fibonacci(sizes=(10, 20, 100, 1000, 10000, 100000, 1000000,
+                               10000000)):
+    """Print a table of the time each fibonacci strategy takes to compute
+    fibonacci(n) for each of the given sizes, skipping sizes beyond each
+    strategy's limit in BENCHMARK_LIMITS."""
+    import time
+    print('{:>10} '.format('n') + ' '.join('{:>12}'.format(strategy)
+                                          for strategy in STRATEGIES))
+    for n in sizes:
+        row = []
+        for strategy, function in STRATEGIES.items():
+            if n > BENCHMARK_LIMITS[strategy]:
+                row.append('{:>12}'.format('-'))
+                continue
+            if strategy == 'memoized':
+                fibonacci_cached.cache_clear()
+            start_time = time.perf_counter()
+            function(n)
+            row.append('{:>12.6f}'.format(time.perf_counter() - start_time))
+        print('{:>10} '.format(n) + ' '.join(row))
 
 
 def main():
     import sys
     args = sys.argv[1:]  # Ignore script file name
-    if len(args) == 1:
+    if args == ['benchmark']:
+        benchmark_fibonacci()
+    elif len(args) in (1, 2):
         num = int(args[0])
-        result = fibonacci(num)
+        strategy = args[1] if len(args) == 2 else 'doubling'
+        result = fibonacci(num, strategy)
         print('fibonacci({}) => {}'.format(num, result))
     else:
-        print('Usage: {} number'.format(sys.argv[0]))
+        print('Usage: {} number [strategy]'.format(sys.argv[0]))
+        print('       {} benchmark'.format(sys.argv[0]))
+        print('Strategies: {}'.format(', '.join(STRATEGIES)))
 
 
 if __name__ == '__main__':
@@ -1,6 +1,7 @@
 #!python
 
-from recursion import fibonacci
+from recursion import (fibonacci, fibonacci_cached, fibonacci_mod,
+                       pisano_period, STRATEGIES)
 import unittest
 
 
@@ -24,11 +25,48 @@ class RecursionTest(unittest.TestCase):
         assert fibonacci(15) == 610
         assert fibonacci(20) == 6765
         assert fibonacci(25) == 75025
-        # TODO: Improve the runtime of your fibonacci function for these cases
-        # If you're not careful, you may need to be very patient for these...
-        # assert fibonacci(30) == 832040
-        # assert fibonacci(35) == 9227465
-        # assert fibonacci(40) == 102334155
+        assert fibonacci(30) == 832040
+        assert fibonacci(35) == 9227465
+        assert fibonacci(40) == 102334155
+
+    def test_fibonacci_strategies(self):
+        for strategy in STRATEGIES:
+            # Keep n small enough for the exponential recursive strategy
+            for n, expected in [(0, 0), (1, 1), (2, 1), (10, 55), (20, 6765)]:
+                assert fibonacci(n, strategy) == expected
+        assert fibonacci(300, 'memoized') == fibonacci(300, 'dynamic')
+        # Deeper than the recursion limit allows, on a cold cache
+        fibonacci_cached.cache_clear()
+        assert fibonacci(5000, 'memoized') == fibonacci(5000, 'dynamic')
+        with self.assertRaises(ValueError):
+            fibonacci(5, 'unknown')
+
+    def test_fibonacci_with_huge_integers(self):
+        # Logarithmic strategies agree far beyond the reach of the others
+        assert fibonacci(100) == 354224848179261915075
+        assert fibonacci(5000, 'matrix') == fibonacci(5000, 'dynamic')
+        assert fibonacci(5000, 'doubling') == fibonacci(5000, 'dynamic')
+        assert fibonacci(100000) % 10 ** 9 == fibonacci_mod(100000, 10 ** 9)
+
+    def test_pisano_period(self):
+        assert pisano_period(1) == 1
+        assert pisano_period(2) == 3
+        assert pisano_period(3) == 8
+        assert pisano_period(10) == 60
+        assert pisano_period(1000) == 1500
+        with self.assertRaises(ValueError):
+            pisano_period(0)
+
+    def test_fibonacci_mod(self):
+        for modulus in [1, 2, 7, 10, 1000, 10 ** 5, 10 ** 9 + 7]:
+            for n in [0, 1, 2, 10, 99, 1000, 4321]:
+                assert fibonacci_mod(n, modulus) == fibonacci(n) % modulus
+        # Period of 10 is 60, so the last digit repeats every 60 numbers
+        assert fibonacci_mod(10 ** 18, 10) == fibonacci(10 ** 18 % 60) % 10
+        with self.assertRaises(ValueError):
+            fibonacci_mod(5, 0)
+        with self.assertRaises(ValueError):
+            fibonacci_mod(-1, 10)
 
     def test_fibonacci_with_negative_integers(self):
         # Should raise a ValueError for n < 0
@@ -1,8 +1,9 @@
 #!python
 
-from sorting_iterative import is_sorted, bubble_sort, selection_sort, insertion_sort
-from sorting_recursive import split_sort_merge, merge_sort, quick_sort
-from sorting_integer import counting_sort, bucket_sort
+from sorting_iterative import is_sorted, bubble_sort
+from sorting_keys import apply_sort
+from sorting_registry import REGISTRY
+from sortstats import measure
 
 
 def random_ints(count=20, min=1, max=50):
@@ -12,8 +13,10 @@ def random_ints(count=20, min=1, max=50):
     return [random.randint(min, max) for _ in range(count)]
 
 
-def test_sorting(sort=bubble_sort, num_items=20, max_value=50):
-    """Test sorting algorithms with a small list of random items."""
+def test_sorting(sort=bubble_sort, num_items=20, max_value=50, stats=False):
+    """Test sorting algorithms with a small list of random items.
+    If stats is True, also report the comparisons, writes, allocations,
+    recursion depth, and phase timings of the sort, measured with sortstats."""
     # Create a list of items randomly sampled from range [1...max_value]
     items = random_ints(num_items, 1, max_value)
     print('Initial items: {!r}'.format(items))
@@ -21,21 +24,32 @@ def test_sorting(sort=bubble_sort, num_items=20, max_value=50):
 
     # Test the sorting algorithm and ensure the list is sorted afterward
     print('Sorting items with {}(items)'.format(sort.__name__))
-    sort(items)  # Note: sort should be a mutative function (modify input)
+    if stats:
+        items, sort_stats = measure(sort, items, trace_memory=True)
+    else:
+        items = apply_sort(sort, items)
     print('Sorted items:  {!r}'.format(items))
     print('Sorted order?  {!r}'.format(is_sorted(items)))
+    if stats:
+        print(sort_stats.report())
 
 
 def main():
     """Read command-line arguments and test sorting algorithms."""
     import sys
     args = sys.argv[1:]  # Ignore script file name
+    # Report sort statistics if requested with a flag anywhere in arguments
+    stats = '--stats' in args
+    if stats:
+        args.remove('--stats')
 
     if len(args) == 0:
         script = sys.argv[0]  # Get script file name
-        print('Usage: {} sort num max'.format(script))
+        print('Usage: {} sort num max [--stats]'.format(script))
         print('Test sorting algorithm `sort` with a list of `num` integers')
         print('    randomly sampled from the range [1...`max`] (inclusive)')
+        print('    and with --stats, report comparisons, writes, allocations,')
+        print('    recursion depth, and time spent in each phase')
         print('\nExample: {} bubble_sort 10 20'.format(script))
         print('Initial items: [3, 15, 4, 7, 20, 6, 18, 11, 9, 7]')
         print('Sorted order?  False')
@@ -44,20 +58,17 @@ def main():
         print('Sorted order?  True')
         return
 
-    # Get sort function by name
-    if len(args) >= 1:
-        sort_name = args[0]
-        # Terrible hack abusing globals
-        if sort_name in globals():
-            sort_function = globals()[sort_name]
-        else:
-            # Don't explode, just warn user and show list of sorting functions
-            print('Sorting function {!r} does not exist'.format(sort_name))
-            print('Available sorting functions:')
-            for name in globals():
-                if 'sort' in name:
-                    print('    {}'.format(name))
-            return
+    # Get sort function by name from the registry of sort engines
+    sort_name = args[0]
+    if sort_name in REGISTRY:
+        sort_function = REGISTRY[sort_name].function
+    else:
+        # Don't explode, just warn user and show list of sorting functions
+        print('Sorting function {!r} does not exist'.format(sort_name))
+        print('Available sorting functions:')
+        for engine in REGISTRY.values():
+            print('    {}'.format(engine.describe()))
+        return
 
     # Get num_items and max_value, but don't explode if input is not an integer
     try:
@@ -69,7 +80,7 @@ def main():
         return
 
     # Test sort function
-    test_sorting(sort_function, num_items, max_value)
+    test_sorting(sort_function, num_items, max_value, stats)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,290 @@
+#!python
+
+import json
+import math
+import random
+import sys
+import time
+
+from sorting_keys import apply_sort
+from sortstats import measure
+from sorting_registry import REGISTRY
+
+
+# Sort functions to benchmark by name, with the largest input size each is
+# run on (quadratic sorts take minutes beyond 10^4 items in Python) and
+# whether it compares items (numeric sorts do arithmetic on them instead)
+SORTS = {name: (engine.function,
+                10 ** 4 if engine.is_quadratic() else 10 ** 7,
+                not engine.numeric_only)
+         for name, engine in REGISTRY.items()}
+
+
+# Quadratic sorts used as kernels for small ranges inside hybrid sorts, and
+# the input sizes and repeats the --small preset benchmarks them on
+SMALL_SORTS = ['bubble_sort', 'bubble_sort_fast', 'cocktail_sort',
+               'selection_sort', 'insertion_sort', 'binary_insertion_sort']
+SMALL_SIZES = [16, 32, 64]
+SMALL_REPEAT = 1000
+
+
+def random_items(n):
+    """Return n integers sampled uniformly from range [0...n]."""
+    return [random.randint(0, n) for _ in range(n)]
+
+
+def sorted_items(n):
+    """Return n integers in increasing order."""
+    return list(range(n))
+
+
+def reversed_items(n):
+    """Return n integers in decreasing order."""
+    return list(range(n, 0, -1))
+
+
+def few_unique_items(n):
+    """Return n integers sampled from only 10 distinct values."""
+    return [random.randint(0, 9) for _ in range(n)]
+
+
+def organ_pipe_items(n):
+    """Return n integers that increase to a peak in the middle and then
+    decrease again."""
+    half = n // 2
+    return list(range(half)) + list(range(n - half, 0, -1))
+
+
+def zipf_items(n, exponent=1.2):
+    """Return n integers where value k is drawn with probability proportional
+    to 1 / k**exponent, so a few small values are very common."""
+    values = range(1, n + 1)
+    weights = [1 / value ** exponent for value in values]
+    return random.choices(values, weights, k=n)
+
+
+def nearly_sorted_items(n, fraction=0.01):
+    """Return n integers in increasing order except for a given fraction of
+    them swapped with random other items."""
+    items = list(range(n))
+    for _ in range(max(1, int(n * fraction))):
+        i, j = random.randrange(n), random.randrange(n)
+        items[i], items[j] = items[j], items[i]
+    return items
+
+
+# Input distributions to benchmark by name
+DISTRIBUTIONS = {
+    'random': random_items,
+    'sorted': sorted_items,
+    'reversed': reversed_items,
+    'few_unique': few_unique_items,
+    'organ_pipe': organ_pipe_items,
+    'zipf': zipf_items,
+    'nearly_sorted': nearly_sorted_items,
+}
+
+
+def run_case(name, distribution, size, repeat=1, stats=True):
+    """Benchmark the named sort on an input of the given size drawn from the
+    named distribution, and return a dictionary of results: the best wall
+    time of the given number of repeats, and unless stats is False, the
+    comparisons, writes, allocations, recursion depth, and peak memory of
+    one instrumented run. If the sort
+    fails or sorts incorrectly, the result records an error instead."""
+    sort, _, count_comparisons = SORTS[name]
+    items = DISTRIBUTIONS[distribution](size)
+    expected = sorted(items)
+    result = {'sort': name, 'distribution': distribution, 'size': size,
+              'seconds': None, 'comparisons': None, 'writes': None,
+              'allocations': None, 'max_depth': None, 'peak_bytes': None,
+              'error': None}
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            copy = list(items)
+            start_time = time.perf_counter()
+            output = apply_sort(sort, copy)
+            best = min(best, time.perf_counter() - start_time)
+            if list(output) != expected:
+                raise AssertionError('output is not sorted')
+        result['seconds'] = best
+        if stats:
+            output, counts = measure(sort, items, count_comparisons,
+                                     trace_memory=True)
+            for field in ['comparisons', 'writes', 'allocations', 'max_depth',
+                          'peak_bytes']:
+                result[field] = getattr(counts, field)
+    except (RecursionError, AssertionError, TypeError) as error:
+        result['error'] = '{}: {}'.format(type(error).__name__, error)
+    return result
+
+
+def run_benchmark(sorts, distributions, sizes, repeat=1, stats=True,
+                  log=None):
+    """Benchmark every given sort on every given distribution and size
+    (skipping sizes beyond each sort's limit), and return a list of result
+    dictionaries. If log is a file, print progress to it."""
+    results = []
+    for name in sorts:
+        limit = SORTS[name][1]
+        for distribution in distributions:
+            for size in sizes:
+                if size > limit:
+                    continue
+                result = run_case(name, distribution, size, repeat, stats)
+                results.append(result)
+                if log is not None:
+                    print('{sort} {distribution} {size}: {seconds} {error}'
+                          .format(**result), file=log)
+    return results
+
+
+# Columns of benchmark results, in order, for CSV output
+FIELDS = ['sort', 'distribution', 'size', 'seconds', 'comparisons', 'writes',
+          'allocations', 'max_depth', 'peak_bytes', 'error']
+
+
+def write_csv(results, filename):
+    """Write the given benchmark results to a CSV file."""
+    import csv
+    with open(filename, 'w', newline='') as file:
+        writer = csv.DictWriter(file, FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def write_json(results, filename):
+    """Write the given benchmark results to a JSON file."""
+    with open(filename, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def growth_exponent(results):
+    """Return the slope of log(time) against log(size) between the smallest
+    and largest sizes in the given results for one sort and distribution,
+    which estimates k in a running time of O(n^k), or None if unknown."""
+    timed = sorted((result['size'], result['seconds']) for result in results
+                   if result['seconds'])
+    if len(timed) < 2 or timed[0][0] == timed[-1][0]:
+        return None
+    (size1, time1), (size2, time2) = timed[0], timed[-1]
+    return math.log(time2 / time1) / math.log(size2 / size1)
+
+
+def print_summary(results, file=sys.stdout):
+    """Print a table of wall times by size on a log-log scale (each size is a
+    power of ten apart) for each sort and distribution, with the estimated
+    growth exponent k of O(n^k)."""
+    sizes = sorted(set(result['size'] for result in results))
+    groups = {}
+    for result in results:
+        groups.setdefault((result['sort'], result['distribution']),
+                          []).append(result)
+    header = '{:22} {:14}'.format('sort', 'distribution')
+    header += ''.join('{:>16}'.format('n=' + str(size)) for size in sizes)
+    print(header + '{:>8}'.format('k'), file=file)
+    for (name, distribution), group in groups.items():
+        by_size = {result['size']: result for result in group}
+        row = '{:22} {:14}'.format(name, distribution)
+        for size in sizes:
+            result = by_size.get(size)
+            if result is None:
+                cell = '-'
+            elif result['error']:
+                cell = result['error'].split(':')[0]
+            else:
+                cell = '{:.2e}'.format(result['seconds'])
+            row += '{:>16}'.format(cell)
+        exponent = growth_exponent(group)
+        row += '{:>8}'.format('-' if exponent is None else
+                              '{:.2f}'.format(exponent))
+        print(row, file=file)
+
+
+def check_regressions(results, baseline, threshold=1.5):
+    """Compare the given results with baseline results (from an earlier
+    run's JSON output) and return a list of messages for every case whose
+    time or comparison count grew by more than the given factor, or which
+    newly fails."""
+    previous = {(result['sort'], result['distribution'], result['size']):
+                result for result in baseline}
+    regressions = []
+    for result in results:
+        key = (result['sort'], result['distribution'], result['size'])
+        old = previous.get(key)
+        if old is None:
+            continue
+        label = '{} {} n={}'.format(*key)
+        if result['error'] and not old['error']:
+            regressions.append('{}: now fails with {}'
+                               .format(label, result['error']))
+            continue
+        for metric in ['seconds', 'comparisons']:
+            if old[metric] and result[metric] and \
+                    result[metric] > old[metric] * threshold:
+                regressions.append('{}: {} grew from {} to {}'.format(
+                    label, metric, old[metric], result[metric]))
+    return regressions
+
+
+def main():
+    """Read command-line arguments and run the sorting benchmark."""
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Benchmark sorting algorithms across input distributions.')
+    parser.add_argument('--sorts', nargs='+', default=None,
+                        choices=list(SORTS), metavar='SORT',
+                        help='sort functions to run (default: all, or the '
+                             'small-input kernels with --small)')
+    parser.add_argument('--distributions', nargs='+',
+                        default=list(DISTRIBUTIONS),
+                        choices=list(DISTRIBUTIONS), metavar='DISTRIBUTION',
+                        help='input distributions (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=None,
+                        help='input sizes, up to 10^7 (default: 10^2 to 10^4)')
+    parser.add_argument('--repeat', type=int, default=None,
+                        help='time the best of this many runs (default: 1)')
+    parser.add_argument('--no-stats', action='store_true',
+                        help='only measure wall time, not comparisons, '
+                             'writes, and memory')
+    parser.add_argument('--small', action='store_true',
+                        help='benchmark the small-input kernels on {} items, '
+                             'best of {} runs'.format(SMALL_SIZES, SMALL_REPEAT))
+    parser.add_argument('--csv', help='write results to this CSV file')
+    parser.add_argument('--json', help='write results to this JSON file')
+    parser.add_argument('--baseline',
+                        help='JSON results of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='factor of growth over the baseline that counts '
+                             'as a regression (default: 1.5)')
+    args = parser.parse_args()
+    if args.small:
+        sorts, sizes, repeat = SMALL_SORTS, SMALL_SIZES, SMALL_REPEAT
+    else:
+        sorts, sizes, repeat = list(SORTS), [10 ** 2, 10 ** 3, 10 ** 4], 1
+    # Arguments given explicitly override the preset
+    sorts = args.sorts or sorts
+    sizes = args.sizes or sizes
+    repeat = args.repeat or repeat
+
+    results = run_benchmark(sorts, args.distributions, sizes, repeat,
+                            not args.no_stats, log=sys.stderr)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.json:
+        write_json(results, args.json)
+    print_summary(results)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = check_regressions(results, baseline, args.threshold)
+        for message in regressions:
+            print('REGRESSION: ' + message)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!python
+
+from sorting_benchmark import (SORTS, DISTRIBUTIONS, run_benchmark,
+                               check_regressions, growth_exponent)
+from sortstats import measure
+from sorting_iterative import bubble_sort
+from sorting_integer import counting_sort
+import sorting_recursive
+import unittest
+
+
+class SortStatsTest(unittest.TestCase):
+
+    def test_measure_counts_comparisons_and_writes(self):
+        output, stats = measure(bubble_sort, [3, 2, 1])
+        assert output == [1, 2, 3]
+        # Three swaps of adjacent items, each writing two items
+        assert stats.writes == 6
+        assert stats.comparisons > 0
+
+    def test_measure_depth_and_phases(self):
+        merge_sort = sorting_recursive.merge_sort
+        merge = sorting_recursive.merge
+        output, stats = measure(merge_sort, list(range(16, 0, -1)))
+        assert output == list(range(1, 17))
+        # Halving 16 items takes 4 levels below the first call
+        assert stats.max_depth == 5
+        assert stats.calls == 31
+        assert stats.phase_calls['merge'] == 15
+        assert stats.phase_calls['partition'] == 0
+        assert stats.allocations == 30
+        # Wrapped functions are restored afterward
+        assert sorting_recursive.merge_sort is merge_sort
+        assert sorting_recursive.merge is merge
+
+    def test_measure_memory(self):
+        _, stats = measure(bubble_sort, [3, 2, 1])
+        assert stats.peak_bytes is None
+        _, stats = measure(bubble_sort, [3, 2, 1], trace_memory=True)
+        assert stats.peak_bytes > 0
+
+    def test_measure_without_comparisons(self):
+        output, stats = measure(counting_sort, [3, 1, 2], count_comparisons=False)
+        assert output == [1, 2, 3]
+        assert stats.comparisons is None
+        # Integer sorts cannot sort wrapped items, so they are detected
+        output, stats = measure(counting_sort, [3, 1, 2])
+        assert output == [1, 2, 3]
+        assert stats.comparisons is None
+
+
+class SortingBenchmarkTest(unittest.TestCase):
+
+    def test_distributions(self):
+        for name, distribution in DISTRIBUTIONS.items():
+            items = distribution(100)
+            assert len(items) == 100
+            assert all(isinstance(item, int) for item in items)
+
+    def test_run_benchmark(self):
+        results = run_benchmark(list(SORTS), ['random', 'few_unique'], [10, 50])
+        assert len(results) == len(SORTS) * 2 * 2
+        for result in results:
+            assert result['error'] is None, result
+            assert result['seconds'] >= 0
+            assert result['peak_bytes'] > 0
+
+    def test_run_benchmark_records_errors(self):
+        # Quick sort recurses once per item on sorted input
+        results = run_benchmark(['quick_sort'], ['sorted'], [5000], stats=False)
+        assert results[0]['error'].startswith('RecursionError')
+
+    def test_check_regressions(self):
+        baseline = [{'sort': 'merge_sort', 'distribution': 'random', 'size': 10,
+                     'seconds': 1.0, 'comparisons': 100, 'error': None}]
+        faster = [dict(baseline[0], seconds=1.2)]
+        slower = [dict(baseline[0], seconds=2.0)]
+        failing = [dict(baseline[0], seconds=None, error='RecursionError')]
+        assert check_regressions(faster, baseline, 1.5) == []
+        assert len(check_regressions(slower, baseline, 1.5)) == 1
+        assert len(check_regressions(failing, baseline, 1.5)) == 1
+
+    def test_growth_exponent(self):
+        results = [{'size': 10, 'seconds': 1.0}, {'size': 1000, 'seconds': 100.0}]
+        assert abs(growth_exponent(results) - 1.0) < 1e-9
+
+
+if __name__ == '__main__':
+    unittest.main()
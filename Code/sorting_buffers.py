@@ -0,0 +1,143 @@
+#!python
+
+import mmap
+import os
+import struct
+
+from sorting_registry import get_sort
+
+
+def typed_view(buffer, typecode):
+    """Return a memoryview of the given buffer (such as an array.array,
+    bytearray, or mmap) cast to items of the given struct format typecode,
+    like 'q' for 64-bit integers or 'd' for 64-bit floats, so its items can be
+    read and written as Python numbers without copying the buffer.
+    Raise ValueError if the buffer's size is not a multiple of the size of
+    one item of that format."""
+    view = memoryview(buffer)
+    if view.format != 'B':
+        view = view.cast('B')
+    if view.nbytes % struct.calcsize(typecode) != 0:
+        raise ValueError('Buffer of {} bytes does not hold a whole number of '
+                         '{!r} items'.format(view.nbytes, typecode))
+    return view.cast(typecode)
+
+
+# Struct format typecodes of floating point numbers
+FLOAT_TYPECODES = 'efd'
+
+
+def sort_buffer(buffer, typecode=None, engine='intro_sort'):
+    """Sort the numbers stored in the given mutable buffer in place with the
+    named sort engine, which must be able to sort buffers, and return the
+    buffer. If typecode is given, the buffer's bytes are read as items of
+    that format (see typed_view); otherwise the buffer must already have a
+    typed format, like an array.array.
+    Raise ValueError if the engine cannot sort buffers, or only sorts
+    integers and the buffer holds floating point numbers.
+    Running time: the engine's running time on n numbers
+    Memory usage: the engine's memory usage, with no copy of the buffer"""
+    sort = get_sort(engine)
+    if not sort.buffers:
+        raise ValueError('Sort engine {!r} cannot sort buffers'.format(engine))
+    view = memoryview(buffer) if typecode is None else typed_view(buffer,
+                                                                  typecode)
+    with view:
+        # Formats may start with a byte order character, like '<d'
+        if sort.integer_only and view.format[-1:] in FLOAT_TYPECODES:
+            raise ValueError('Sort engine {!r} only sorts integers, not {!r} '
+                             'items'.format(engine, view.format))
+        sort(view)
+    return buffer
+
+
+def sort_file(path, typecode='q', engine='intro_sort'):
+    """Sort the binary file at the given path in place, read as packed numbers
+    of the given struct format typecode (in native byte order), by mapping it
+    into memory and sorting the mapped pages with the named sort engine, so
+    the file is never loaded into a list of Python numbers. Return the number
+    of items sorted.
+    Running time: the engine's running time on n numbers, plus paging
+    Memory usage: the engine's memory usage, plus pages of the file that the
+    operating system keeps in memory"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0  # Empty files cannot be mapped
+    with open(path, 'r+b') as file:
+        with mmap.mmap(file.fileno(), size) as mapped:
+            # Views of the mapped file must be released before it is closed
+            with typed_view(mapped, typecode) as view:
+                sort_buffer(view, engine=engine)
+                count = len(view)
+            mapped.flush()
+    return count
+
+
+def benchmark_buffers(size=10 ** 5, engines=('quick_sort_iterative',
+                                             'heap_sort', 'intro_sort',
+                                             'radix_sort')):
+    """Compare the time and peak memory of sorting a list of random 64-bit
+    integers with sorting the same numbers in an array.array, with each of the
+    given engines, and time sorting them in a memory-mapped file."""
+    import random
+    import tempfile
+    import time
+    import tracemalloc
+    from array import array
+
+    numbers = array('q', (random.randint(-2 ** 62, 2 ** 62)
+                          for _ in range(size)))
+    expected = sorted(numbers)
+    print('{} random 64-bit integers'.format(size))
+    print('{:22} {:>10} {:>14} {:>10} {:>14} {:>10}'.format(
+        'engine', 'list sec', 'list bytes', 'array sec', 'array bytes',
+        'file sec'))
+    for engine in engines:
+        row = [engine]
+        # Lists box every number in a new int object, arrays store them packed
+        for make_input in [array.tolist, lambda numbers: array('q', numbers)]:
+            items = make_input(numbers)
+            start_time = time.perf_counter()
+            get_sort(engine)(items)
+            elapsed = time.perf_counter() - start_time
+            assert list(items) == expected
+            # Measure peak memory separately, since tracing slows sorting down,
+            # and include the memory of the input itself
+            tracemalloc.start()
+            get_sort(engine)(make_input(numbers))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            row.extend(['{:.4f}'.format(elapsed), str(peak)])
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            numbers.tofile(file)
+        try:
+            start_time = time.perf_counter()
+            sort_file(file.name, 'q', engine)
+            row.append('{:.4f}'.format(time.perf_counter() - start_time))
+        finally:
+            os.remove(file.name)
+        print('{:22} {:>10} {:>14} {:>10} {:>14} {:>10}'.format(*row))
+
+
+def main():
+    """Read command-line arguments and sort a binary file, or benchmark."""
+    import sys
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) == 0:
+        script = sys.argv[0]  # Get script file name
+        print('Usage: {} file [typecode] [engine]'.format(script))
+        print('       {} benchmark [size]'.format(script))
+        print('Sort a binary file of packed numbers in place, by default with')
+        print('    typecode q (64-bit integers) and engine intro_sort')
+        return
+    if args[0] == 'benchmark':
+        benchmark_buffers(int(args[1]) if len(args) > 1 else 10 ** 5)
+        return
+    typecode = args[1] if len(args) > 1 else 'q'
+    engine = args[2] if len(args) > 2 else 'intro_sort'
+    count = sort_file(args[0], typecode, engine)
+    print('Sorted {} items in {}'.format(count, args[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!python
+
+from sorting import random_ints
+from sorting_buffers import typed_view, sort_buffer, sort_file
+from sorting_registry import REGISTRY
+from array import array
+import os
+import tempfile
+import unittest
+
+
+class SortBufferTest(unittest.TestCase):
+
+    def test_typed_view(self):
+        buffer = bytearray(array('q', [3, -1, 2]).tobytes())
+        view = typed_view(buffer, 'q')
+        assert view.tolist() == [3, -1, 2]
+        view[0] = 7
+        assert array('q', bytes(buffer)).tolist() == [7, -1, 2]
+        with self.assertRaises(ValueError):
+            typed_view(bytearray(12), 'q')
+
+    def test_every_buffer_engine_sorts_arrays(self):
+        for name, engine in REGISTRY.items():
+            if not engine.buffers:
+                continue
+            for typecode in ['q', 'l', 'i']:
+                items = array(typecode, random_ints(200, -1000, 1000))
+                expected = sorted(items)
+                engine(items)
+                assert items.tolist() == expected, name
+                # Typed memoryviews too
+                items = array(typecode, random_ints(200, -1000, 1000))
+                expected = sorted(items)
+                with memoryview(items) as view:
+                    engine(view)
+                assert items.tolist() == expected, name
+            if not engine.integer_only:
+                items = array('d', [number / 7 for number in
+                                    random_ints(200, -1000, 1000)])
+                expected = sorted(items)
+                engine(items)
+                assert items.tolist() == expected, name
+
+    def test_every_buffer_engine_sorts_arrays_with_key_and_reverse(self):
+        for name, engine in REGISTRY.items():
+            if not engine.buffers:
+                continue
+            numbers = random_ints(200, -1000, 1000)
+            for key, reverse in [(None, True), (abs, False), (abs, True),
+                                 (lambda number: number % 7, False)]:
+                expected = sorted(numbers, key=key, reverse=reverse)
+                items = array('q', numbers)
+                assert engine(items, key=key, reverse=reverse) is items, name
+                assert items.tolist() == expected, name
+                items = array('q', numbers)
+                with memoryview(items) as view:
+                    engine(view, key=key, reverse=reverse)
+                assert items.tolist() == expected, name
+
+    def test_sort_buffer(self):
+        items = array('q', random_ints(100, -10 ** 12, 10 ** 12))
+        expected = sorted(items)
+        buffer = bytearray(items.tobytes())
+        assert sort_buffer(buffer, 'q', 'radix_sort') is buffer
+        assert array('q', bytes(buffer)).tolist() == expected
+        items = array('d', [1.5, -2.0, 0.25])
+        sort_buffer(items, engine='heap_sort')
+        assert items.tolist() == [-2.0, 0.25, 1.5]
+        with self.assertRaises(ValueError):
+            sort_buffer(items, engine='merge_sort')
+
+    def test_sort_buffer_rejects_floats_for_integer_sorts(self):
+        numbers = [1.5, -2.0, 0.25]
+        for engine in ['counting_sort', 'radix_sort']:
+            items = array('d', numbers)
+            with self.assertRaises(ValueError):
+                sort_buffer(items, engine=engine)
+            assert items.tolist() == numbers
+            buffer = bytearray(array('f', numbers).tobytes())
+            with self.assertRaises(ValueError):
+                sort_buffer(buffer, 'f', engine)
+        # Bucket sort does arithmetic, but not only on integers
+        items = array('d', numbers)
+        sort_buffer(items, engine='bucket_sort')
+        assert items.tolist() == [-2.0, 0.25, 1.5]
+
+    def test_sort_file(self):
+        for typecode, numbers in [
+                ('q', random_ints(1000, -10 ** 15, 10 ** 15)),
+                ('d', [number / 3 for number in random_ints(1000, -100, 100)])]:
+            for engine in ['quick_sort_iterative', 'heap_sort', 'intro_sort']:
+                with tempfile.NamedTemporaryFile(delete=False) as file:
+                    array(typecode, numbers).tofile(file)
+                try:
+                    assert sort_file(file.name, typecode, engine) == 1000
+                    with open(file.name, 'rb') as file:
+                        assert array(typecode, file.read()).tolist() == \
+                            sorted(numbers)
+                finally:
+                    os.remove(file.name)
+
+    def test_sort_file_rejects_floats_for_integer_sorts(self):
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            array('d', [2.5, 1.5]).tofile(file)
+        try:
+            with self.assertRaises(ValueError):
+                sort_file(file.name, 'd', 'radix_sort')
+            with open(file.name, 'rb') as file:
+                assert array('d', file.read()).tolist() == [2.5, 1.5]
+        finally:
+            os.remove(file.name)
+
+    def test_sort_empty_file(self):
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            pass
+        try:
+            assert sort_file(file.name) == 0
+        finally:
+            os.remove(file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,10 @@
 #!python
-from sorting_recursive import quick_sort
+from array import array
+from sorting_keys import sort_by_key
+from sorting_recursive import quick_sort, merge_sort_iterative
+
+# Like sorted(), every sort below accepts a key function (which must return
+# numbers) and reverse flag, and is stable when given either
 
 def min_max(numbers):
     """Helper function to find range of list"""
@@ -7,39 +12,154 @@ def min_max(numbers):
     max_val = max(numbers)
     return (min_val, max_val)
 
-def counting_sort(numbers):
-    """Sort given numbers (integers) by counting occurrences of each number,
-    then looping over counts and copying that many numbers into output list.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
+# Ranges wider than this many times the number of items are counted sparsely
+# (only values that occur), so counts never take more memory than the items
+SPARSE_FACTOR = 4
+
+
+def counting_sort(numbers, key=None, reverse=False):
+    """Sort given numbers (integers) in place by counting occurrences of each
+    number, then looping over counts and writing that many copies of each
+    number back into the given list (or other mutable sequence).
+    Counts are kept in an array of machine integers with one slot per number
+    in the range of numbers, unless the range is over SPARSE_FACTOR times
+    wider than the number of numbers: then only numbers that occur are
+    counted, in a dictionary, and those distinct numbers are sorted with
+    radix_sort. Negative numbers are counted by their offset from the minimum.
+    If a key function is given, records are sorted stably by their integer
+    keys instead (see counting_sort_records).
+    Running time: O(n + k) for n numbers in a range of k values if dense,
+                  or O(n + d*u) for u distinct values with d radix digits if
+                  sparse, so O(n) when the range is at most a constant
+                  factor wider than the number of numbers
+    Memory usage: O(min(k, n)) - one count per value in the range, or per
+                  distinct value if the range is much wider"""
+    if key is not None:
+        return counting_sort_records(numbers, key, reverse)
+    if len(numbers) <= 1:
+        return numbers
     # Find range of given numbers (minimum and maximum integer values)
     rng = min_max(numbers)
+    width = rng[1] - rng[0] + 1
+    if width > SPARSE_FACTOR * len(numbers):
+        # Count only numbers that occur, then order those distinct numbers
+        counts = {}
+        for num in numbers:
+            counts[num] = counts.get(num, 0) + 1
+        values = radix_sort(list(counts), reverse=reverse)
+        runs = ((value, counts[value]) for value in values)
+    else:
+        # Create array of counts with a slot for each number in input range
+        counts = array('l', [0]) * width
+        for num in numbers:
+            counts[num - rng[0]] += 1
+        offsets = range(width - 1, -1, -1) if reverse else range(width)
+        runs = ((rng[0] + offset, counts[offset]) for offset in offsets)
+    # Loop over counts and write that many copies of each number in order
+    start = 0
+    for num, count in runs:
+        for index in range(start, start + count):
+            numbers[index] = num
+        start += count
+    return numbers
 
-    # Create list of counts with a slot for each number in input range
-    counts = [0] * (rng[1] - rng[0] + 1)
 
-    # Loop over given numbers and increment each number's count
-    for num in numbers:
-      index = num - rng[0]
-      counts[index] += 1
+def counting_sort_records(records, key, reverse=False):
+    """Sort given records in place by the integer returned by calling key on
+    each record (once), keeping records with equal keys in their original
+    order, by counting occurrences of each key, summing counts into the
+    position of each key's first record, and copying records to their
+    positions. Dense or sparse counts are chosen as in counting_sort.
+    Running time: O(n + k) for n records with keys in a range of k values,
+                  or O(n + d*u) if sparse (see counting_sort)
+    Memory usage: O(n) - a copy of the records and their keys, plus
+                  O(min(k, n)) counts"""
+    keys = [key(record) for record in records]
+    if len(keys) <= 1:
+        return records
+    rng = min_max(keys)
+    width = rng[1] - rng[0] + 1
+    if width > SPARSE_FACTOR * len(keys):
+        counts = {}
+        for record_key in keys:
+            counts[record_key] = counts.get(record_key, 0) + 1
+        # Replace each count with the position of the first record with
+        # that key, in order of keys
+        position = 0
+        for record_key in radix_sort(list(counts), reverse=reverse):
+            position, counts[record_key] = position + counts[record_key], position
+        slots = keys
+    else:
+        counts = array('l', [0]) * width
+        slots = [record_key - rng[0] for record_key in keys]
+        for slot in slots:
+            counts[slot] += 1
+        position = 0
+        for slot in (range(width - 1, -1, -1) if reverse else range(width)):
+            position, counts[slot] = position + counts[slot], position
+    # Copy each record to the next position for its key, in original order
+    originals = list(records)
+    for record, slot in zip(originals, slots):
+        records[counts[slot]] = record
+        counts[slot] += 1
+    return records
 
-    new_items = []
-    #  Loop over counts and append that many numbers into output list
-    for index in range(len(counts)):
-      num = rng[0] + index
-      nums = [num] * counts[index]
-      new_items.extend(nums)
-    # FIXME: Improve this to mutate input instead of creating new output list
-    return new_items
+
+def radix_sort(numbers, base=256, key=None, reverse=False):
+    """Sort given numbers (integers) in place by distributing them into
+    buckets by each digit in the given base, from least to most significant
+    digit, keeping the order of numbers with equal digits so earlier passes
+    are preserved. Numbers are sorted by their offset from the minimum so
+    negatives work. Offsets and buckets are arrays of unsigned 64-bit
+    integers when offsets fit, so sorting a typed buffer (array.array,
+    memoryview, or mmap cast to a format) never converts it into a list of
+    Python ints.
+    Running time: O(d * (n + b)) for d digits of the range in base b, so O(n)
+                  for a fixed range no matter how large it is compared to n
+    Memory usage: O(n + b) - buckets hold a copy of every offset"""
+    if key is not None or reverse:
+        return sort_by_key(lambda keys: radix_sort(keys, base), numbers, key,
+                           reverse, integer=True)
+    if len(numbers) <= 1:
+        return numbers
+    rng = min_max(numbers)
+    width = rng[1] - rng[0]
+    # Arrays of machine integers take 8 bytes per offset instead of 28 or more
+    new_bucket = (lambda: array('Q')) if width < 2 ** 64 else list
+    offsets = new_bucket()
+    offsets.extend(num - rng[0] for num in numbers)
+    place = 1
+    while place <= width:
+        # Distribute by current digit, then collect buckets in order
+        buckets = [new_bucket() for _ in range(base)]
+        for offset in offsets:
+            buckets[offset // place % base].append(offset)
+        offsets = new_bucket()
+        for bucket in buckets:
+            offsets.extend(bucket)
+        place *= base
+    for index, offset in enumerate(offsets):
+        numbers[index] = offset + rng[0]
+    return numbers
 
 
-def bucket_sort(numbers, num_buckets=10):
+def bucket_sort(numbers, num_buckets=10, key=None, reverse=False):
     """Sort given numbers by distributing into buckets representing subranges,
     then sorting each bucket and concatenating all buckets in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
+    Running time: O(n + k) plus the time to sort each bucket, so O(n) on average
+                  if numbers are uniformly distributed across their range, but
+                  O(n*log(n)) if most numbers fall into the same bucket
+    Memory usage: O(n + k) - buckets hold a copy of every number"""
+    if key is not None or reverse:
+        return sort_by_key(lambda keys: bucket_sort(keys, num_buckets), numbers,
+                           key, reverse, integer=True)
+    if len(numbers) <= 1:
+        return numbers
     # Find range of given numbers (minimum and maximum values)
     rng = min_max(numbers)
+    width = rng[1] - rng[0]
+    if width == 0:
+        return numbers  # All numbers are equal
 
     #  Create list of buckets to store numbers in subranges of input range
     buckets = []
@@ -47,18 +167,18 @@ def bucket_sort(numbers, num_buckets=10):
 
     #  Loop over given numbers and place each item in appropriate bucket
     for num in numbers:
-      indx = num // rng[1] * num_buckets
-      buckets[indx - 1].append(num)
-    # print(buckets)
+      # Scale number's offset in range to a bucket index (maximum goes last)
+      indx = min(int((num - rng[0]) * num_buckets / width), num_buckets - 1)
+      buckets[indx].append(num)
     #  Sort each bucket using any sorting algorithm (recursive or another)
-    for bucket in buckets: sorted(bucket)
-    # TODO: Loop over buckets and append each bucket's numbers into output list
-    rtrn = []
-    for bucket in buckets: 
-      rtrn.append(bucket[:])
-    return rtrn
-
-    # FIXME: Improve this to mutate input instead of creating new output list
+    for bucket in buckets: merge_sort_iterative(bucket)
+    #  Loop over buckets and copy each bucket's numbers back into input list
+    index = 0
+    for bucket in buckets:
+      for num in bucket:
+        numbers[index] = num
+        index += 1
+    return numbers
 
 if __name__ == '__main__':
   numbers = [2, 1, 4, 7, 6, 2, 1, 2, 1000000]
@@ -1,5 +1,11 @@
 #!python
 
+import bisect
+from sorting_keys import sort_by_key
+
+# Like sorted(), every sort below accepts a key function and reverse flag, and
+# is stable when given either (see sorting_keys)
+
 
 def is_sorted(items):
     """Return a boolean indicating whether given items are in sorted order.
@@ -11,12 +17,14 @@ def is_sorted(items):
         return False
     return True
 
-def bubble_sort(items):
+def bubble_sort(items, key=None, reverse=False):
     """Sort given items by swapping adjacent items that are out of order, and
     repeating until all items are in sorted order.
     Running time: Best case O(n) - when input is sorted and no swaps are made
                   Worst case O(n^2) - must iterate through array n times
     Memory usage: O(1) - swaps happen in place"""
+    if key is not None or reverse:
+        return sort_by_key(bubble_sort, items, key, reverse)
     # Repeat until all items are in sorted order
     # for index, item in enumerate(items):
     if len(items) <= 1:
@@ -28,7 +36,7 @@ def bubble_sort(items):
           items[index], items[index + 1] = items[index + 1], items[index]
     return items
 
-def selection_sort(items):
+def selection_sort(items, key=None, reverse=False):
     """Sort given items by finding minimum item, swapping it with first
     unsorted item, and repeating until all items are in sorted order.
 
@@ -36,6 +44,8 @@ def selection_sort(items):
     n times.
 
     Memory usage: O(1) because all of the swapping happens in place"""
+    if key is not None or reverse:
+        return sort_by_key(selection_sort, items, key, reverse)
     
     min_index = 0
     sorted_index = 0
@@ -52,48 +62,144 @@ def selection_sort(items):
       sorted_index += 1
     return items
 
-def insertion_sort(items):
+def insertion_sort(items, low=0, high=None, key=None, reverse=False):
     """Sort given items by taking first unsorted item, inserting it in sorted
     order in front of items, and repeating until all items are in order.
+    If given, only the range `[low...high-1]` is sorted.
 
     Running time: Best case O(n) - input is already sorted
                   Worst case O(n^2) - input requires maximum amount of swaps (reverse sorted)
 
     Memory usage: O(1) - sorting happens in place"""
-    # keep track of the previous item"""
+    if key is not None or reverse:
+        return sort_by_key(insertion_sort, items, key, reverse, low=low, high=high)
+    if high is None:
+      high = len(items)
     # Repeat until all items are in sorted order
-    for index in range(1, len(items)):
+    for index in range(low + 1, high):
       #  Take first unsorted item
       item = items[index]
       rev_index = index - 1
-      while rev_index >= 0 and item < items[rev_index]:
+      while rev_index >= low and item < items[rev_index]:
         items[rev_index + 1] = items[rev_index]
         rev_index -= 1
       items[rev_index + 1] = item
     return items
 
+def heap_sort(items, low=0, high=None, key=None, reverse=False):
+    """Sort given items in place by arranging them into a binary max heap, then
+    repeatedly swapping the max item at the root with the last item of the
+    heap and restoring the heap property on the smaller heap.
+    If given, only the range `[low...high-1]` is sorted.
+    Running time: O(n*log(n)) in all cases - each of n items bubbles down
+                  at most log(n) levels
+    Memory usage: O(1) - the heap is built in place, without recursion"""
+    if key is not None or reverse:
+        return sort_by_key(heap_sort, items, key, reverse, low=low, high=high)
+    if high is None:
+      high = len(items)
+    size = high - low
+    # Build the max heap bottom-up, from the last parent node to the root
+    for start in range(size // 2 - 1, -1, -1):
+      _sift_down(items, low, start, size)
+    # Move max item to the end of the heap and shrink the heap by one
+    for end in range(size - 1, 0, -1):
+      items[low], items[low + end] = items[low + end], items[low]
+      _sift_down(items, low, 0, end)
+    return items
+
+def _sift_down(items, offset, index, size):
+    """Move the item at the given heap index down a max heap of the given
+    size, stored in items starting at the given offset, until it is no
+    smaller than its children."""
+    item = items[offset + index]
+    while True:
+      child = 2 * index + 1
+      if child >= size:
+        break
+      # Choose the larger child
+      if child + 1 < size and items[offset + child] < items[offset + child + 1]:
+        child += 1
+      if not item < items[offset + child]:
+        break
+      items[offset + index] = items[offset + child]
+      index = child
+    items[offset + index] = item
+
+def bubble_sort_fast(items, key=None, reverse=False):
+    """Sort given items like bubble sort, but remember where the last swap of
+    each sweep happened: items after it are already in their final places, so
+    the next sweep stops there, and the sort ends after a sweep with no swaps.
+    Running time: Best case O(n) - one sweep over sorted input
+                  Worst case O(n^2) - reverse sorted input shrinks the sweep
+                  range by only one item per sweep
+    Memory usage: O(1) - swaps happen in place"""
+    if key is not None or reverse:
+        return sort_by_key(bubble_sort_fast, items, key, reverse)
+    end = len(items) - 1
+    while end > 0:
+      last_swap = 0
+      for index in range(end):
+        if items[index + 1] < items[index]:
+          # Swap adjacent items that are out of order
+          items[index], items[index + 1] = items[index + 1], items[index]
+          last_swap = index
+      end = last_swap
+    return items
+
+def cocktail_sort(items, key=None, reverse=False):
+    """Sort given items with cocktail shaker sort: bubble sort sweeps that
+    alternate direction, so small items near the end move to the front in one
+    backward sweep instead of one position per sweep. Both ends of the sweep
+    range shrink to the last swap made in each direction.
+    Running time: Best case O(n) - one sweep over sorted input
+                  Worst case O(n^2) - but about half the sweeps of bubble sort
+                  on inputs with a few small items at the end
+    Memory usage: O(1) - swaps happen in place"""
+    if key is not None or reverse:
+        return sort_by_key(cocktail_sort, items, key, reverse)
+    start = 0
+    end = len(items) - 1
+    while start < end:
+      # Sweep forward, moving the largest unsorted item to the end
+      last_swap = start
+      for index in range(start, end):
+        if items[index + 1] < items[index]:
+          items[index], items[index + 1] = items[index + 1], items[index]
+          last_swap = index
+      end = last_swap
+      # Sweep backward, moving the smallest unsorted item to the front
+      last_swap = end
+      for index in range(end, start, -1):
+        if items[index] < items[index - 1]:
+          items[index], items[index - 1] = items[index - 1], items[index]
+          last_swap = index
+      start = last_swap
+    return items
+
+def binary_insertion_sort(items, low=0, high=None, key=None, reverse=False):
+    """Sort given items like insertion sort, but find each item's place in
+    the sorted items in front of it with binary search (bisect), and shift
+    the items after that place with one slice assignment instead of one
+    write per item. Inserting after equal items keeps the sort stable.
+    If given, only the range `[low...high-1]` is sorted.
+    Running time: O(n*log(n)) comparisons, but still O(n^2) item moves in the
+                  worst case (done in C by the slice assignment)
+    Memory usage: O(1) - sorting happens in place"""
+    if key is not None or reverse:
+        return sort_by_key(binary_insertion_sort, items, key, reverse, low=low, high=high)
+    if high is None:
+      high = len(items)
+    for index in range(low + 1, high):
+      item = items[index]
+      # Items in order already are left in place without shifting
+      if not item < items[index - 1]:
+        continue
+      slot = bisect.bisect_right(items, item, low, index)
+      items[slot + 1:index + 1] = items[slot:index]
+      items[slot] = item
+    return items
+
 # if __name__ == '__main__':
 #   nums = [4, 10, 2, 5 ,6, 3]
 #   print(bubble_sort_slow(nums))
-
-################################################################################
-################################################################################
-################################################################################
-
-# TODO: COCKTAIL SORT!?!?!!?
-# def bubble_sort_fast(items):
-#     """This is an extra version of bubble sort using swaps instead of is_sorted, 
-#     needs to be cocktail sort to pass all tests"""
-#     # use number of swaps instead of is_sorted
-#     swaps = 0
-#     while swaps < 2:
-#       # reset swaps before they occur
-#       swaps = 0
-#       sorted_spots = 1
-#       for index in range(len(items) - sorted_spots):
-#         if items[index] > items[index + 1]:
-#           # Swap adjacent items that are out of order
-#           items[index], items[index + 1] = items[index + 1], items[index]
-#           swaps += 1
-#           sorted_spots += 1
-#     return items
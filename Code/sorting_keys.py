@@ -0,0 +1,81 @@
+#!python
+
+
+def apply_sort(sort, items):
+    """Sort given items with the given sort function and return the sorted
+    items: the given items if it sorts them in place (whether it returns them
+    or None), or the new list it returns if it does not (like sorted)."""
+    result = sort(items)
+    return items if result is None else result
+
+
+def sort_by_key(sort, items, key=None, reverse=False, integer=False, low=0,
+                high=None):
+    """Sort given items in place with the given sort function, ordered by
+    the result of calling key on each item (or by the items themselves if
+    key is None), in descending order if reverse is True, and return them.
+    The key is called exactly once per item (see sort_by_keys).
+    If given, only the range `[low...high-1]` is sorted.
+    Running time: O(n) key calls, plus the sort function's running time
+    Memory usage: O(n) - keys and the order of items are stored in lists"""
+    if high is None:
+        high = len(items)
+    if key is None:
+        keys = list(items[low:high])
+    else:
+        keys = [key(items[index]) for index in range(low, high)]
+    return sort_by_keys(sort, items, keys, reverse, integer, low, high)
+
+
+def sort_by_keys(sort, items, keys, reverse=False, integer=False, low=0,
+                 high=None):
+    """Sort given items in place with the given sort function, ordered by the
+    given list of keys computed in advance (one per item, in the same order),
+    in descending order if reverse is True, and return them.
+    Items with equal keys keep their original order (even when reversed), no
+    matter whether the sort function is stable:
+    - Comparison sorts sort (key, index) pairs, which are all distinct, so
+      indexes only break ties between equal keys (negated if reversed, since
+      the sorted pairs are then reversed).
+    - Integer sorts (if integer is True) sort the keys alone, since they do
+      arithmetic on them, and each run of equal sorted keys is replaced by the
+      indexes of items with that key, in their original order.
+    If given, only the range `[low...high-1]` is sorted.
+    Running time: O(n) to decorate and undecorate, plus the sort function's
+    running time
+    Memory usage: O(n) - pairs (or keys) and the order of items"""
+    if high is None:
+        high = len(items)
+    if integer:
+        # Indexes of items by key, in their original order
+        positions = {}
+        for index, item_key in enumerate(keys):
+            positions.setdefault(item_key, []).append(index)
+        keys = apply_sort(sort, keys)
+        if reverse:
+            keys.reverse()
+        order = []
+        for item_key in keys:
+            # Only the first of each run of equal keys has its indexes left
+            indexes = positions.pop(item_key, None)
+            if indexes is not None:
+                order.extend(indexes)
+    else:
+        sign = -1 if reverse else 1
+        decorated = [(item_key, sign * index)
+                     for index, item_key in enumerate(keys)]
+        decorated = apply_sort(sort, decorated)
+        if reverse:
+            decorated.reverse()
+        order = [sign * index for _, index in decorated]
+    if isinstance(items, list):
+        originals = items[low:high]
+        items[low:high] = [originals[index] for index in order]
+        return items
+    # Typed buffers (array.array, memoryview) only take slices of their own
+    # type, and a memoryview's slices share its memory, so copy the items to
+    # a list and write them back one at a time
+    originals = list(items[low:high])
+    for offset, index in enumerate(order):
+        items[low + offset] = originals[index]
+    return items
@@ -0,0 +1,111 @@
+#!python
+
+from sorting import random_ints
+from sorting_keys import apply_sort, sort_by_key, sort_by_keys
+from sorting_registry import REGISTRY, auto_sort
+from sorting_recursive import merge_sort, quick_sort
+import unittest
+
+
+class SortByKeyTest(unittest.TestCase):
+
+    def test_sort_by_key(self):
+        items = ['pear', 'fig', 'banana', 'kiwi']
+        assert sort_by_key(merge_sort, items, key=len) is items
+        assert items == ['fig', 'pear', 'kiwi', 'banana']
+        sort_by_key(merge_sort, items, key=len, reverse=True)
+        assert items == ['banana', 'pear', 'kiwi', 'fig']
+        sort_by_key(merge_sort, items, reverse=True)
+        assert items == ['pear', 'kiwi', 'fig', 'banana']
+
+    def test_sort_by_key_range(self):
+        items = [5, 4, 3, 2, 1]
+        sort_by_key(merge_sort, items, key=lambda item: -item, low=1, high=4)
+        assert items == [5, 4, 3, 2, 1]
+        sort_by_key(merge_sort, items, low=1, high=4)
+        assert items == [5, 2, 3, 4, 1]
+
+    def test_apply_sort(self):
+        # In place, returning the items or None, or returning a new list
+        for sort in [merge_sort, quick_sort, sorted]:
+            items = [3, 1, 2]
+            assert apply_sort(sort, items) == [1, 2, 3]
+            if sort is not sorted:
+                assert apply_sort(sort, items) is items
+
+    def test_sort_by_keys_integer(self):
+        items = ['c', 'a', 'b', 'd']
+        sort_by_keys(sorted, items, [3, 1, 2, 1], integer=True)
+        assert items == ['a', 'd', 'b', 'c']
+        sort_by_keys(sorted, items, [1, 1, 2, 3], reverse=True, integer=True)
+        assert items == ['c', 'b', 'a', 'd']
+
+    def test_key_is_called_once_per_item(self):
+        calls = []
+
+        def key(item):
+            calls.append(item)
+            return item % 10
+        for name, engine in REGISTRY.items():
+            del calls[:]
+            items = random_ints(100, 1, 1000)
+            engine(items, key=key)
+            assert len(calls) == 100, name
+
+
+class StabilityTest(unittest.TestCase):
+
+    def records(self, size):
+        """Return a list of (key, original position) records with many
+        duplicate keys."""
+        return [(key, index) for index, key in
+                enumerate(random_ints(size, -5, 5))]
+
+    def test_every_engine_is_stable_with_key(self):
+        for name, engine in REGISTRY.items():
+            for size in [0, 1, 2, 10, 100]:
+                items = self.records(size)
+                expected = sorted(items, key=lambda record: record[0])
+                result = engine(items, key=lambda record: record[0])
+                assert result is items, name
+                assert items == expected, name
+
+    def test_every_engine_is_stable_in_reverse(self):
+        for name, engine in REGISTRY.items():
+            items = self.records(100)
+            expected = sorted(items, key=lambda record: record[0],
+                              reverse=True)
+            engine(items, key=lambda record: record[0], reverse=True)
+            assert items == expected, name
+            # Without a key, items themselves are compared
+            numbers = random_ints(50, 1, 10)
+            expected = sorted(numbers, reverse=True)
+            engine(numbers, reverse=True)
+            assert numbers == expected, name
+
+    def test_auto_sort_with_key(self):
+        for size in [10, 1000]:
+            for low, high in [(0, 100), (-10 ** 9, 10 ** 9)]:
+                items = [(key, index) for index, key in
+                         enumerate(random_ints(size, low, high))]
+                expected = sorted(items, key=lambda record: -record[0])
+                auto_sort(items, key=lambda record: -record[0])
+                assert items == expected
+        words = ['Banana', 'apple', 'cherry', 'Apple'] * 20
+        expected = sorted(words, key=str.lower, reverse=True)
+        auto_sort(words, key=str.lower, reverse=True)
+        assert words == expected
+
+    def test_items_are_never_compared(self):
+        # Items without an ordering can still be sorted by their keys
+        items = [object() for _ in range(100)]
+        keys = {item: number for item, number in
+                zip(items, random_ints(100, 1, 1000))}
+        for name, engine in REGISTRY.items():
+            shuffled = list(items)
+            engine(shuffled, key=keys.get)
+            assert shuffled == sorted(items, key=keys.get), name
+
+
+if __name__ == '__main__':
+    unittest.main()
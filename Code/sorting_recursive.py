@@ -1,5 +1,13 @@
 #!python
 
+import itertools
+from binaryheap import BinaryMinHeap
+from sorting_iterative import binary_insertion_sort, heap_sort
+from sorting_keys import sort_by_key
+
+# Like sorted(), every sort below accepts a key function and reverse flag, and
+# is stable when given either (see sorting_keys)
+
 def merge(items1, items2):
     """Merge given lists of items, each assumed to already be in sorted order,
     and return a new list containing all items in sorted order.
@@ -17,21 +25,57 @@ def merge(items1, items2):
       elif items1[i] > items2[j]:
         merged_list.append(items2[j])
         j+= 1
-    #  Append remaining items in non-empty list to new list
+    #  Append remaining items in non-empty list to new list in bulk
     if i < len(items1):
-      for index in range(i, len(items1)):
-        merged_list.append(items1[index])
+      merged_list.extend(itertools.islice(items1, i, None))
     else:
-      for index in range(j, len(items2)):
-        merged_list.append(items2[index])
+      merged_list.extend(itertools.islice(items2, j, None))
     return merged_list
 
-def split_sort_merge(items):
+# Marker returned by next() when an iterable in merge_iter is exhausted
+_EXHAUSTED = object()
+
+def merge_iter(*iterables, key=None):
+    """Lazily merge given iterables of items, each assumed to already be in
+    sorted order (by key, if given), and yield all items in sorted order.
+    Iterables may be generators, files, or other streams, and are only read
+    one item ahead. The next item of each iterable is kept in a binary min
+    heap as a (key, index, item) entry, so items themselves are never
+    compared and equal items come out in order of their iterables (stable).
+    Once only one iterable is left, its remaining items are yielded in bulk.
+    Running time: O(n*log(k)) for n items in k iterables
+    Memory usage: O(k) - one entry per iterable in the heap"""
+    iterators = [iter(iterable) for iterable in iterables]
+    heap = BinaryMinHeap()
+    for index, iterator in enumerate(iterators):
+      item = next(iterator, _EXHAUSTED)
+      if item is not _EXHAUSTED:
+        heap.insert((item if key is None else key(item), index, item))
+    #  Repeatedly yield minimum item and replace it with next item of its
+    #  iterable, or remove it if that iterable is exhausted
+    while heap.size() > 1:
+      index, item = heap.get_min()[1:]
+      yield item
+      item = next(iterators[index], _EXHAUSTED)
+      if item is _EXHAUSTED:
+        heap.delete_min()
+      else:
+        heap.replace_min((item if key is None else key(item), index, item))
+    if not heap.is_empty():
+      index, item = heap.get_min()[1:]
+      yield item
+      yield from iterators[index]
+
+def split_sort_merge(items, key=None, reverse=False):
     """Sort given items by splitting list into two approximately equal halves,
-    sorting each with an iterative sorting algorithm, and merging results into
-    a list in sorted order.
+    sorting each with merge sort, and merging results into a list in sorted
+    order.
+    Running time: O(n*log(n)) - under all conditions, each half is merge sorted
+                  in O(n*log(n)) time, then merged in O(n) time
     Memory usage: 2 new lists are created, resulting in O(n) memory usage, however the 
     sorted list to return happens in place"""
+    if key is not None or reverse:
+        return sort_by_key(split_sort_merge, items, key, reverse)
     if len(items) < 2: return items
     #  Split items list into approximately equal halves
     mid_i = len(items) // 2
@@ -44,12 +88,14 @@ def split_sort_merge(items):
 
 
 
-def merge_sort(items):
+def merge_sort(items, key=None, reverse=False):
     """Sort given items by splitting list into two approximately equal halves,
     sorting each recursively, and merging results into a list in sorted order.
     Running time: O(n*log(n)) - under all conditions, input is split in half log(n) times, then
                   sorted using merge taking n time
     Memory usage: O(n*log(n)) - under all conditions, array is split in half log(n) times"""
+    if key is not None or reverse:
+        return sort_by_key(merge_sort, items, key, reverse)
     #  Check if list is so small it's already sorted (base case)
     if len(items) <= 1: return items 
     #  Split items list into approximately equal halves
@@ -61,6 +107,64 @@ def merge_sort(items):
     return items
 
 
+def merge_sort_iterative(items, key=None, reverse=False):
+    """Sort given items bottom-up without recursion, by merging adjacent
+    sorted runs of width 1, 2, 4, ... until one run spans the whole list.
+    Running time: O(n*log(n)) - under all conditions, log(n) passes each merge
+                  n items, without the cost of a call frame per split
+    Memory usage: O(n) - each merge creates a list the size of its two runs"""
+    if key is not None or reverse:
+        return sort_by_key(merge_sort_iterative, items, key, reverse)
+    width = 1
+    while width < len(items):
+        #  Merge each pair of adjacent runs of this width (in place)
+        for start in range(0, len(items) - width, 2 * width):
+            middle, end = start + width, start + 2 * width
+            items[start:end] = merge(items[start:middle], items[middle:end])
+        width *= 2
+    return items
+
+
+def natural_merge_sort(items, key=None, reverse=False):
+    """Sort given items by splitting them into the runs that are already in
+    order (reversing strictly decreasing runs), then merging adjacent runs
+    pairwise until one run remains. Adapts to presorted input and is stable.
+    Running time: Best case O(n) - input is already sorted (or reversed)
+                  Worst case O(n*log(n)) - input has about n/2 runs, merged
+                  in log(n) passes
+    Memory usage: O(n) - runs are copied into new lists"""
+    if key is not None or reverse:
+        return sort_by_key(natural_merge_sort, items, key, reverse)
+    runs = []
+    start = 0
+    while start < len(items):
+      end = start + 1
+      if end < len(items) and items[end] < items[start]:
+        #  Find strictly decreasing run and reverse it (stable, no equal items)
+        while end < len(items) and items[end] < items[end - 1]:
+          end += 1
+        run = items[start:end]
+        run.reverse()
+      else:
+        #  Find nondecreasing run
+        while end < len(items) and not items[end] < items[end - 1]:
+          end += 1
+        run = items[start:end]
+      runs.append(run)
+      start = end
+    if not runs:
+      return items
+    #  Merge adjacent runs pairwise until one run remains
+    while len(runs) > 1:
+      merged = [merge(runs[index], runs[index + 1])
+                for index in range(0, len(runs) - 1, 2)]
+      if len(runs) % 2 == 1:
+        merged.append(runs[-1])
+      runs = merged
+    items[:] = runs[0]
+    return items
+
+
 def partition(items, low, high):
     """Return index `p` after in-place partitioning given items in range
     `[low...high]` by choosing a pivot (TODO: document your method here) from
@@ -90,12 +194,15 @@ def partition(items, low, high):
 
 
 
-def quick_sort(items, low=None, high=None):
+def quick_sort(items, low=None, high=None, key=None, reverse=False):
     """Sort given items in place by partitioning items in range `[low...high]`
     around a pivot item and recursively sorting each remaining sublist range.
     Best case running time: O(n*log(n)) - selected pivots are in the middle of desired range
     Worst case running time: O(n^2) - selected pivots are near min/max of range
     Memory usage: O(n) """
+    if key is not None or reverse:
+        return sort_by_key(quick_sort, items, key, reverse, low=low or 0,
+                           high=high)
     #  Check if list or range is so small it's already sorted (base case)
     #  Check if high and low range bounds have default values (not given)
     #  Select arbitrary pivot point (first item)
@@ -105,7 +212,7 @@ def quick_sort(items, low=None, high=None):
       high = len(items)
       low = 0
       quick_sort(items, low, high)
-      # return
+      return
     elif high - low == 0: return items
     #  Partition items in-place around a pivot and get index of pivot
     pivot = partition(items, low, high)
@@ -113,3 +220,82 @@ def quick_sort(items, low=None, high=None):
     # Sort each sublist range by recursively calling quick sort
     quick_sort(items, low, pivot)
     quick_sort(items, pivot + 1, high)
+
+
+def quick_sort_iterative(items, low=None, high=None, key=None, reverse=False):
+    """Sort given items in place like quick_sort, but keep the ranges left to
+    sort on an explicit stack instead of recursing, so degenerate inputs (such
+    as sorted lists, where each partition only removes the pivot) cannot
+    exceed the recursion limit. The larger range is pushed first so the
+    smaller one is sorted next, which keeps the stack at O(log n) ranges.
+    Best case running time: O(n*log(n)) - selected pivots are in the middle of desired range
+    Worst case running time: O(n^2) - selected pivots are near min/max of range
+    Memory usage: O(log n) - ranges waiting on the stack"""
+    if key is not None or reverse:
+        return sort_by_key(quick_sort_iterative, items, key, reverse, low=low or 0,
+                           high=high)
+    if low is None and high is None:
+        low, high = 0, len(items)
+    stack = [(low, high)]
+    while stack:
+        low, high = stack.pop()
+        #  Check if range is so small it's already sorted (base case)
+        if high - low <= 1:
+            continue
+        #  Partition items in-place around a pivot and get index of pivot
+        pivot = partition(items, low, high)
+        #  Push larger sublist range first so the smaller one is sorted next
+        if pivot - low < high - pivot - 1:
+            stack.append((pivot + 1, high))
+            stack.append((low, pivot))
+        else:
+            stack.append((low, pivot))
+            stack.append((pivot + 1, high))
+    return items
+
+
+# Ranges this small are sorted with binary insertion sort in intro_sort
+INSERTION_THRESHOLD = 16
+
+
+def intro_sort(items, low=None, high=None, key=None, reverse=False):
+    """Sort given items in place with introspective sort: quick sort with a
+    median-of-three pivot, switching to heap sort for any range that is
+    partitioned more than 2*log(n) times (so degenerate inputs cannot make
+    it quadratic) and to binary insertion sort for ranges of at most
+    INSERTION_THRESHOLD items. Ranges are kept on an explicit stack.
+    Running time: O(n*log(n)) in all cases
+    Memory usage: O(log n) - ranges waiting on the stack"""
+    if key is not None or reverse:
+        return sort_by_key(intro_sort, items, key, reverse, low=low or 0,
+                           high=high)
+    if low is None and high is None:
+        low, high = 0, len(items)
+    depth_limit = 2 * max(1, high - low).bit_length()
+    stack = [(low, high, depth_limit)]
+    while stack:
+        low, high, depth = stack.pop()
+        if high - low <= INSERTION_THRESHOLD:
+            binary_insertion_sort(items, low, high)
+            continue
+        if depth == 0:
+            heap_sort(items, low, high)
+            continue
+        #  Move median of first, middle, and last items to front as pivot
+        middle = (low + high - 1) // 2
+        first, last = items[low], items[high - 1]
+        mid_item = items[middle]
+        if first < mid_item:
+            median = middle if mid_item < last else (high - 1 if first < last else low)
+        else:
+            median = low if first < last else (high - 1 if mid_item < last else middle)
+        items[low], items[median] = items[median], items[low]
+        pivot = partition(items, low, high)
+        #  Push larger sublist range first so the smaller one is sorted next
+        if pivot - low < high - pivot - 1:
+            stack.append((pivot + 1, high, depth - 1))
+            stack.append((low, pivot, depth - 1))
+        else:
+            stack.append((low, pivot, depth - 1))
+            stack.append((pivot + 1, high, depth - 1))
+    return items
@@ -0,0 +1,176 @@
+#!python
+
+from sorting_iterative import (bubble_sort, bubble_sort_fast, cocktail_sort,
+                               selection_sort, insertion_sort,
+                               binary_insertion_sort, heap_sort)
+from sorting_recursive import (split_sort_merge, merge_sort, quick_sort,
+                               merge_sort_iterative, quick_sort_iterative,
+                               natural_merge_sort, intro_sort)
+from sorting_integer import counting_sort, bucket_sort, radix_sort
+from sorting_keys import sort_by_keys
+
+
+class SortEngine(object):
+    """SortEngine: a sort function with metadata describing its behavior,
+    used to list, look up, and choose between sorting algorithms by name."""
+
+    def __init__(self, function, stable, in_place, integer_only=False,
+                 numeric_only=False, buffers=False, best='O(n*log(n))', average='O(n*log(n))',
+                 worst='O(n*log(n))', memory='O(1)'):
+        """Initialize this engine with the given sort function, whether it
+        keeps equal items in their original order (stable; every engine is
+        stable when given a key or reverse flag), whether it sorts
+        its input without copying it (in place), whether it only sorts
+        integers, whether it only sorts numbers (it does arithmetic on them;
+        true of every integer-only engine), whether it can sort any mutable buffer such as an
+        array.array or typed memoryview (it only writes single items), and
+        its best, average, and worst case running time and memory usage."""
+        self.function = function
+        self.name = function.__name__
+        self.stable = stable
+        self.in_place = in_place
+        self.integer_only = integer_only
+        self.numeric_only = numeric_only or integer_only
+        self.buffers = buffers
+        self.best = best
+        self.average = average
+        self.worst = worst
+        self.memory = memory
+
+    def __repr__(self):
+        """Return a string representation of this sort engine."""
+        return 'SortEngine({!r})'.format(self.name)
+
+    def __call__(self, items, key=None, reverse=False):
+        """Sort the given items with this engine's function, by the given key
+        function and in reverse if given, and return them (or the new list
+        of sorted items, if this engine does not sort in place)."""
+        if key is None and not reverse:
+            result = self.function(items)
+        else:
+            result = self.function(items, key=key, reverse=reverse)
+        # Some in-place sorts (like quick_sort) return None
+        return items if self.in_place else result
+
+    def is_quadratic(self):
+        """Return True if this engine's average running time is O(n^2)."""
+        return self.average == 'O(n^2)'
+
+    def describe(self):
+        """Return a one-line summary of this engine's metadata."""
+        properties = [('stable' if self.stable else 'unstable'),
+                      ('in place' if self.in_place else 'copies')]
+        if self.integer_only:
+            properties.append('integers only')
+        elif self.numeric_only:
+            properties.append('numbers only')
+        if self.buffers:
+            properties.append('buffers')
+        return '{:22} best {:12} average {:12} worst {:12} memory {:10} {}'.format(
+            self.name, self.best, self.average, self.worst, self.memory,
+            ', '.join(properties))
+
+
+# Sort engines by name, in order from simplest to most sophisticated
+REGISTRY = {engine.name: engine for engine in [
+    SortEngine(bubble_sort, stable=True, in_place=True, buffers=True,
+               best='O(n)', average='O(n^2)', worst='O(n^2)'),
+    SortEngine(bubble_sort_fast, stable=True, in_place=True, buffers=True,
+               best='O(n)', average='O(n^2)', worst='O(n^2)'),
+    SortEngine(cocktail_sort, stable=True, in_place=True, buffers=True,
+               best='O(n)', average='O(n^2)', worst='O(n^2)'),
+    SortEngine(selection_sort, stable=False, in_place=True, buffers=True,
+               best='O(n^2)', average='O(n^2)', worst='O(n^2)'),
+    SortEngine(insertion_sort, stable=True, in_place=True, buffers=True,
+               best='O(n)', average='O(n^2)', worst='O(n^2)'),
+    SortEngine(binary_insertion_sort, stable=True, in_place=True, buffers=True,
+               best='O(n)', average='O(n^2)', worst='O(n^2)'),
+    SortEngine(heap_sort, stable=False, in_place=True, buffers=True),
+    SortEngine(split_sort_merge, stable=True, in_place=True, memory='O(n)'),
+    SortEngine(merge_sort, stable=True, in_place=True, memory='O(n)'),
+    SortEngine(merge_sort_iterative, stable=True, in_place=True,
+               memory='O(n)'),
+    SortEngine(natural_merge_sort, stable=True, in_place=True, best='O(n)',
+               memory='O(n)'),
+    SortEngine(quick_sort, stable=False, in_place=True, buffers=True,
+               worst='O(n^2)', memory='O(log(n))'),
+    SortEngine(quick_sort_iterative, stable=False, in_place=True, buffers=True,
+               worst='O(n^2)', memory='O(log(n))'),
+    SortEngine(intro_sort, stable=False, in_place=True, buffers=True,
+               memory='O(log(n))'),
+    SortEngine(counting_sort, stable=True, in_place=True, integer_only=True,
+               buffers=True, best='O(n+k)', average='O(n+k)', worst='O(n+k)',
+               memory='O(min(n,k))'),
+    SortEngine(radix_sort, stable=True, in_place=True, integer_only=True,
+               buffers=True, best='O(d*n)', average='O(d*n)', worst='O(d*n)',
+               memory='O(n)'),
+    SortEngine(bucket_sort, stable=True, in_place=True, numeric_only=True,
+               buffers=True, best='O(n)', average='O(n)', memory='O(n)'),
+]}
+
+
+def get_sort(name):
+    """Return the sort engine with the given name, or raise ValueError if
+    there is no such engine."""
+    if name not in REGISTRY:
+        raise ValueError('Unknown sort engine: {!r}'.format(name))
+    return REGISTRY[name]
+
+
+# Inputs of at most this many items are sorted with binary insertion sort,
+# the fastest quadratic sort on 16 to 64 items (see sorting_benchmark --small)
+SMALL_SIZE = 32
+# Number of adjacent pairs of items inspected when sampling an input
+SAMPLE_SIZE = 256
+# Inputs whose sampled pairs are in order at least this often are presorted
+PRESORTED_RATIO = 0.9
+
+
+def choose_sort(items):
+    """Return the name of the engine expected to sort the given items fastest,
+    judging by their size, how presorted a sample of adjacent pairs is (the
+    fraction of pairs in order or all in reverse order, which predicts few
+    runs), and whether they are all integers and how wide their range is.
+    Running time: O(n) to check the value type and range of all items"""
+    size = len(items)
+    if size <= SMALL_SIZE:
+        return 'binary_insertion_sort'
+    # Sample evenly spaced adjacent pairs to estimate the number of runs
+    step = max(1, (size - 1) // SAMPLE_SIZE)
+    ascending = descending = 0
+    for index in range(0, size - 1, step):
+        if items[index + 1] < items[index]:
+            descending += 1
+        elif items[index] < items[index + 1]:
+            ascending += 1
+    pairs = ascending + descending
+    if pairs == 0 or max(ascending, descending) >= PRESORTED_RATIO * pairs:
+        # Natural merge sort writes merged lists back, which buffers reject
+        if isinstance(items, list):
+            return 'natural_merge_sort'
+        return 'intro_sort'
+    # Integer sorts only apply if every item is an integer (but not a bool)
+    if all(type(item) is int for item in items):
+        if max(items) - min(items) <= 2 * size:
+            return 'counting_sort'
+        return 'radix_sort'
+    return 'intro_sort'
+
+
+def auto_sort(items, key=None, reverse=False):
+    """Sort the given items in place with the engine chosen by choose_sort,
+    by the given key function and in reverse if given, and return them.
+    With a key, the engine is chosen by the keys, which are computed once.
+    Running time: O(n) to choose, plus the chosen engine's running time"""
+    if key is not None or reverse:
+        keys = list(items) if key is None else [key(item) for item in items]
+        engine = REGISTRY[choose_sort(keys)]
+        return sort_by_keys(engine.function, items, keys, reverse,
+                            engine.integer_only)
+    # Every registered sort sorts its input in place
+    REGISTRY[choose_sort(items)](items)
+    return items
+
+
+REGISTRY['auto_sort'] = SortEngine(auto_sort, stable=False, in_place=True,
+                                   buffers=True, best='O(n)', memory='O(n)')
@@ -0,0 +1,158 @@
+#!python
+
+from sorting import random_ints
+from sorting_iterative import (heap_sort, insertion_sort, bubble_sort_fast,
+                               cocktail_sort, binary_insertion_sort)
+from sorting_recursive import natural_merge_sort, intro_sort
+from sorting_integer import radix_sort
+from sorting_registry import (REGISTRY, SMALL_SIZE, get_sort, choose_sort,
+                              auto_sort)
+import functools
+import unittest
+
+
+class NewSortTest(unittest.TestCase):
+
+    def test_sort_on_random_integers(self):
+        for sort in [heap_sort, natural_merge_sort, intro_sort, radix_sort]:
+            for size in [0, 1, 2, 3, 10, 17, 100, 1000]:
+                items = random_ints(size, -50, 50)
+                sorted_items = sorted(items)
+                assert sort(items) is items
+                assert items == sorted_items
+
+    def test_sort_on_presorted_integers(self):
+        for sort in [heap_sort, natural_merge_sort, intro_sort, radix_sort]:
+            for items in [list(range(500)), list(range(500, 0, -1)), [7] * 500,
+                          list(range(250)) + list(range(250, 0, -1))]:
+                sorted_items = sorted(items)
+                sort(items)
+                assert items == sorted_items
+
+    def test_sort_range(self):
+        items = [9, 8, 7, 6, 5, 4, 3, 2, 1]
+        insertion_sort(items, 2, 6)
+        assert items == [9, 8, 4, 5, 6, 7, 3, 2, 1]
+        heap_sort(items, 1, 8)
+        assert items == [9, 2, 3, 4, 5, 6, 7, 8, 1]
+
+    def test_natural_merge_sort_is_stable(self):
+        items = [(key, index) for index, key in enumerate(
+            random_ints(200, 1, 5))]
+        # Compare keys only, so equal keys must keep their original order
+        keyed = [KeyedItem(item) for item in items]
+        natural_merge_sort(keyed)
+        assert [item.item for item in keyed] == sorted(items)
+
+    def test_intro_sort_on_many_equal_items(self):
+        items = [1, 0] * 2000
+        intro_sort(items)
+        assert items == [0] * 2000 + [1] * 2000
+
+    def test_radix_sort_on_large_integers(self):
+        items = [10 ** 30, -10 ** 30, 0, 12345678901234567890, -1]
+        radix_sort(items)
+        assert items == sorted(items)
+
+
+class SmallSortTest(unittest.TestCase):
+
+    def test_sort_on_small_inputs(self):
+        for sort in [bubble_sort_fast, cocktail_sort, binary_insertion_sort]:
+            for size in range(70):
+                for items in [random_ints(size, 1, 10), list(range(size, 0, -1)),
+                              list(range(size)), list(range(1, size)) + [0]]:
+                    sorted_items = sorted(items)
+                    assert sort(items) is items
+                    assert items == sorted_items
+
+    def test_small_sorts_are_stable(self):
+        items = [(key, index) for index, key in enumerate(
+            random_ints(64, 1, 5))]
+        for sort in [bubble_sort_fast, cocktail_sort, binary_insertion_sort]:
+            keyed = [KeyedItem(item) for item in items]
+            sort(keyed)
+            assert [item.item for item in keyed] == sorted(items)
+
+    def test_binary_insertion_sort_range(self):
+        items = [9, 8, 7, 6, 5, 4, 3, 2, 1]
+        binary_insertion_sort(items, 2, 6)
+        assert items == [9, 8, 4, 5, 6, 7, 3, 2, 1]
+
+    def test_bubble_sort_fast_stops_early(self):
+        from sortstats import measure
+        # Sorted input takes one sweep with no swaps
+        _, stats = measure(bubble_sort_fast, list(range(64)))
+        assert stats.comparisons == 63
+        # One item out of place at the end takes one sweep forward and one
+        # backward for cocktail sort, but n sweeps for bubble sort
+        items = list(range(1, 64)) + [0]
+        _, slow = measure(bubble_sort_fast, items)
+        _, fast = measure(cocktail_sort, items)
+        assert fast.comparisons < slow.comparisons // 10
+
+
+@functools.total_ordering
+class KeyedItem(object):
+    """Item compared only by the first element of its tuple."""
+
+    def __init__(self, item):
+        self.item = item
+
+    def __lt__(self, other):
+        return self.item[0] < other.item[0]
+
+    def __eq__(self, other):
+        return self.item[0] == other.item[0]
+
+
+class RegistryTest(unittest.TestCase):
+
+    def test_get_sort(self):
+        engine = get_sort('intro_sort')
+        assert engine.function is intro_sort
+        assert engine.stable is False
+        assert engine.in_place is True
+        assert get_sort('counting_sort').integer_only is True
+        assert get_sort('counting_sort').numeric_only is True
+        assert get_sort('bucket_sort').integer_only is False
+        assert get_sort('bucket_sort').numeric_only is True
+        with self.assertRaises(ValueError):
+            get_sort('magic_sort')
+
+    def test_every_engine_sorts(self):
+        for name, engine in REGISTRY.items():
+            items = random_ints(50, 1, 20)
+            sorted_items = sorted(items)
+            result = engine(items)
+            if engine.in_place:
+                assert result is items, name
+            else:
+                items = result
+            assert items == sorted_items, name
+
+    def test_choose_sort(self):
+        assert choose_sort(random_ints(SMALL_SIZE, 1, 10 ** 6)) == \
+            'binary_insertion_sort'
+        assert choose_sort(list(range(1000))) == 'natural_merge_sort'
+        assert choose_sort(list(range(1000, 0, -1))) == 'natural_merge_sort'
+        assert choose_sort([5] * 1000) == 'natural_merge_sort'
+        assert choose_sort(random_ints(1000, 1, 100)) == 'counting_sort'
+        assert choose_sort(random_ints(1000, 1, 10 ** 9)) == 'radix_sort'
+        assert choose_sort([str(item) for item in
+                            random_ints(1000, 1, 10 ** 9)]) == 'intro_sort'
+        floats = [item / 7 for item in random_ints(1000, 1, 100)]
+        assert choose_sort(floats) == 'intro_sort'
+
+    def test_auto_sort(self):
+        cases = [[], [1], random_ints(10, 1, 5), list(range(1000, 0, -1)),
+                 random_ints(1000, 1, 100), random_ints(1000, -10 ** 9, 10 ** 9),
+                 [str(item) for item in random_ints(1000, 1, 10 ** 6)]]
+        for items in cases:
+            sorted_items = sorted(items)
+            assert auto_sort(items) is items
+            assert items == sorted_items
+
+
+if __name__ == '__main__':
+    unittest.main()
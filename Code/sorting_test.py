@@ -3,8 +3,9 @@
 import random
 from sorting import random_ints
 from sorting_iterative import is_sorted, bubble_sort, selection_sort, insertion_sort
-from sorting_recursive import split_sort_merge, merge_sort, quick_sort, merge
-from sorting_integer import counting_sort, bucket_sort
+from sorting_recursive import split_sort_merge, merge_sort, quick_sort, merge, merge_iter
+from sorting_recursive import merge_sort_iterative, quick_sort_iterative
+from sorting_integer import counting_sort, counting_sort_records, bucket_sort
 import unittest
 
 class MergeTest(unittest.TestCase):
@@ -27,6 +28,39 @@ class MergeTest(unittest.TestCase):
         #  Implemented  more tests in the integer and string sort classes
         pass
 
+class MergeIterTest(unittest.TestCase):
+
+    def test_merge_iter(self):
+        assert list(merge_iter()) == []
+        assert list(merge_iter([], [])) == []
+        assert list(merge_iter([1, 3, 5])) == [1, 3, 5]
+        assert list(merge_iter([1, 4], [2, 5], [3, 6])) == [1, 2, 3, 4, 5, 6]
+        assert list(merge_iter(iter([1, 2]), (x for x in [0, 3]), [])) == \
+            [0, 1, 2, 3]
+
+    def test_merge_iter_many_random_lists(self):
+        lists = [sorted(random_ints(random.randint(0, 30), 1, 50))
+                 for _ in range(20)]
+        expected = sorted(item for items in lists for item in items)
+        assert list(merge_iter(*lists)) == expected
+
+    def test_merge_iter_key_is_stable(self):
+        words1 = ['a', 'bb', 'cc', 'dddd']
+        words2 = ['B', 'AA', 'CCC']
+        merged = list(merge_iter(words1, words2, key=len))
+        assert merged == ['a', 'B', 'bb', 'cc', 'AA', 'CCC', 'dddd']
+        # Items themselves are never compared
+        items = [[object(), object()], [object()]]
+        assert len(list(merge_iter(*items, key=lambda item: 0))) == 3
+
+    def test_merge_iter_is_lazy(self):
+        import itertools
+        evens = itertools.count(0, 2)  # Infinite iterators
+        odds = itertools.count(1, 2)
+        merged = merge_iter(evens, odds)
+        assert list(itertools.islice(merged, 7)) == [0, 1, 2, 3, 4, 5, 6]
+
+
 class IsSortedTest(unittest.TestCase):
 
     def test_is_sorted_on_sorted_integers(self):
@@ -213,6 +247,69 @@ class StringSortTest(unittest.TestCase):
         assert items == sorted_items
 
 
+class StackSafeSortTest(unittest.TestCase):
+
+    def test_sort_on_random_integers(self):
+        for stack_safe_sort in [merge_sort_iterative, quick_sort_iterative]:
+            for size in [0, 1, 2, 3, 10, 33, 100]:
+                items = random_ints(size, 1, 20)
+                sorted_items = sorted(items)
+                stack_safe_sort(items)
+                assert items == sorted_items
+
+    def test_sort_deeper_than_recursion_limit(self):
+        import sys
+        size = sys.getrecursionlimit() * 2
+        # Sorted and reversed input make every partition as uneven as possible
+        for items in [list(range(size)), list(range(size, 0, -1))]:
+            sorted_items = sorted(items)
+            quick_sort_iterative(items)
+            assert items == sorted_items
+        items = random_ints(size * 10, 1, 1000)
+        sorted_items = sorted(items)
+        merge_sort_iterative(items)
+        assert items == sorted_items
+
+
+class CountingSortTest(unittest.TestCase):
+
+    def test_counting_sort_in_place(self):
+        for size in [0, 1, 2, 10, 100]:
+            items = random_ints(size, -20, 20)
+            sorted_items = sorted(items)
+            assert counting_sort(items) is items
+            assert items == sorted_items
+            counting_sort(items, reverse=True)
+            assert items == sorted_items[::-1]
+
+    def test_counting_sort_on_sparse_range(self):
+        # Counting every value in this range would take far too much memory
+        items = [10 ** 18, -10 ** 18, 5, 0, 5, 10 ** 12, -3]
+        counting_sort(items)
+        assert items == [-10 ** 18, -3, 0, 5, 5, 10 ** 12, 10 ** 18]
+        counting_sort(items, reverse=True)
+        assert items == [10 ** 18, 10 ** 12, 5, 5, 0, -3, -10 ** 18]
+
+    def test_counting_sort_array(self):
+        from array import array
+        items = array('q', [3, -1, 2, -1, 0])
+        counting_sort(items)
+        assert items == array('q', [-1, -1, 0, 2, 3])
+
+    def test_counting_sort_records_is_stable(self):
+        for low, high in [(-5, 5), (-10 ** 9, 10 ** 9)]:
+            keys = random_ints(100, low, high) * 2
+            records = [(key, index) for index, key in enumerate(keys)]
+            expected = sorted(records, key=lambda record: record[0])
+            assert counting_sort_records(records, lambda record: record[0]) \
+                is records
+            assert records == expected
+            expected = sorted(records, key=lambda record: record[0],
+                              reverse=True)
+            counting_sort(records, key=lambda record: record[0], reverse=True)
+            assert records == expected
+
+
 def get_sort_function():
     """Read command-line argument and return sort function with that name."""
     import sys
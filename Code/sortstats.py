@@ -0,0 +1,226 @@
+#!python
+
+import sys
+import time
+import tracemalloc
+
+from sorting_keys import apply_sort
+
+
+# Helper functions whose calls are timed as phases of the sorts that use them,
+# as (module name, function name) pairs
+PHASES = [
+    ('sorting_recursive', 'merge'),
+    ('sorting_recursive', 'partition'),
+]
+
+
+class SortStats(object):
+    """SortStats: counts of the work a sorting algorithm did on one input,
+    collected by running it on instrumented items and with temporarily
+    wrapped functions (see measure), so the sorting algorithms themselves are
+    unchanged and cost nothing extra when they are not being measured."""
+
+    def __init__(self):
+        """Initialize all counts to zero."""
+        # Number of comparisons between items, or None if items could not be
+        # wrapped for counting (integer sorts do arithmetic on items)
+        self.comparisons = 0
+        # Number of items written into the list being sorted
+        self.writes = 0
+        # Number of lists allocated by slicing the list being sorted
+        self.allocations = 0
+        # Number of calls to the sort function (more than 1 if recursive),
+        # and the deepest nesting of those calls
+        self.calls = 0
+        self.max_depth = 0
+        self.depth = 0
+        # Seconds spent and calls made in each phase helper, by name
+        self.phase_seconds = {}
+        self.phase_calls = {}
+        # Total seconds and peak bytes of memory allocated while sorting
+        self.seconds = 0.0
+        self.peak_bytes = None
+
+    def __repr__(self):
+        """Return a string representation of these statistics."""
+        return 'SortStats({})'.format(', '.join(
+            '{}={!r}'.format(name, value) for name, value in self.as_dict().items()))
+
+    def as_dict(self):
+        """Return a dictionary of these statistics by name."""
+        stats = dict(vars(self))
+        del stats['depth']  # Only meaningful while sorting
+        return stats
+
+    def report(self):
+        """Return a multi-line, human-readable report of these statistics."""
+        lines = ['Comparisons:   {}'.format('n/a' if self.comparisons is None
+                                            else self.comparisons),
+                 'Writes:        {}'.format(self.writes),
+                 'Allocations:   {}'.format(self.allocations),
+                 'Calls:         {}'.format(self.calls),
+                 'Max depth:     {}'.format(self.max_depth),
+                 'Total time:    {:.6f} sec'.format(self.seconds)]
+        for phase, seconds in self.phase_seconds.items():
+            if not self.phase_calls[phase]:
+                continue
+            lines.append('{:15}{:.6f} sec in {} calls'.format(
+                phase.capitalize() + ':', seconds, self.phase_calls[phase]))
+        if self.peak_bytes is not None:
+            lines.append('Peak memory:   {} bytes'.format(self.peak_bytes))
+        return '\n'.join(lines)
+
+
+class CountedItem(object):
+    """CountedItem: a wrapper around an item that counts every comparison
+    made between wrapped items in a shared SortStats object."""
+
+    __slots__ = ('value', 'stats')
+
+    def __init__(self, value, stats):
+        """Initialize this wrapper with the given item and statistics."""
+        self.value = value
+        self.stats = stats
+
+    def __repr__(self):
+        """Return a string representation of the wrapped item."""
+        return repr(self.value)
+
+    def __lt__(self, other):
+        self.stats.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        self.stats.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        self.stats.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        self.stats.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        self.stats.comparisons += 1
+        return self.value == other.value
+
+    def __ne__(self, other):
+        self.stats.comparisons += 1
+        return self.value != other.value
+
+    __hash__ = None
+
+
+class CountingList(list):
+    """CountingList: a list that counts every item written into it by index
+    or slice assignment in a SortStats object, as writes (swaps count as
+    two writes), and every slice taken from it as an allocation. Slices of a
+    counting list are counting lists too, so sorts that split their input
+    keep counting."""
+
+    def __init__(self, items, stats):
+        """Initialize this list with the given items and statistics."""
+        super().__init__(items)
+        self.stats = stats
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.stats.writes += len(value)
+        else:
+            self.stats.writes += 1
+        super().__setitem__(index, value)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self.stats.allocations += 1
+            return CountingList(super().__getitem__(index), self.stats)
+        return super().__getitem__(index)
+
+
+def track_calls(function, stats):
+    """Return a wrapper around the given function that counts its calls and
+    their nesting depth in the given SortStats object."""
+    def tracked(*args, **kwargs):
+        stats.calls += 1
+        stats.depth += 1
+        if stats.depth > stats.max_depth:
+            stats.max_depth = stats.depth
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.depth -= 1
+    return tracked
+
+
+def time_phase(function, name, stats):
+    """Return a wrapper around the given function that adds the time spent
+    in its calls to the given SortStats object's phase with the given name."""
+    stats.phase_seconds.setdefault(name, 0.0)
+    stats.phase_calls.setdefault(name, 0)
+
+    def timed(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.phase_seconds[name] += time.perf_counter() - start_time
+            stats.phase_calls[name] += 1
+    return timed
+
+
+def measure(sort, items, count_comparisons=None, trace_memory=False):
+    """Run the given sort function on a counting copy of the given items and
+    return a pair of the sorted list of items and the SortStats collected.
+    While it runs, the sort function's own module-level name is replaced by a
+    wrapper that tracks its recursive calls, and each helper in PHASES by a
+    wrapper that times it; the original functions are restored afterward.
+    If count_comparisons is False, items are not wrapped (integer sorts need
+    the items themselves) and comparisons are reported as None; if it is
+    None, items are wrapped unless the sort raises TypeError on them.
+    If trace_memory is True, peak memory allocated is traced too."""
+    if count_comparisons is None:
+        try:
+            return measure(sort, items, True, trace_memory)
+        except TypeError:
+            return measure(sort, items, False, trace_memory)
+    stats = SortStats()
+    if count_comparisons:
+        instrumented = CountingList([CountedItem(item, stats) for item in items],
+                                    stats)
+    else:
+        stats.comparisons = None
+        instrumented = CountingList(items, stats)
+    # Replace module-level functions with wrappers, remembering the originals
+    patches = []
+    module = sys.modules.get(sort.__module__)
+    if module is not None and getattr(module, sort.__name__, None) is sort:
+        patches.append((module, sort.__name__, sort))
+        setattr(module, sort.__name__, track_calls(sort, stats))
+    for module_name, name in PHASES:
+        module = sys.modules.get(module_name)
+        if module is not None and hasattr(module, name):
+            function = getattr(module, name)
+            patches.append((module, name, function))
+            setattr(module, name, time_phase(function, name, stats))
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start_time = time.perf_counter()
+        # Call the wrapper (if any) so the outermost call is tracked too
+        result = apply_sort(getattr(sys.modules.get(sort.__module__),
+                                    sort.__name__, sort), instrumented)
+        stats.seconds = time.perf_counter() - start_time
+        if trace_memory:
+            stats.peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        for module, name, function in reversed(patches):
+            setattr(module, name, function)
+    if count_comparisons:
+        result = [item.value for item in result]
+    return list(result), stats
@@ -0,0 +1,270 @@
+#!python3
+
+from array import array
+from bisect import bisect_right
+
+from boundedtopk import BoundedTopK
+from sorting_integer import counting_sort
+
+
+def build_suffix_array(text, separator=None):
+    """Return an array of the starting positions of all suffixes of the given
+    text in sorted order, built by prefix doubling: suffixes are first ranked
+    by their first character, then each round sorts them by the pair of ranks
+    of their first k characters and the k characters after those, which ranks
+    them by their first 2k characters, until all ranks are distinct.
+    Each round is one stable counting sort (with the project's counting_sort)
+    by the first rank, of suffixes already in order of their second rank,
+    which is read off the previous round's order.
+    If a separator character is given, each occurrence of it ranks below all
+    other characters and below later occurrences, so comparisons never look
+    past a separator and the number of rounds depends only on the longest
+    stretch of text between separators.
+    Running time: O(n log L) for n characters with at most L between
+    separators (or L = n without them)
+    Memory usage: O(n) for ranks and positions"""
+    n = len(text)
+    if n == 0:
+        return array('q')
+    # Rank separators 1, 2, 3, ... by position, then other characters by order
+    num_separators = text.count(separator) if separator is not None else 0
+    characters = sorted(set(text) - {separator})
+    char_ranks = {char: num_separators + 1 + index
+                  for index, char in enumerate(characters)}
+    rank = [0] * n
+    count = 0
+    for index, char in enumerate(text):
+        if char == separator:
+            count += 1
+            rank[index] = count
+        else:
+            rank[index] = char_ranks[char]
+    positions = list(range(n))
+    counting_sort(positions, key=rank.__getitem__)
+    k = 1
+    while True:
+        # Order by second rank: suffixes with nothing k characters later have
+        # the lowest, then the rest in order of the suffix k characters later
+        second = list(range(n - k, n))
+        second.extend(position - k for position in positions if position >= k)
+        positions = counting_sort(second, key=rank.__getitem__)
+        # Rank suffixes by their first 2k characters, in sorted order
+        new_rank = [0] * n
+        classes = 0
+        previous = None
+        for position in positions:
+            pair = (rank[position],
+                    rank[position + k] if position + k < n else 0)
+            if pair != previous:
+                classes += 1
+                previous = pair
+            new_rank[position] = classes
+        rank = new_rank
+        if classes == n:
+            break
+        k *= 2
+    return array('q', positions)
+
+
+def build_lcp_array(text, suffixes, separator=None):
+    """Return an array whose item at each index is the length of the longest
+    common prefix of the suffixes of the given text at that index and the one
+    before it in the given suffix array (and 0 at index 0), computed with
+    Kasai's algorithm: visiting suffixes in order of position, the common
+    prefix with the previous suffix in sorted order shrinks by at most one
+    character each step, so it is never compared again from the start.
+    If a separator is given, common prefixes stop before it.
+    Running time: O(n) for n characters
+    Memory usage: O(n) for the inverse of the suffix array"""
+    n = len(text)
+    lcp = array('q', [0]) * n
+    rank = array('q', [0]) * n
+    for index, position in enumerate(suffixes):
+        rank[position] = index
+    common = 0
+    for position in range(n):
+        index = rank[position]
+        if index == 0:
+            common = 0
+            continue
+        previous = suffixes[index - 1]
+        while (position + common < n and previous + common < n and
+               text[position + common] == text[previous + common] and
+               text[position + common] != separator):
+            common += 1
+        lcp[index] = common
+        if common > 0:
+            common -= 1
+    return lcp
+
+
+class SuffixArray:
+    """SuffixArray: An index of a vocabulary of strings that finds every
+    string containing a given query string anywhere in it (not only at its
+    start, like a prefix tree). The strings are concatenated, each followed
+    by a separator, and the starting positions of all suffixes of that text
+    are stored in sorted order (the suffix array), so the suffixes that start
+    with a query are in one contiguous range, found by binary search. An LCP
+    array holds the length of the common prefix of each pair of adjacent
+    suffixes, so the end of that range is found by scanning integers.
+    Running time: O(n log L) to build for n total characters and strings of
+    at most L characters, O(m log n) to find the range of a query of length
+    m, plus O(r) to scan r results
+    Memory usage: O(n) - two arrays of 8-byte integers, and the text"""
+
+    # Character joining strings in the text, which strings must not contain
+    SEPARATOR = '\x00'
+
+    def __init__(self, vocabulary, weights=None):
+        """Initialize this suffix array with the given list of strings, and
+        optionally a list of their weights (such as frequencies, where larger
+        is better) for ranking in top_k. Raise ValueError if any string
+        contains the separator character."""
+        self.words = list(vocabulary)
+        self.weights = list(weights) if weights is not None else None
+        if self.weights is not None and len(self.weights) != len(self.words):
+            raise ValueError('Expected {} weights, got {}'.format(
+                len(self.words), len(self.weights)))
+        # Starting position of each string in the text
+        self.starts = array('q')
+        position = 0
+        for word in self.words:
+            if SuffixArray.SEPARATOR in word:
+                raise ValueError('String contains separator: {!r}'.format(word))
+            self.starts.append(position)
+            position += len(word) + 1
+        self.text = ''.join(word + SuffixArray.SEPARATOR for word in self.words)
+        self.suffixes = build_suffix_array(self.text, SuffixArray.SEPARATOR)
+        self.lcp = build_lcp_array(self.text, self.suffixes,
+                                   SuffixArray.SEPARATOR)
+
+    def __repr__(self):
+        """Return a string representation of this suffix array."""
+        return 'SuffixArray({} strings, {} characters)'.format(
+            len(self.words), len(self.text))
+
+    def _lower_bound(self, query):
+        """Return the index of the first suffix in sorted order whose first
+        len(query) characters are not less than the given query.
+        Running time: O(m log n) for a query of length m"""
+        text = self.text
+        suffixes = self.suffixes
+        length = len(query)
+        low, high = 0, len(suffixes)
+        while low < high:
+            middle = (low + high) // 2
+            position = suffixes[middle]
+            if text[position:position + length] < query:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _match_range(self, query):
+        """Return the range of indices of suffixes in sorted order that start
+        with the given non-empty query, which is empty if none do. The start is
+        found by binary search, then the end by scanning the LCP array for the
+        adjacent suffixes that share at least the whole query."""
+        start = self._lower_bound(query)
+        if start == len(self.suffixes) or not self.text.startswith(
+                query, self.suffixes[start]):
+            return range(start, start)
+        end = start + 1
+        while end < len(self.lcp) and self.lcp[end] >= len(query):
+            end += 1
+        return range(start, end)
+
+    def _matches(self, query):
+        """Yield a pair of the index of a string containing the given query
+        and the query's offset in it, for each occurrence of the query."""
+        if SuffixArray.SEPARATOR in query:
+            return  # Never contained in any string
+        if len(query) == 0:
+            for index in range(len(self.words)):
+                yield index, 0
+            return
+        for position in (self.suffixes[index] for index in
+                         self._match_range(query)):
+            index = bisect_right(self.starts, position) - 1
+            yield index, position - self.starts[index]
+
+    def count(self, query):
+        """Return the number of occurrences of the given query in all strings,
+        counting each string once per occurrence.
+        Running time: O(m log n) for a query of length m, plus the number of
+        occurrences"""
+        return sum(1 for _ in self._matches(query))
+
+    def search(self, query):
+        """Return a list of all strings that contain the given query, in the
+        order of the vocabulary, with each string once.
+        Running time: O(m log n + r log r) for a query of length m occurring
+        r times"""
+        if SuffixArray.SEPARATOR in query:
+            return []
+        if len(query) == 0:
+            return list(self.words)
+        starts = self.starts
+        suffixes = self.suffixes
+        indexes = sorted(set(bisect_right(starts, suffixes[index]) - 1
+                             for index in self._match_range(query)))
+        return [self.words[index] for index in indexes]
+
+    def top_k(self, query, k=10):
+        """Return a list of the k best strings that contain the given query,
+        best first: by weight if weights were given, then those containing
+        the query nearest their start (so prefix matches come first), then
+        shorter strings, then earlier strings in the vocabulary.
+        Running time: O(m log n + r log k) for a query of length m occurring
+        r times
+        Memory usage: O(k) for the best strings so far"""
+        best = {}
+        for index, offset in self._matches(query):
+            # Keep the occurrence nearest the start of each string
+            if best.get(index, offset + 1) > offset:
+                best[index] = offset
+        top = BoundedTopK(k)
+        for index, offset in best.items():
+            weight = self.weights[index] if self.weights is not None else 0
+            top.offer((weight, -offset, -len(self.words[index]), -index))
+        return [self.words[-score[-1]] for score in top.items()]
+
+
+def benchmark_search(vocabulary, num_queries=200, query_length=5):
+    """Compare the time to find all strings in the given vocabulary that
+    contain random infixes of its strings with linear search and with a
+    suffix array, after timing the suffix array's construction."""
+    import random
+    import time
+    start_time = time.perf_counter()
+    index = SuffixArray(vocabulary)
+    build_time = time.perf_counter() - start_time
+    queries = []
+    for word in random.sample(vocabulary, min(num_queries, len(vocabulary))):
+        start = random.randrange(max(1, len(word) - query_length + 1))
+        queries.append(word[start:start + query_length])
+    start_time = time.perf_counter()
+    linear_results = [[word for word in vocabulary if query in word]
+                      for query in queries]
+    linear_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    index_results = [index.search(query) for query in queries]
+    index_time = time.perf_counter() - start_time
+    assert index_results == linear_results
+    print('Vocabulary size: {}, {} characters'.format(len(vocabulary),
+                                                       len(index.text)))
+    print('Suffix array build time: {:.4f} sec'.format(build_time))
+    print('{} infix queries, {} results'.format(
+        len(queries), sum(len(results) for results in index_results)))
+    print('Linear search time:      {:.4f} sec'.format(linear_time))
+    print('Suffix array time:       {:.4f} sec'.format(index_time))
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) > 1:
+        from autocomplete import get_lines
+        benchmark_search([line for line in get_lines(sys.argv[1]) if line])
+    else:
+        from radixtree import generate_words
+        benchmark_search(generate_words(50000))
@@ -0,0 +1,106 @@
+#!python3
+
+from suffixarray import SuffixArray, build_suffix_array, build_lcp_array
+import os
+import random
+import unittest
+
+
+class BuildSuffixArrayTest(unittest.TestCase):
+
+    def test_banana(self):
+        suffixes = build_suffix_array('banana')
+        # a, ana, anana, banana, na, nana
+        assert list(suffixes) == [5, 3, 1, 0, 4, 2]
+        assert list(build_lcp_array('banana', suffixes)) == [0, 1, 3, 0, 0, 2]
+        assert list(build_suffix_array('')) == []
+
+    def test_matches_sorted_suffixes(self):
+        for _ in range(200):
+            text = ''.join(random.choice('abc') for _ in
+                           range(random.randint(1, 40)))
+            expected = sorted(range(len(text)), key=lambda index: text[index:])
+            suffixes = build_suffix_array(text)
+            assert list(suffixes) == expected
+            lcp = build_lcp_array(text, suffixes)
+            for index in range(1, len(text)):
+                assert lcp[index] == len(os.path.commonprefix(
+                    [text[suffixes[index - 1]:], text[suffixes[index]:]]))
+
+    def test_separators_end_comparisons(self):
+        for _ in range(200):
+            words = [''.join(random.choice('ab') for _ in
+                             range(random.randint(0, 6)))
+                     for _ in range(random.randint(1, 10))]
+            text = ''.join(word + '|' for word in words)
+
+            def key(index):
+                """Sort by text up to the next separator, then position."""
+                return text[index:text.index('|', index)], index
+            suffixes = build_suffix_array(text, '|')
+            assert list(suffixes) == sorted(range(len(text)), key=key)
+            lcp = build_lcp_array(text, suffixes, '|')
+            for index in range(1, len(text)):
+                assert lcp[index] == len(os.path.commonprefix(
+                    [key(suffixes[index - 1])[0], key(suffixes[index])[0]]))
+
+
+class SuffixArrayTest(unittest.TestCase):
+
+    def test_search(self):
+        words = ['phone', 'smartphone', 'telephones', 'photo', 'xylophone']
+        index = SuffixArray(words)
+        assert index.search('phone') == ['phone', 'smartphone', 'telephones',
+                                         'xylophone']
+        assert index.search('pho') == ['phone', 'smartphone', 'telephones',
+                                       'photo', 'xylophone']
+        assert index.search('ph') == index.search('pho')
+        assert index.search('phones') == ['telephones']
+        assert index.search('zz') == []
+        assert index.search('') == words
+        # Matches never span two strings
+        assert index.search('ephonesx') == []
+        assert index.search('photox') == []
+
+    def test_count(self):
+        index = SuffixArray(['banana', 'bandana', 'cab'])
+        assert index.count('an') == 4
+        assert index.count('ana') == 3
+        assert index.count('ab') == 1
+        assert index.count('nab') == 0
+
+    def test_top_k(self):
+        words = ['xylophone', 'phones', 'smartphone', 'phone', 'headphone']
+        index = SuffixArray(words)
+        # Prefix matches first, then matches nearest the start, then shorter
+        assert index.top_k('phone', 3) == ['phone', 'phones', 'xylophone']
+        assert index.top_k('phone', 10) == ['phone', 'phones', 'xylophone',
+                                            'headphone', 'smartphone']
+        weighted = SuffixArray(words, weights=[5, 1, 3, 1, 0])
+        assert weighted.top_k('phone', 2) == ['xylophone', 'smartphone']
+        assert index.top_k('zz', 3) == []
+        with self.assertRaises(ValueError):
+            SuffixArray(words, weights=[1])
+
+    def test_matches_linear_search(self):
+        words = [''.join(random.choice('abcd') for _ in
+                         range(random.randint(0, 8))) for _ in range(300)]
+        index = SuffixArray(words)
+        for _ in range(100):
+            query = ''.join(random.choice('abcd') for _ in
+                            range(random.randint(1, 4)))
+            expected = [word for word in words if query in word]
+            assert index.search(query) == expected
+            # Occurrences may overlap
+            assert index.count(query) == sum(
+                word.startswith(query, start) for word in words
+                for start in range(len(word)))
+
+    def test_separator_in_string(self):
+        with self.assertRaises(ValueError):
+            SuffixArray(['a\x00b'])
+        assert SuffixArray(['ab']).search('\x00') == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,272 @@
+#!python
+
+from binaryheap import BinaryMinHeap
+
+
+class TimerHandle(object):
+    """TimerHandle: a timer scheduled in a timing wheel, which is returned by
+    schedule so the timer can be cancelled before it is due.
+    Handles use __slots__ because a wheel may hold millions of them."""
+
+    __slots__ = ('item', 'at', 'seq', 'tick', 'active', 'bucket', 'level')
+
+    def __init__(self, item, at, seq, tick):
+        """Initialize this handle with the given item, deadline, sequence number
+        (to break ties between equal deadlines), and tick of the deadline."""
+        self.item = item
+        self.at = at
+        self.seq = seq
+        self.tick = tick
+        # True until this timer is popped as due or cancelled
+        self.active = True
+        # Bucket and wheel level holding this timer, or None if in overflow heap
+        self.bucket = None
+        self.level = None
+
+    def __repr__(self):
+        """Return a string representation of this timer handle."""
+        return 'TimerHandle({!r}, at={!r})'.format(self.item, self.at)
+
+
+class TimingWheel(object):
+    """TimingWheel: a hierarchical timing wheel that schedules items to become
+    due at given times. Time is divided into ticks of the given resolution.
+    Level 0 has one bucket per tick for the next wheel_size ticks, and each
+    higher level has buckets that span wheel_size times as many ticks. As time
+    advances, a higher level bucket is cascaded into lower levels when its span
+    begins. Timers beyond the top level are kept in a binary min heap and moved
+    into the wheel when they come within its range.
+    Scheduling and cancelling take O(1) time for timers within the wheel's
+    range, and each timer is cascaded at most once per level."""
+
+    def __init__(self, resolution=1.0, wheel_size=256, num_levels=4, start=0):
+        """Initialize this timing wheel with the given tick resolution (time
+        per tick), number of buckets per level, number of levels, and start
+        time."""
+        if wheel_size < 2 or num_levels < 1:
+            raise ValueError('Timing wheel needs wheel_size >= 2 and '
+                             'num_levels >= 1')
+        self.resolution = resolution
+        self.wheel_size = wheel_size
+        self.num_levels = num_levels
+        # Number of ticks spanned by one bucket at each level, and the range
+        # of the whole wheel in ticks as the last entry
+        self.spans = [wheel_size ** level for level in range(num_levels + 1)]
+        # Each bucket maps timer handles to None, keeping insertion order and
+        # letting cancel remove a handle in O(1) time
+        self.levels = [[{} for _ in range(wheel_size)]
+                       for _ in range(num_levels)]
+        self.level_counts = [0] * num_levels
+        # Timers too far in the future for the wheel, as (tick, seq, handle)
+        self.overflow = BinaryMinHeap()
+        # Tick of the next level 0 bucket to be processed
+        self.current = int(start // resolution)
+        self.count = 0
+        self.seq = 0
+
+    def __repr__(self):
+        """Return a string representation of this timing wheel."""
+        return 'TimingWheel({} timers, time={!r})'.format(
+            self.count, self.current * self.resolution)
+
+    def is_empty(self):
+        """Return True if this timing wheel has no pending timers."""
+        return self.count == 0
+
+    def size(self):
+        """Return the number of pending timers in this timing wheel."""
+        return self.count
+
+    def schedule(self, item, at):
+        """Schedule the given item to be due at the given time, and return a
+        handle that can be given to cancel.
+        Running time: O(1) if the time is within the wheel's range, or
+        O(log m) to insert into the overflow heap of m far-future timers."""
+        handle = TimerHandle(item, at, self.seq, int(at // self.resolution))
+        self.seq += 1
+        self.count += 1
+        self._place(handle)
+        return handle
+
+    def cancel(self, handle):
+        """Cancel the timer with the given handle so it is never returned by
+        pop_due. Return True if it was pending, or False if it was already due
+        or cancelled.
+        Running time: O(1) because the handle knows its bucket (timers in the
+        overflow heap are skipped when they reach the wheel)."""
+        if not handle.active:
+            return False
+        handle.active = False
+        if handle.bucket is not None:
+            del handle.bucket[handle]
+            self.level_counts[handle.level] -= 1
+            handle.bucket = None
+        self.count -= 1
+        return True
+
+    def pop_due(self, now):
+        """Remove and return a list of all items due at or before the given
+        time, in order of their scheduled times.
+        Running time: O(t + k log k) to advance t ticks (skipping stretches
+        where lower levels are empty) and sort the k due items."""
+        target = int(now // self.resolution)
+        wheel_size = self.wheel_size
+        level0 = self.levels[0]
+        due = []
+        while self.current <= target:
+            if not self.level_counts[0]:
+                # Nothing can be due before the next cascade, so skip ahead
+                if self._skip_ahead(target):
+                    continue
+            bucket = level0[self.current % wheel_size]
+            if bucket:
+                if self.current < target:
+                    handles = list(bucket)
+                else:
+                    # Timers in the last tick may be due later within the tick
+                    handles = [handle for handle in bucket if handle.at <= now]
+                for handle in handles:
+                    del bucket[handle]
+                    handle.active = False
+                    handle.bucket = None
+                    due.append(handle)
+                self.level_counts[0] -= len(handles)
+                self.count -= len(handles)
+            if self.current == target:
+                break
+            self.current += 1
+            self._cascade()
+        due.sort(key=lambda handle: (handle.at, handle.seq))
+        return [handle.item for handle in due]
+
+    def _place(self, handle):
+        """Put the given timer in the bucket for its tick at the lowest level
+        whose range covers it, or in the overflow heap if none does."""
+        tick = handle.tick
+        delta = tick - self.current
+        if delta < self.wheel_size:
+            # Timers already due are placed in the current tick's bucket
+            level = 0
+            slot = max(tick, self.current) % self.wheel_size
+        else:
+            for level in range(1, self.num_levels):
+                if delta < self.spans[level + 1]:
+                    slot = (tick // self.spans[level]) % self.wheel_size
+                    break
+            else:
+                self.overflow.insert((tick, handle.seq, handle))
+                return
+        bucket = self.levels[level][slot]
+        bucket[handle] = None
+        handle.bucket = bucket
+        handle.level = level
+        self.level_counts[level] += 1
+
+    def _cascade(self):
+        """Move timers from each higher level bucket whose span begins at the
+        current tick into lower levels, and pull timers from the overflow heap
+        that are now within the wheel's range."""
+        for level in range(1, self.num_levels):
+            span = self.spans[level]
+            if self.current % span != 0:
+                return  # Spans at higher levels cannot begin here either
+            bucket = self.levels[level][(self.current // span) % self.wheel_size]
+            if bucket:
+                self.level_counts[level] -= len(bucket)
+                handles = list(bucket)
+                bucket.clear()
+                for handle in handles:
+                    self._place(handle)
+        self._pull_overflow()
+
+    def _pull_overflow(self):
+        """Move timers from the overflow heap into the wheel while they are
+        within its range, dropping timers that were cancelled."""
+        limit = self.current + self.spans[self.num_levels]
+        while not self.overflow.is_empty() and self.overflow.get_min()[0] < limit:
+            handle = self.overflow.delete_min()[2]
+            if handle.active:
+                self._place(handle)
+
+    def _skip_ahead(self, target):
+        """Advance the current tick over empty level 0 buckets, up to the next
+        tick where a nonempty higher level cascades or the given target tick.
+        Return True if the current tick was advanced."""
+        for level in range(1, self.num_levels):
+            if self.level_counts[level]:
+                span = self.spans[level]
+                next_tick = (self.current // span + 1) * span
+                break
+        else:
+            # Only the overflow heap has timers, so skip to the first of them
+            next_tick = target + 1
+            if not self.overflow.is_empty():
+                next_tick = min(next_tick, self.overflow.get_min()[0])
+        if next_tick > target:
+            if self.current == target:
+                return False
+            self.current = target
+            self._pull_overflow()
+            return True
+        if next_tick <= self.current:
+            return False
+        self.current = next_tick
+        self._cascade()
+        self._pull_overflow()
+        return True
+
+
+def benchmark_timers(num_timers=1000000, horizon=10000.0, step=1.0,
+                     cancel_ratio=0.1):
+    """Compare TimingWheel with a PriorityQueue of deadlines (on BinaryMinHeap)
+    by scheduling num_timers timers at random times within the given horizon,
+    cancelling some of them, and popping due timers every step of time."""
+    import random
+    import time
+    from priorityqueue import PriorityQueue
+
+    deadlines = [random.uniform(0, horizon) for _ in range(num_timers)]
+    cancelled = set(random.sample(range(num_timers),
+                                  int(num_timers * cancel_ratio)))
+    print('{} timers within {} time units, {} cancelled, popped every {}'
+          .format(num_timers, horizon, len(cancelled), step))
+
+    start_time = time.time()
+    wheel = TimingWheel(resolution=step)
+    handles = [wheel.schedule(index, at) for index, at in enumerate(deadlines)]
+    for index in cancelled:
+        wheel.cancel(handles[index])
+    wheel_order = []
+    now = 0.0
+    while not wheel.is_empty():
+        now += step
+        wheel_order.extend(wheel.pop_due(now))
+    wheel_time = time.time() - start_time
+
+    start_time = time.time()
+    queue = PriorityQueue()
+    for index, at in enumerate(deadlines):
+        queue.enqueue(index, at)
+    # Cancelling requires lazy deletion because heaps cannot remove items
+    removed = set(cancelled)
+    heap_order = []
+    now = 0.0
+    while not queue.is_empty():
+        now += step
+        while not queue.is_empty() and queue.front()[0] <= now:
+            index = queue.dequeue()[1]
+            if index not in removed:
+                heap_order.append(index)
+    heap_time = time.time() - start_time
+
+    assert wheel_order == heap_order
+    print('TimingWheel:                {:.6f} sec'.format(wheel_time))
+    print('PriorityQueue (binary heap): {:.6f} sec'.format(heap_time))
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) > 1:
+        benchmark_timers(int(sys.argv[1]))
+    else:
+        benchmark_timers()
@@ -0,0 +1,65 @@
+#!python
+
+from timingwheel import TimingWheel
+import random
+import unittest
+
+
+class TimingWheelTest(unittest.TestCase):
+    def test_schedule_and_pop_due(self):
+        wheel = TimingWheel()
+        wheel.schedule('B', 5)
+        wheel.schedule('A', 2.5)
+        wheel.schedule('C', 5)
+        assert wheel.size() == 3
+        assert wheel.pop_due(2) == []
+        assert wheel.pop_due(2.5) == ['A']
+        assert wheel.pop_due(4.9) == []
+        assert wheel.pop_due(10) == ['B', 'C']  # Ties keep scheduling order
+        assert wheel.is_empty() is True
+
+    def test_schedule_in_the_past(self):
+        wheel = TimingWheel(start=100)
+        wheel.pop_due(150)
+        wheel.schedule('late', 120)
+        assert wheel.pop_due(150) == ['late']
+
+    def test_cancel(self):
+        wheel = TimingWheel(wheel_size=4, num_levels=2)
+        near = wheel.schedule('near', 1)
+        middle = wheel.schedule('middle', 10)
+        far = wheel.schedule('far', 100)  # Beyond the wheel in overflow heap
+        wheel.schedule('kept', 50)
+        assert wheel.cancel(near) is True
+        assert wheel.cancel(near) is False
+        assert wheel.cancel(middle) is True
+        assert wheel.cancel(far) is True
+        assert wheel.size() == 1
+        assert wheel.pop_due(1000) == ['kept']
+        assert wheel.cancel(far) is False
+
+    def test_many_random_timers_across_levels(self):
+        # Small wheel so timers cascade through every level and the overflow
+        wheel = TimingWheel(resolution=0.5, wheel_size=4, num_levels=3)
+        deadlines = [random.uniform(0, 200) for _ in range(500)]
+        handles = [wheel.schedule(index, at) for index, at in enumerate(deadlines)]
+        cancelled = set(random.sample(range(500), 100))
+        for index in cancelled:
+            wheel.cancel(handles[index])
+        popped = []
+        now = 0
+        while not wheel.is_empty():
+            now += random.uniform(0, 10)
+            due = wheel.pop_due(now)
+            assert all(deadlines[index] <= now for index in due)
+            popped.extend(due)
+            # Every pending timer must still be in the future
+            assert all(deadlines[index] > now for index in range(500)
+                       if handles[index].active)
+        expected = sorted((index for index in range(500) if index not in cancelled),
+                          key=lambda index: deadlines[index])
+        assert popped == expected
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!python
+
+
+def trampoline(generator):
+    """Run the given generator as a recursive function without using Python's
+    call stack. The generator makes each recursive call by yielding the
+    generator for that call, and receives the call's result as the value of
+    the yield expression; it returns its own result with a return statement.
+    Generators waiting on their recursive calls are kept on an explicit stack,
+    so recursion depth is limited only by memory, not by the recursion limit.
+    Running time: O(1) overhead per recursive call
+    Memory usage: O(d) suspended generators for recursion depth d"""
+    stack = [generator]
+    result = None
+    while stack:
+        try:
+            call = stack[-1].send(result)
+        except StopIteration as stop:
+            # This call returned, so pass its result to the call waiting on it
+            stack.pop()
+            result = stop.value
+        else:
+            # This call made a recursive call, so run that one next
+            stack.append(call)
+            result = None
+    return result
+
+
+def benchmark_recursion(factor=100):
+    """Compare recursive algorithms with their stack-safe variants on inputs
+    deeper than the recursion limit allows, by the given factor, and on inputs
+    the recursive versions can still handle."""
+    import random
+    import sys
+    import time
+    from binaryheap import BinaryMinHeap
+    from prefixtree import PrefixTree
+    from recursion import fibonacci_cached, fibonacci_trampolined
+    from sorting_recursive import (merge_sort, merge_sort_iterative,
+                                   quick_sort, quick_sort_iterative)
+
+    limit = sys.getrecursionlimit()
+    deep = limit * factor
+
+    def timed(function, *args):
+        start_time = time.perf_counter()
+        try:
+            function(*args)
+        except RecursionError:
+            return 'RecursionError'
+        return '{:.6f} sec'.format(time.perf_counter() - start_time)
+
+    def memoized(n):
+        fibonacci_cached.cache_clear()
+        return fibonacci_cached(n)
+
+    # Quick sort on sorted input is quadratic with its first-item pivot, so
+    # only go a few times past the recursion limit there
+    sorted_size = limit * 5
+    cases = [
+        ('fibonacci n={}'.format(limit // 4),
+         memoized, fibonacci_trampolined, limit // 4),
+        ('fibonacci n={}'.format(deep),
+         memoized, fibonacci_trampolined, deep),
+        ('merge sort random n={}'.format(deep), merge_sort,
+         merge_sort_iterative, [random.random() for _ in range(deep)]),
+        ('quick sort random n={}'.format(deep), quick_sort,
+         quick_sort_iterative, [random.random() for _ in range(deep)]),
+        ('quick sort sorted n={}'.format(sorted_size), quick_sort,
+         quick_sort_iterative, list(range(sorted_size))),
+    ]
+    print('Recursion limit: {}'.format(limit))
+    print('{:32} {:>18} {:>18}'.format('Input', 'Recursive', 'Stack-safe'))
+    for label, recursive, stack_safe, argument in cases:
+        copy = list(argument) if isinstance(argument, list) else argument
+        print('{:32} {:>18} {:>18}'.format(
+            label, timed(recursive, copy), timed(stack_safe, argument)))
+
+    # These helpers are now iterative, so time them on deep inputs only
+    tree = PrefixTree(['a' * deep, 'a' * (deep // 2)])
+    print('{:32} {:>18} {:>18}'.format('prefix tree strings depth={}'.format(
+        deep), '-', timed(tree.strings)))
+    heap_items = [random.random() for _ in range(deep)]
+    print('{:32} {:>18} {:>18}'.format('heap insert n={}'.format(deep), '-',
+                                       timed(BinaryMinHeap, heap_items)))
+
+
+if __name__ == '__main__':
+    benchmark_recursion()
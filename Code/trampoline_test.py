@@ -0,0 +1,39 @@
+#!python
+
+from trampoline import trampoline
+import sys
+import unittest
+
+
+def countdown(n):
+    # Recursive generator that returns the number of calls made
+    if n == 0:
+        return 1
+    calls = yield countdown(n - 1)
+    return calls + 1
+
+
+def tree_sum(tree):
+    # Recursive generator that makes two recursive calls per level
+    if isinstance(tree, int):
+        return tree
+    left = yield tree_sum(tree[0])
+    right = yield tree_sum(tree[1])
+    return left + right
+
+
+class TrampolineTest(unittest.TestCase):
+    def test_base_case(self):
+        assert trampoline(countdown(0)) == 1
+
+    def test_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 100
+        assert trampoline(countdown(depth)) == depth + 1
+
+    def test_multiple_recursive_calls(self):
+        tree = ((1, 2), (3, (4, 5)))
+        assert trampoline(tree_sum(tree)) == 15
+
+
+if __name__ == '__main__':
+    unittest.main()